@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 23:20:15 2026
+
+@author: ChrisTokita
+
+DESCRIPTION:
+Script to benchmark native network generators against igraph (seed_social_network(generator = ...)),
+comparing time to seed a network and basic degree statistics of the resulting networks.
+"""
+
+####################
+# Load libraries and packages
+####################
+import numpy as np
+import pandas as pd
+import time
+import cascade_models.social_networks as sn
+
+
+##########
+# Set parameters
+##########
+network_types = ["random", "scalefree", "smallworld"]
+population_sizes = [1000, 10000, 100000] #number of individuals
+k = 8 #mean degree on networks
+reps = 3 #number of networks to time per setting
+output = "sparse" #form of returned network: "dense", "sparse", or "edgelist"
+
+
+##########
+# Run benchmark
+##########
+results = []
+for network_type in network_types:
+    for n in population_sizes:
+        for generator in ["igraph", "native"]:
+            times = []
+            for rep in np.arange(reps):
+                rng = np.random.default_rng(rep)
+                start = time.time()
+                try:
+                    network = sn.seed_social_network(n, k, network_type = network_type, rng = rng, output = output, generator = generator)
+                except Exception as error:
+                    print("Could not generate " + network_type + " network with " + generator + ": " + str(error))
+                    break
+                times.append(time.time() - start)
+            if len(times) == 0:
+                continue
+            # Degree of each individual
+            if output == "sparse":
+                degree = np.asarray(network.sum(axis = 1)).flatten()
+            elif output == "edgelist":
+                degree = np.bincount(network[:,0], minlength = n)
+            else:
+                degree = np.sum(network, axis = 1)
+            results.append({'network_type': network_type,
+                            'n': n,
+                            'generator': generator,
+                            'seconds': np.mean(times),
+                            'mean_degree': np.mean(degree),
+                            'max_degree': np.max(degree)})
+            print(results[-1])
+
+results = pd.DataFrame(results)
+print(results.to_string(index = False))
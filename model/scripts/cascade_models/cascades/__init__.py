@@ -1,5 +1,12 @@
 from .assess_fitness import assess_fitness
+from .cascade_stats_recorder import CascadeStatsRecorder
+from .cascade_telemetry import CascadeTelemetry, load_telemetry
 from .evaluate_behavior import evaluate_behavior
-from .get_cascade_stats import get_cascade_stats
+from .sampler_selector import SamplerSelector
+from .get_cascade_stats import get_cascade_stats, get_cascade_stats_batch
 from .simulate_cascade import simulate_cascade
-from .simulate_stim_sampling import simulate_stim_sampling
\ No newline at end of file
+from .simulate_cascade_batch import simulate_cascade_batch
+from .simulate_cascade_packed import simulate_cascade_packed
+from .simulate_cascade_sparse import simulate_cascade_sparse
+from .simulate_stim_sampling import simulate_stim_sampling
+from .simulate_stim_sampling_batch import simulate_stim_sampling_batch
\ No newline at end of file
@@ -9,10 +9,12 @@ Created on Mon Nov 25 11:47:27 2019
 import numpy as np
 import pandas as pd 
 import cascade_models.cascades as cs
+import cascade_models.stimulus as st
 
-def assess_fitness(gamma, psi, trial_count, network, thresholds, types, trial):
+def assess_fitness(gamma, psi, trial_count, network, thresholds, types, trial, batch_size = None):
     """
-    Runs X many cascades with final network to assess information spread and individual fitness
+    Runs X many cascades with final network to assess information spread and individual fitness.
+    Since cascades in fitness trials are independent of one another, they can be run in batches (see batch_size).
     
     INPUTS:
     - gamma:         correlation between information sources (float). Inherited from main sim.
@@ -22,59 +24,96 @@ def assess_fitness(gamma, psi, trial_count, network, thresholds, types, trial):
     - thresholds:    matrix of thresholds for each individual (numpy array).
     - types:         array of type assignments for each individual (numpy array).
     - trial:         label for trial type. Typically "pre" or "post" (string).
+    - batch_size:    number of cascades to simulate simultaneously. Default (None) runs cascades one at a time (int).
     """
     
-    # Dataframes to collect fitness trial data
+    # Arrays to collect fitness trial data (converted to dataframes at the end)
     n = thresholds.shape[0]
-    cascade_stats = pd.DataFrame(columns = ['t', 'samplers', 'samplers_active', 'sampler_A', 'sampler_B', 'total_active', 'active_A', 'active_B'])
-    behavior_stats = pd.DataFrame(np.zeros(shape = (n, 5)),
-                                    columns = ['individual', 'true_positive', 'false_negative', 'true_negative', 'false_positive'])
-    behavior_stats['individual'] = np.arange(n)
+    cascade_stats = cs.CascadeStatsRecorder(capacity = trial_count)
+    behavior_counts = np.zeros(shape = (n, 4), dtype = np.int64) #columns: true_positive, false_negative, true_negative, false_positive
     
-    # Run trials
-    for t in np.arange(trial_count):
-        # Initial information sampling
-        info_values, states, samplers, samplers_active = cs.simulate_stim_sampling(n = n,
-                                                                                   gamma = gamma,
-                                                                                   psi = psi,
-                                                                                   types = types,
-                                                                                   thresholds = thresholds)
-        # Simulate information cascade 
-        states = cs.simulate_cascade(network = network, 
-                                     states = states, 
-                                     thresholds = thresholds,
-                                     samplers = samplers)
-        # Collect behavior data
-        cascade_stats = cs.get_cascade_stats(t = t,
-                                             samplers = samplers,
-                                             active_samplers = samplers_active,
-                                             states = states, 
-                                             types = types, 
-                                             stats_df = cascade_stats)
-        # Evaluate behavior of individuals relative to threshold and stimuli
-        correct_state, behavior_stats = evaluate_fitness_trial_behavior(states = states, 
-                                                                        thresholds = thresholds, 
-                                                                        information = info_values, 
-                                                                        types = types,
-                                                                        behavior_df = behavior_stats)
+    # Run trials, one cascade at a time
+    if batch_size is None:
+        stimuli = st.StimulusStream(correlation = gamma, mean = 0, block_size = min(trial_count, 10000))
+        sampler_sets = cs.SamplerSelector(n = n, sampler_count = int(round(psi * n)), block_size = min(trial_count, 1000))
+        for t in np.arange(trial_count):
+            # Initial information sampling
+            info_values, states, samplers, samplers_active = cs.simulate_stim_sampling(n = n,
+                                                                                       gamma = gamma,
+                                                                                       psi = psi,
+                                                                                       types = types,
+                                                                                       thresholds = thresholds,
+                                                                                       stimulus_stream = stimuli,
+                                                                                       sampler_selector = sampler_sets)
+            # Simulate information cascade 
+            states = cs.simulate_cascade(network = network, 
+                                         states = states, 
+                                         thresholds = thresholds,
+                                         samplers = samplers)
+            # Collect behavior data
+            cascade_stats.record(t = t,
+                                 samplers = samplers,
+                                 active_samplers = samplers_active,
+                                 states = states, 
+                                 types = types)
+            # Evaluate behavior of individuals relative to threshold and stimuli
+            correct_state, behavior_counts = evaluate_fitness_trial_behavior(states = states, 
+                                                                             thresholds = thresholds, 
+                                                                             information = info_values, 
+                                                                             types = types,
+                                                                             behavior_counts = behavior_counts)
+    
+    # Run trials in batches of simultaneous cascades
+    else:
+        for batch_start in np.arange(0, trial_count, batch_size):
+            t = np.arange(batch_start, min(batch_start + batch_size, trial_count))
+            # Initial information sampling
+            info_values, states, sampler_mask, samplers_active = cs.simulate_stim_sampling_batch(n = n,
+                                                                                                 gamma = gamma,
+                                                                                                 psi = psi,
+                                                                                                 types = types,
+                                                                                                 thresholds = thresholds,
+                                                                                                 batch_size = len(t))
+            # Simulate information cascades
+            states = cs.simulate_cascade_batch(network = network, 
+                                               states = states, 
+                                               thresholds = thresholds,
+                                               sampler_mask = sampler_mask)
+            # Collect behavior data
+            cascade_stats.record_batch(t = t,
+                                       sampler_mask = sampler_mask,
+                                       samplers_active = samplers_active,
+                                       states = states, 
+                                       types = types)
+            # Evaluate behavior of individuals relative to threshold and stimuli
+            correct_state, behavior_counts = evaluate_fitness_trial_behavior(states = states, 
+                                                                             thresholds = thresholds, 
+                                                                             information = info_values, 
+                                                                             types = types,
+                                                                             behavior_counts = behavior_counts)
+        
     # Prep dataframes and return
+    behavior_stats = pd.DataFrame(behavior_counts, columns = ['true_positive', 'false_negative', 'true_negative', 'false_positive'])
+    behavior_stats.insert(0, 'individual', np.arange(n))
     behavior_stats = behavior_stats.astype(float)
-    cascade_stats = cascade_stats.astype(float)
+    cascade_stats = cascade_stats.to_dataframe().astype(float)
     behavior_stats['trial'] = trial
     cascade_stats['trial'] = trial
     return behavior_stats, cascade_stats
 
 
-def evaluate_fitness_trial_behavior(states, thresholds, information, types, behavior_df):
+def evaluate_fitness_trial_behavior(states, thresholds, information, types, behavior_counts):
     """
-    Evaluates the behavior of active individuals in the fitness trial cascade and updates data on correct/incorrect behavior.
+    Evaluates the behavior of active individuals in the fitness trial cascade and updates counts of correct/incorrect behavior.
+    Also accepts a batch of cascades, where each column of states (and each row of information) is a separate cascade.
     
     INPUTS:
     - states:           array listing the behavioral state of every individual (numpy array).
     - thresholds:       array of thresholds for each individual (numpy array).
     - information:      array of stimuli/infromation values (numpy array).
     - types:            array of type assignments for each individual (numpy array).
-    - behavior_df:      dataframe to store the behavioral performance of individuals (pandas dataframe).
+    - behavior_counts:  running counts of true positives, false negatives, true negatives and false positives (in that column order)
+                        for each individual, updated in place (numpy array, n x 4).
     """
     
     # Assess what all individuals would have done if they had sampled info directly
@@ -82,18 +121,19 @@ def evaluate_fitness_trial_behavior(states, thresholds, information, types, beha
                                              thresholds = thresholds, 
                                              information = information, 
                                              types = types)
-    correct_behavior = correct_behavior.reshape((-1, 1))
+    correct_behavior = correct_behavior.reshape(states.shape)
     
-    # Assess error types, if desired by supplyin a behavior_df
-    true_positive = (states == 1) & correct_behavior #did behavior when they should have
-    true_negative = (states == 0) & ~correct_behavior  #did NOT do behavior when they should NOT have
-    false_positive = (states == 1) & ~correct_behavior  #did behavior when they should NOT have
-    false_negative = (states == 0) & correct_behavior  #did NOT do behavior when they should have
+    # Count error types: the other three follow from how often each individual was active, should have been active, and both
+    active = states == 1
+    cascades = states.shape[1]
+    active_count = np.sum(active, axis = 1)
+    correct_count = np.sum(correct_behavior, axis = 1)
+    true_positive = np.sum(active & correct_behavior, axis = 1) #did behavior when they should have
+    false_negative = correct_count - true_positive #did NOT do behavior when they should have
+    false_positive = active_count - true_positive #did behavior when they should NOT have
+    true_negative = cascades - true_positive - false_negative - false_positive #did NOT do behavior when they should NOT have
     
     # Update behavior tracking data
-    behavior_df['true_positive'] = behavior_df['true_positive'] + np.ndarray.flatten(true_positive)
-    behavior_df['true_negative'] = behavior_df['true_negative'] + np.ndarray.flatten(true_negative)
-    behavior_df['false_positive'] = behavior_df['false_positive'] + np.ndarray.flatten(false_positive)
-    behavior_df['false_negative'] = behavior_df['false_negative'] + np.ndarray.flatten(false_negative)
-    correct_behavior = np.ndarray.flatten(correct_behavior)
-    return correct_behavior, behavior_df
\ No newline at end of file
+    behavior_counts += np.column_stack((true_positive, false_negative, true_negative, false_positive))
+    correct_behavior = np.squeeze(correct_behavior)
+    return correct_behavior, behavior_counts
\ No newline at end of file
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 20:03:51 2026
+
+@author: ChrisTokita
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class CascadeStatsRecorder:
+    """
+    Records summary statistics of many cascades (one row per cascade) in a preallocated numpy structured array.
+    Appending a row to a data frame copies the whole frame, so recording 10,000s of cascades that way is quadratic.
+    Here each cascade is written into the array in place, the array doubles in size whenever it fills up,
+    and a data frame is only created once, at the end (see to_dataframe()).
+
+    INPUTS:
+    - capacity:   number of cascades to make room for initially (int).
+    """
+
+    columns = ['t', 'samplers', 'samplers_active', 'sampler_A', 'sampler_B', 'total_active', 'active_A', 'active_B']
+
+    def __init__(self, capacity = 1000):
+        self.records = np.zeros(max(capacity, 1), dtype = [(column, np.int64) for column in self.columns])
+        self.count = 0
+
+    def record(self, t, samplers, active_samplers, states, types):
+        """
+        Records the statistics of a single cascade.
+
+        INPUTS:
+        - t:                 time step (int).
+        - samplers:          array of original samplers of information that round (numpy array).
+        - active_samplers:   array of samplers who became active upon sampling info (numpy array).
+        - states:            array listing the behavioral state of every individual (numpy array).
+        - types:             array of type assignments for each individual (numpy array).
+        """
+        self.reserve(1)
+        states = np.ndarray.flatten(states)
+        active_sampler_types = np.sum(types[active_samplers], axis = 0)
+        active_types = np.dot(states, types)
+        self.records[self.count] = (t, len(samplers), len(active_samplers),
+                                    active_sampler_types[0], active_sampler_types[1],
+                                    np.sum(states), active_types[0], active_types[1])
+        self.count += 1
+
+    def record_batch(self, t, sampler_mask, samplers_active, states, types):
+        """
+        Records the statistics of a batch of cascades run simultaneously (one cascade per column of the state matrix).
+
+        INPUTS:
+        - t:                 time step of each cascade (numpy array).
+        - sampler_mask:      whether each individual was a sampler in each cascade (boolean numpy array, n x number of cascades).
+        - samplers_active:   whether each individual was a sampler that became active in each cascade (boolean numpy array, n x number of cascades).
+        - states:            behavioral state of every individual in each cascade (numpy array, n x number of cascades).
+        - types:             array of type assignments for each individual (numpy array).
+        """
+        batch_size = states.shape[1]
+        self.reserve(batch_size)
+        rows = self.records[self.count:self.count + batch_size]
+        rows['t'] = t
+        rows['samplers'] = np.sum(sampler_mask, axis = 0)
+        rows['samplers_active'] = np.sum(samplers_active, axis = 0)
+        rows['sampler_A'] = np.dot(types[:,0], samplers_active)
+        rows['sampler_B'] = np.dot(types[:,1], samplers_active)
+        rows['total_active'] = np.sum(states, axis = 0)
+        rows['active_A'] = np.dot(types[:,0], states)
+        rows['active_B'] = np.dot(types[:,1], states)
+        self.count += batch_size
+
+    def reserve(self, size):
+        """
+        Makes sure there is room for another number of cascades, growing the array (by at least double) if needed.
+        """
+        if self.count + size > len(self.records):
+            grown = np.zeros(max(2 * len(self.records), self.count + size), dtype = self.records.dtype)
+            grown[:self.count] = self.records[:self.count]
+            self.records = grown
+
+    def to_dataframe(self):
+        """
+        Returns the recorded statistics, one row per cascade (pandas DataFrame).
+        """
+        return pd.DataFrame(self.records[:self.count], columns = self.columns)
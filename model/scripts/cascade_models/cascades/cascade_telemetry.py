@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 21:14:08 2026
+
+@author: ChrisTokita
+"""
+
+import numpy as np
+import pandas as pd
+import glob
+import os
+
+
+class CascadeTelemetry:
+    """
+    Records the size, bias and tie changes of the cascade in each time step of a running simulation.
+    Rows are written in place into a fixed-size buffer, and each time the buffer fills up it is flushed to disk as a
+    compressed chunk (<file_prefix>_chunk0000.npz, <file_prefix>_chunk0001.npz, ...), so memory use stays constant however long the simulation runs.
+    Which time steps are recorded can be thinned out (every k-th time step) and/or limited to windows at the beginning and end of the simulation.
+
+    INPUTS:
+    - file_prefix:   path and start of file name for chunks, e.g. <outpath>/cascade_data/gamma0.5/cascade_rep00 (str).
+    - timesteps:     length of simulation (int).
+    - every:         record every k-th time step. Default records every time step (int).
+    - first:         only record the first this many time steps... (int).
+    - last:          ...and/or the last this many time steps. Default (None for both) records throughout the simulation (int).
+    - buffer_size:   number of rows held in memory before flushing a chunk to disk (int).
+    """
+
+    columns = ['t', 'samplers_active', 'total_active', 'active_A', 'active_B', 'ties_broken', 'ties_formed']
+
+    def __init__(self, file_prefix, timesteps, every = 1, first = None, last = None, buffer_size = 10000):
+        if every < 1:
+            raise Exception("ERROR: telemetry must record at least every time step (every >= 1).")
+        self.file_prefix = file_prefix
+        self.timesteps = timesteps
+        self.every = every
+        self.first = first
+        self.last = last
+        self.buffer = np.zeros(max(buffer_size, 1), dtype = [(column, np.int64) for column in self.columns])
+        self.count = 0
+        self.chunk = 0
+        os.makedirs(os.path.dirname(file_prefix), exist_ok = True)
+
+    def keep(self, t):
+        """
+        Whether time step t is recorded (bool).
+        """
+        if t % self.every != 0:
+            return False
+        if self.first is None and self.last is None:
+            return True
+        in_first = self.first is not None and t < self.first
+        in_last = self.last is not None and t >= self.timesteps - self.last
+        return in_first or in_last
+
+    def record(self, t, samplers_active, states, types, ties_broken, ties_formed):
+        """
+        Records one time step, if it is to be kept.
+
+        INPUTS:
+        - t:                 time step (int).
+        - samplers_active:   array of samplers who became active upon sampling info (numpy array).
+        - states:            array listing the behavioral state of every individual (numpy array).
+        - types:             array of type assignments for each individual (numpy array).
+        - ties_broken:       number of ties broken in this time step (int).
+        - ties_formed:       number of ties formed in this time step (int).
+        """
+        if not self.keep(t):
+            return
+        states = np.ndarray.flatten(states)
+        active_types = np.dot(states, types)
+        self.buffer[self.count] = (t, len(samplers_active), np.sum(states), active_types[0], active_types[1], ties_broken, ties_formed)
+        self.count += 1
+        if self.count == len(self.buffer):
+            self.flush()
+
+    def flush(self):
+        """
+        Writes the rows recorded since the last flush to a new chunk file (written under a temporary name, then renamed).
+        """
+        if self.count == 0:
+            return
+        chunk_file = self.file_prefix + "_chunk" + str(self.chunk).zfill(4) + ".npz"
+        temp_file = chunk_file[:-len(".npz")] + "_tmp.npz"
+        np.savez_compressed(temp_file, telemetry = self.buffer[:self.count])
+        os.replace(temp_file, chunk_file)
+        self.chunk += 1
+        self.count = 0
+
+    def resume(self, t):
+        """
+        Prepares to continue a simulation resumed (from a checkpoint) at time step t.
+        Rows already on disk from time step t onwards were recorded after the checkpoint was saved and are dropped, since they will be recorded again.
+
+        INPUTS:
+        - t:   time step the simulation resumes from (int).
+        """
+        chunk_files = list_chunks(self.file_prefix)
+        for chunk_file in chunk_files:
+            with np.load(chunk_file) as data:
+                rows = data['telemetry']
+            if rows['t'][0] >= t:
+                os.remove(chunk_file)
+            elif rows['t'][-1] >= t:
+                np.savez_compressed(chunk_file[:-len(".npz")] + "_tmp.npz", telemetry = rows[rows['t'] < t])
+                os.replace(chunk_file[:-len(".npz")] + "_tmp.npz", chunk_file)
+        self.chunk = len(list_chunks(self.file_prefix))
+        self.count = 0
+
+    def close(self):
+        """
+        Flushes any remaining rows at the end of the simulation.
+        """
+        self.flush()
+
+
+def list_chunks(file_prefix):
+    # Chunk files of one replicate, in the order they were written
+    return sorted(glob.glob(glob.escape(file_prefix) + "_chunk[0-9][0-9][0-9][0-9].npz"))
+
+
+def load_telemetry(file_prefix):
+    """
+    Loads all chunks of cascade telemetry written by CascadeTelemetry for one replicate.
+
+    INPUTS:
+    - file_prefix:   path and start of file name for chunks, as given to CascadeTelemetry (str).
+
+    OUTPUTS:
+    - telemetry:     one row per recorded time step (pandas DataFrame).
+    """
+
+    chunks = []
+    for chunk_file in list_chunks(file_prefix):
+        with np.load(chunk_file) as data:
+            chunks.append(data['telemetry'])
+    if len(chunks) == 0:
+        return pd.DataFrame(columns = CascadeTelemetry.columns)
+    return pd.DataFrame(np.concatenate(chunks), columns = CascadeTelemetry.columns)
@@ -5,14 +5,15 @@ Created on Mon Nov 25 11:46:23 2019
 
 @author: ChrisTokita
 """
-import numpy as np
 import pandas as pd 
+from .cascade_stats_recorder import CascadeStatsRecorder
 
 def get_cascade_stats(t, samplers, active_samplers, states, types, stats_df):
     """
     Captures the relevant statistics about cascades for use:
     (1) Cascade size over the first X time steps and last X time steps
     (2) Cascade bias over the first X time steps and last X time steps
+    Adds a row to the data frame, which copies it each time. To record many cascades, use CascadeStatsRecorder instead.
     
     INPUTS:
     - t:                 time step (int).
@@ -23,20 +24,28 @@ def get_cascade_stats(t, samplers, active_samplers, states, types, stats_df):
     - stats_df:          data frame for storing the statistics (numpy array).
     """
     
-    total_active = np.sum(states)
-    samplers_A = np.sum(types[active_samplers][:,0])
-    samplers_B = np.sum(types[active_samplers][:,1])
-    active_A = np.sum(np.ndarray.flatten(states) * types[:,0])
-    active_B = np.sum(np.ndarray.flatten(states) * types[:,1])
-    column_names = stats_df.columns
-    cascade_stats = pd.DataFrame([[t,
-                                  len(samplers),
-                                  len(active_samplers), 
-                                  int(samplers_A),
-                                  int(samplers_B),
-                                  int(total_active),
-                                  int(active_A), 
-                                  int(active_B)]],
-                                columns = column_names)
-    stats_df = stats_df.append(cascade_stats, ignore_index = True)
-    return stats_df
\ No newline at end of file
+    cascade_stats = CascadeStatsRecorder(capacity = 1)
+    cascade_stats.record(t = t, samplers = samplers, active_samplers = active_samplers, states = states, types = types)
+    cascade_stats = cascade_stats.to_dataframe()
+    cascade_stats.columns = stats_df.columns
+    if len(stats_df) == 0:
+        return cascade_stats
+    stats_df = pd.concat([stats_df, cascade_stats], ignore_index = True)
+    return stats_df
+
+def get_cascade_stats_batch(t, sampler_mask, samplers_active, states, types):
+    """
+    Captures the same statistics as get_cascade_stats, but for a batch of cascades run simultaneously.
+    Returns a data frame with one row per cascade (i.e., per column of the state matrix).
+    
+    INPUTS:
+    - t:                 time step of each cascade (numpy array).
+    - sampler_mask:      whether each individual was a sampler in each cascade (boolean numpy array, n x number of cascades).
+    - samplers_active:   whether each individual was a sampler that became active in each cascade (boolean numpy array, n x number of cascades).
+    - states:            behavioral state of every individual in each cascade (numpy array, n x number of cascades).
+    - types:             array of type assignments for each individual (numpy array).
+    """
+    
+    cascade_stats = CascadeStatsRecorder(capacity = states.shape[1])
+    cascade_stats.record_batch(t = t, sampler_mask = sampler_mask, samplers_active = samplers_active, states = states, types = types)
+    return cascade_stats.to_dataframe()
\ No newline at end of file
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 16:28:51 2026
+
+@author: ChrisTokita
+"""
+
+import numpy as np
+
+
+class SamplerSelector:
+    """
+    Chooses which individuals directly sample the information sources each time step.
+    np.random.choice(range(0, n), replace = False) permutes the entire population every time step,
+    so instead sampler sets are generated in blocks for many time steps at once and handed out one time step at a time.
+    When samplers are a small fraction of the population, each set costs O(psi * n) rather than O(n).
+
+    INPUTS:
+    - n:               number of individuals in the social system (int).
+    - sampler_count:   number of samplers each time step (int).
+    - block_size:      number of time steps worth of sampler sets to generate at once (int).
+    - rng:             random number generator to draw from. Default is numpy's global RNG (numpy Generator or RandomState).
+    """
+
+    def __init__(self, n, sampler_count, block_size = 1000, rng = None):
+        if sampler_count > n:
+            raise Exception("ERROR: cannot select more samplers than there are individuals.")
+        self.n = n
+        self.sampler_count = sampler_count
+        self.block_size = block_size
+        self.rng = np.random if rng is None else rng
+        self.block = np.empty((0, sampler_count), dtype = int)
+        self.position = 0
+
+    def next(self):
+        """
+        Returns the samplers for the next time step (numpy array).
+        """
+        if self.position >= self.block.shape[0]:
+            block_size = max(1, min(self.block_size, 1000000 // max(self.sampler_count, 1))) #keep blocks to ~1e6 samplers for large populations
+            self.block = self.draw(block_size)
+            self.position = 0
+        samplers = self.block[self.position]
+        self.position += 1
+        return samplers
+
+    def get_state(self):
+        """
+        Returns the sampler sets that have been generated but not yet handed out, e.g. for checkpointing (numpy array).
+        """
+        return self.block[self.position:]
+
+    def set_state(self, block):
+        """
+        Restores sampler sets saved with get_state(), so they are handed out next.
+        """
+        self.block = np.array(block)
+        self.position = 0
+
+    def draw(self, size):
+        """
+        Generates sampler sets for several time steps at once, one set per row (numpy array, size x sampler_count).
+        Within a row, no individual is selected twice.
+        """
+        m, n = self.sampler_count, self.n
+        if m == 0:
+            return np.empty((size, 0), dtype = int)
+
+        # Many samplers: select the individuals with the m smallest random keys
+        if 4 * m > n:
+            keys = self.rng.random((size, n))
+            return np.argpartition(keys, m - 1, axis = 1)[:, :m]
+
+        # Few samplers: draw a few more than needed (with replacement) and keep the first m distinct individuals in each row.
+        # Keeping the first distinct draws (rather than, say, the smallest) keeps each set a uniformly random subset.
+        extra = int(2 * m * m / n) + 8 #expected number of repeats is ~m^2 / 2n
+        draws = np.floor(self.rng.random((size, m + extra)) * n).astype(int)
+        order = np.argsort(draws, axis = 1, kind = 'stable')
+        sorted_draws = np.take_along_axis(draws, order, axis = 1)
+        first_sorted = np.ones(sorted_draws.shape, dtype = bool)
+        first_sorted[:, 1:] = sorted_draws[:, 1:] != sorted_draws[:, :-1]
+        first_draw = np.empty(first_sorted.shape, dtype = bool)
+        np.put_along_axis(first_draw, order, first_sorted, axis = 1)
+        keep = first_draw & (np.cumsum(first_draw, axis = 1) <= m)
+
+        # Rows that (rarely) didn't have enough distinct draws are redrawn
+        complete = np.sum(keep, axis = 1) == m
+        samplers = np.empty((size, m), dtype = int)
+        samplers[complete] = draws[complete][keep[complete]].reshape((-1, m))
+        if not np.all(complete):
+            samplers[~complete] = self.draw(np.sum(~complete))
+        return samplers
@@ -7,43 +7,93 @@ Created on Mon Nov 25 11:44:29 2019
 """
 
 import numpy as np
-import copy
+import scipy.sparse as sparse
+from cascade_models.social_networks.packed_adjacency import PackedAdjacency
+from .simulate_cascade_packed import simulate_cascade_packed
+from .simulate_cascade_sparse import simulate_cascade_sparse
+from .simulate_cascade_structured import network_structure, simulate_cascade_complete, simulate_cascade_regular
 
-def simulate_cascade(network, states, thresholds, samplers):
+def simulate_cascade(network, states, thresholds, samplers, degree = None, return_rounds = False):
     """
     Simulates a cascade given a network and a intial set of active nodes.
     We assume original info samplers who did not become active will not participate in the subsequent cascade.
+    Individuals only ever turn on during a cascade, so each round only the neighbors of newly activated individuals (the "frontier")
+    need their social information updated, and the cascade is over as soon as a round activates no one.
+    If the network is a scipy sparse matrix, the cascade is handed off to the sparse (frontier-based) engine, and bit-packed networks to the packed engine.
+    Complete and regular networks are detected (from degree) and handed off to faster solvers for those structures.
     
     INPUTS:
-    - network:      the network connecting individuals (numpy array).
-    - states:       array listing the behavioral state of every individual (numpy array).
-    - thresholds:   matrix of thresholds for each individual (numpy array).
-    - samplers:     list of samplers that originally tuned into information sources (numpy array).
+    - network:         the network connecting individuals (numpy array, scipy sparse matrix, or PackedAdjacency).
+    - states:          array listing the behavioral state of every individual (numpy array).
+    - thresholds:      matrix of thresholds for each individual (numpy array).
+    - samplers:        list of samplers that originally tuned into information sources (numpy array).
+    - degree:          degree of each individual, if already known (e.g., from NetworkState). Otherwise calculated from network (numpy array).
+    - return_rounds:   whether to also return the number of rounds in which the cascade spread to new individuals (bool).
     """
     
+    # Large, sparse networks use the frontier-based engine
+    if sparse.issparse(network):
+        return simulate_cascade_sparse(network = network, 
+                                       states = states, 
+                                       thresholds = thresholds, 
+                                       samplers = samplers,
+                                       degree = degree,
+                                       return_rounds = return_rounds)
+    # Bit-packed networks count active neighbors with popcounts
+    if isinstance(network, PackedAdjacency):
+        return simulate_cascade_packed(network = network, 
+                                       states = states, 
+                                       thresholds = thresholds, 
+                                       samplers = samplers,
+                                       degree = degree,
+                                       return_rounds = return_rounds)
+    
     # Determine activity state of information samplers.
     # This prevents samplers from later being swept up in a cascade.
-    sampler_states = states[samplers]
-    
+    can_activate = np.ones(states.shape[0], dtype = bool)
+    can_activate[samplers] = False
     
-    # Allow cacade to play out.
-    cascade_happening = True
-    while cascade_happening: 
-        
-        # Individual assess social information relative to thresholds
-        active_neighbors = np.dot(network, states)
+    # Degree doesn't change during cascade
+    if degree is None:
         degree = np.sum(network, axis = 1, keepdims = True)
-        social_stim = np.divide(active_neighbors, degree, out = np.zeros_like(active_neighbors), where = degree!=0) #returns zero where divide-by-zero would otherwise happen. (Only replaces zeros in 'out' at specified 'where' locations)
-        turn_on = social_stim > thresholds
-        
-        # Update behavior, making sure samplers remain in original state (i.e., 0 remains 0)
-        states_last = copy.deepcopy(states)
-        states[turn_on] = 1
-        states[samplers] = sampler_states
-        
-        # Stop once cascade reaches stable state
-        if np.array_equal(states, states_last):
-            cascade_happening = False
+    
+    # Complete and regular networks have faster solvers
+    structure = network_structure(network, degree)
+    if structure == "complete":
+        return simulate_cascade_complete(states = states, 
+                                         thresholds = thresholds, 
+                                         samplers = samplers, 
+                                         return_rounds = return_rounds)
+    elif structure == "regular":
+        return simulate_cascade_regular(network = network, 
+                                        states = states, 
+                                        thresholds = thresholds, 
+                                        samplers = samplers, 
+                                        k = int(np.ndarray.flatten(degree)[0]), 
+                                        return_rounds = return_rounds)
+    degree = np.ndarray.flatten(degree)
+    thresholds = np.ndarray.flatten(thresholds)
+    
+    # First round: everyone assesses the social information from the initially active individuals
+    frontier = np.where(states[:,0] == 1)[0]
+    active_neighbors = np.sum(network[:, frontier], axis = 1).astype(float)
+    social_stim = np.divide(active_neighbors, degree, out = np.zeros_like(active_neighbors), where = degree!=0) #returns zero where divide-by-zero would otherwise happen. (Only replaces zeros in 'out' at specified 'where' locations)
+    frontier = np.where((social_stim > thresholds) & (states[:,0] == 0) & can_activate)[0]
+    states[frontier] = 1
+    
+    # Allow cascade to play out. Only neighbors of the last round's newly active individuals can change their behavior.
+    rounds = 0
+    while len(frontier) > 0:
+        rounds += 1
+        new_active_neighbors = np.sum(network[:, frontier], axis = 1)
+        candidates = np.where(new_active_neighbors > 0)[0]
+        active_neighbors[candidates] += new_active_neighbors[candidates]
+        candidates = candidates[(states[candidates, 0] == 0) & can_activate[candidates]]
+        social_stim = active_neighbors[candidates] / degree[candidates] #touched individuals always have degree > 0
+        frontier = candidates[social_stim > thresholds[candidates]]
+        states[frontier] = 1
             
     # Return post-cascade behavioral states
-    return states
\ No newline at end of file
+    if return_rounds:
+        return states, rounds
+    return states
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 11:03:47 2026
+
+@author: ChrisTokita
+"""
+
+import numpy as np
+import scipy.sparse as sparse
+from .simulate_cascade_structured import network_structure
+
+def simulate_cascade_batch(network, states, thresholds, sampler_mask):
+    """
+    Simulates many independent cascades on the same network at once.
+    Each column of the state matrix is a separate cascade. All unfinished cascades are propagated together in a single matrix multiplication
+    and each column drops out of the computation as soon as it reaches a stable state.
+    On a complete network, the matrix multiplication is skipped: every inactive individual's active neighbors are simply everyone active in that cascade.
+    We assume original info samplers who did not become active will not participate in the subsequent cascade.
+
+    INPUTS:
+    - network:        the network connecting individuals (numpy array or scipy sparse matrix).
+    - states:         behavioral state of every individual in each cascade (numpy array, n x number of cascades).
+    - thresholds:     matrix of thresholds for each individual (numpy array).
+    - sampler_mask:   whether each individual was an original sampler in each cascade (boolean numpy array, n x number of cascades).
+    """
+
+    # Get degree once, since network doesn't change across cascades
+    degree = np.asarray(network.sum(axis = 1)).reshape((-1, 1))
+    complete = not sparse.issparse(network) and network_structure(network, degree) == "complete"
+
+    # Allow cascades to play out
+    unconverged = np.arange(states.shape[1])
+    while len(unconverged) > 0:
+
+        # Individuals assess social information relative to thresholds (only in ongoing cascades)
+        current_states = states[:, unconverged]
+        if complete:
+            active_neighbors = np.repeat(np.sum(current_states, axis = 0, keepdims = True), len(degree), axis = 0) #only used for inactive individuals, who aren't counted themselves
+        else:
+            active_neighbors = np.asarray(network @ current_states)
+        social_stim = np.divide(active_neighbors, degree, out = np.zeros_like(active_neighbors), where = degree!=0)
+
+        # Update behavior, making sure samplers remain in original state (i.e., 0 remains 0)
+        turn_on = (social_stim > thresholds) & (current_states == 0) & ~sampler_mask[:, unconverged]
+        current_states[turn_on] = 1
+        states[:, unconverged] = current_states
+
+        # Stop tracking cascades that reached a stable state
+        unconverged = unconverged[np.any(turn_on, axis = 0)]
+
+    # Return post-cascade behavioral states
+    return states
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 00:31:17 2026
+
+@author: ChrisTokita
+"""
+
+import numpy as np
+
+
+def simulate_cascade_packed(network, states, thresholds, samplers, degree = None, return_rounds = False):
+    """
+    Simulates a cascade given a bit-packed network (PackedAdjacency) and a intial set of active nodes.
+    Each round, the individuals activated in the previous round are packed into bits, and everyone's count of active neighbors
+    is updated by AND-ing their row of the network with those bits and counting the set bits (64 possible ties per operation).
+    We assume original info samplers who did not become active will not participate in the subsequent cascade.
+
+    INPUTS:
+    - network:         the network connecting individuals (PackedAdjacency).
+    - states:          array listing the behavioral state of every individual (numpy array).
+    - thresholds:      matrix of thresholds for each individual (numpy array).
+    - samplers:        list of samplers that originally tuned into information sources (numpy array).
+    - degree:          degree of each individual, if already known (e.g., from NetworkState). Otherwise counted from network (numpy array).
+    - return_rounds:   whether to also return the number of rounds in which the cascade spread to new individuals (bool).
+    """
+
+    # Determine activity state of information samplers.
+    # This prevents samplers from later being swept up in a cascade.
+    can_activate = np.ones(states.shape[0], dtype = bool)
+    can_activate[samplers] = False
+
+    # Degree doesn't change during cascade
+    if degree is None:
+        degree = network.degree()
+    degree = np.ndarray.flatten(degree)
+    thresholds = np.ndarray.flatten(thresholds)
+
+    # Allow cascade to play out, starting from the initially active individuals
+    active_neighbors = network.count_active(states[:,0] == 1).astype(float)
+    rounds = 0
+    while True:
+        # Individuals assess social information relative to thresholds
+        social_stim = np.divide(active_neighbors, degree, out = np.zeros_like(active_neighbors), where = degree!=0)
+        frontier = np.where((social_stim > thresholds) & (states[:,0] == 0) & can_activate)[0]
+        if len(frontier) == 0:
+            break
+        states[frontier] = 1
+        rounds += 1
+        # Newly active individuals add to the social information of those tied to them
+        newly_active = np.zeros(len(degree), dtype = bool)
+        newly_active[frontier] = True
+        active_neighbors += network.count_active(newly_active)
+
+    # Return post-cascade behavioral states
+    if return_rounds:
+        return states, rounds
+    return states
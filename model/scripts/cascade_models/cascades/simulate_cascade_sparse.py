@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 10:12:03 2026
+
+@author: ChrisTokita
+"""
+
+import numpy as np
+import scipy.sparse as sparse
+
+def simulate_cascade_sparse(network, states, thresholds, samplers, degree = None, return_rounds = False):
+    """
+    Simulates a cascade given a sparse network and a intial set of active nodes.
+    Instead of re-evaluating every individual each round, only the neighbors of newly activated individuals are checked,
+    so the cost of a cascade scales with the number of edges it touches rather than n^2.
+    We assume original info samplers who did not become active will not participate in the subsequent cascade.
+
+    INPUTS:
+    - network:      the network connecting individuals (scipy sparse matrix). As in the dense engine, network[i, j] is the tie individual i gets social information through from j.
+                    Ties are read from the frontier's columns, so pass a CSC matrix (as seed_social_network(output = "sparse") returns).
+                    Other formats are converted on every call, which costs O(ties), so convert them once with network.tocsc() before running many cascades.
+    - states:       array listing the behavioral state of every individual (numpy array).
+    - thresholds:   matrix of thresholds for each individual (numpy array).
+    - samplers:     list of samplers that originally tuned into information sources (numpy array).
+    - degree:       degree (row sums) of each individual, if already known (e.g., from NetworkState). Otherwise calculated from network, also O(ties) (numpy array).
+    - return_rounds:   whether to also return the number of rounds in which the cascade spread to new individuals (bool).
+    """
+
+    # Make sure we can slice columns of the network efficiently (individual j's column lists who sees j)
+    if network.format != 'csc':
+        network = sparse.csc_matrix(network)
+    if degree is None:
+        degree = network.sum(axis = 1) #row sums, as in the dense engine
+    degree = np.asarray(degree).flatten()
+    thresholds = np.ndarray.flatten(thresholds)
+
+    # Determine activity state of information samplers.
+    # This prevents samplers from later being swept up in a cascade.
+    can_activate = np.ones(len(degree), dtype = bool)
+    can_activate[samplers] = False
+
+    # Allow cascade to play out, starting from the samplers that became active.
+    active_neighbors = np.zeros(len(degree))
+    frontier = np.where(states[:,0] == 1)[0]
+    rounds = -1 #the samplers' round doesn't count
+    while len(frontier) > 0:
+        rounds += 1
+
+        # Newly active individuals add to the social stimulus of those tied to them
+        frontier_ties = network[:, frontier]
+        touched = frontier_ties.indices
+        np.add.at(active_neighbors, touched, frontier_ties.data)
+
+        # Only touched individuals can change their behavior this round
+        candidates = np.unique(touched)
+        candidates = candidates[(states[candidates, 0] == 0) & can_activate[candidates]]
+        social_stim = np.divide(active_neighbors[candidates], degree[candidates], out = np.zeros(len(candidates)), where = degree[candidates] != 0)
+        frontier = candidates[social_stim > thresholds[candidates]]
+        states[frontier] = 1
+
+    # Return post-cascade behavioral states
+    if return_rounds:
+        return states, max(rounds, 0)
+    return states
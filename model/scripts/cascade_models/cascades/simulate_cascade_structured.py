@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 22:06:37 2026
+
+@author: ChrisTokita
+"""
+
+import numpy as np
+
+
+def network_structure(network, degree):
+    """
+    Identifies networks whose structure allows a faster cascade solver: "complete" (everyone tied to everyone else),
+    "regular" (everyone has the same degree k > 0), or None for any other network. Only looks at degree and the diagonal, so this is O(n).
+
+    INPUTS:
+    - network:   the network connecting individuals (numpy array).
+    - degree:    degree of each individual (numpy array).
+    """
+    degree = np.ndarray.flatten(degree)
+    n = len(degree)
+    if n == 0 or degree[0] == 0 or np.any(degree != degree[0]):
+        return None
+    if np.any(np.diagonal(network) != 0): #self-ties would throw off the count of ties to others
+        return None
+    if degree[0] == n - 1:
+        return "complete"
+    return "regular"
+
+
+def simulate_cascade_complete(states, thresholds, samplers, return_rounds = False):
+    """
+    Simulates a cascade on a complete network (everyone tied to everyone else).
+    Every inactive individual then sees the same social information (the fraction of others who are active),
+    so each round simply activates the non-samplers whose thresholds fall below that fraction. With thresholds sorted once,
+    each round is a binary search and no network is needed at all.
+
+    INPUTS:
+    - states:          array listing the behavioral state of every individual (numpy array).
+    - thresholds:      matrix of thresholds for each individual (numpy array).
+    - samplers:        list of samplers that originally tuned into information sources (numpy array).
+    - return_rounds:   whether to also return the number of rounds in which the cascade spread to new individuals (bool).
+    """
+
+    # Individuals who can still be swept up in the cascade, in order of increasing threshold
+    n = states.shape[0]
+    can_activate = states[:,0] == 0
+    can_activate[samplers] = False
+    candidates = np.where(can_activate)[0]
+    thresholds = np.ndarray.flatten(thresholds)[candidates]
+    order = np.argsort(thresholds, kind = 'stable')
+    sorted_thresholds = thresholds[order]
+
+    # Each round, everyone with a threshold below the current fraction of active individuals turns on
+    total_active = float(np.sum(states))
+    activated = 0
+    rounds = 0
+    while n > 1:
+        social_stim = total_active / (n - 1)
+        now_activated = np.searchsorted(sorted_thresholds, social_stim, side = 'left') #number of thresholds < social_stim
+        if now_activated <= activated:
+            break
+        total_active += now_activated - activated
+        activated = now_activated
+        rounds += 1
+    states[candidates[order[:activated]]] = 1
+
+    # Return post-cascade behavioral states
+    if return_rounds:
+        return states, rounds
+    return states
+
+
+def simulate_cascade_regular(network, states, thresholds, samplers, k, return_rounds = False):
+    """
+    Simulates a cascade on a k-regular network (everyone has the same degree k).
+    Since everyone's social information is (active neighbors) / k, each individual's threshold can be converted once into
+    the number of active neighbors needed to turn on, and the cascade is then run on integer neighbor counts,
+    re-evaluating only neighbors of newly activated individuals each round.
+
+    INPUTS:
+    - network:         the network connecting individuals (numpy array).
+    - states:          array listing the behavioral state of every individual (numpy array).
+    - thresholds:      matrix of thresholds for each individual (numpy array).
+    - samplers:        list of samplers that originally tuned into information sources (numpy array).
+    - k:               degree of every individual (int).
+    - return_rounds:   whether to also return the number of rounds in which the cascade spread to new individuals (bool).
+    """
+
+    # Number of active neighbors needed to turn on: the smallest count c with c / k > threshold.
+    # Start from floor(threshold * k) + 1 and correct for rounding, so this agrees exactly with comparing c / k to the threshold.
+    thresholds = np.ndarray.flatten(thresholds)
+    needed = np.floor(thresholds * k).astype(np.int64) + 1
+    needed = np.maximum(needed, 0)
+    too_few = needed / k <= thresholds
+    needed[too_few] += 1
+    too_many = (needed > 0) & ((needed - 1) / k > thresholds)
+    needed[too_many] -= 1
+
+    # Determine activity state of information samplers.
+    # This prevents samplers from later being swept up in a cascade.
+    can_activate = np.ones(states.shape[0], dtype = bool)
+    can_activate[samplers] = False
+
+    # First round: everyone counts their initially active neighbors
+    frontier = np.where(states[:,0] == 1)[0]
+    active_neighbors = np.sum(network[:, frontier], axis = 1)
+    frontier = np.where((active_neighbors >= needed) & (states[:,0] == 0) & can_activate)[0]
+    states[frontier] = 1
+
+    # Allow cascade to play out. Only neighbors of the last round's newly active individuals can change their behavior.
+    rounds = 0
+    while len(frontier) > 0:
+        rounds += 1
+        new_active_neighbors = np.sum(network[:, frontier], axis = 1)
+        candidates = np.where(new_active_neighbors > 0)[0]
+        active_neighbors[candidates] += new_active_neighbors[candidates]
+        candidates = candidates[(states[candidates, 0] == 0) & can_activate[candidates]]
+        frontier = candidates[active_neighbors[candidates] >= needed[candidates]]
+        states[frontier] = 1
+
+    # Return post-cascade behavioral states
+    if return_rounds:
+        return states, rounds
+    return states
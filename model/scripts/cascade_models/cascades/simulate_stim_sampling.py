@@ -9,7 +9,7 @@ Created on Mon Nov 25 11:43:45 2019
 import numpy as np
 import cascade_models.stimulus as st
 
-def simulate_stim_sampling(n, gamma, psi, types, thresholds):
+def simulate_stim_sampling(n, gamma, psi, types, thresholds, stimulus_stream = None, sampler_selector = None, rng = None):
     """
     Simulates initial sampling of information sources.
     
@@ -19,12 +19,22 @@ def simulate_stim_sampling(n, gamma, psi, types, thresholds):
     - psi:          fraction of group that directly sample stimuli each round (float).
     - types:        array of type assignments for each individual (numpy array).
     - thresholds:   matrix of thresholds for each individual (numpy array).
+    - stimulus_stream:   pre-drawn stimuli to take this round's stimuli from. Default (None) draws a new pair directly (StimulusStream).
+    - sampler_selector:  pre-generated sampler sets to take this round's samplers from. Default (None) draws samplers directly (SamplerSelector).
+    - rng:               random number generator for drawing stimuli/samplers directly. Default is numpy's global RNG (numpy Generator or RandomState).
     """
     
     # Generate stimuli for the round and have randomly-chosen samplers react
-    stims = st.generate_stimuli(correlation = gamma, mean = 0)
+    rng = np.random if rng is None else rng
+    if stimulus_stream is None:
+        stims = st.generate_stimuli(correlation = gamma, mean = 0, rng = rng)
+    else:
+        stims = stimulus_stream.next()
     sampler_count = int(round(psi * n))
-    samplers = np.random.choice(range(0, n), size = sampler_count, replace = False)
+    if sampler_selector is None:
+        samplers = rng.choice(range(0, n), size = sampler_count, replace = False)
+    else:
+        samplers = sampler_selector.next()
     samplers_type = types[samplers]
     effective_stim = np.dot(samplers_type, np.transpose(stims))
     samplers_react = effective_stim > thresholds[samplers]
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 11:03:47 2026
+
+@author: ChrisTokita
+"""
+
+import numpy as np
+import cascade_models.stimulus as st
+from .sampler_selector import SamplerSelector
+
+def simulate_stim_sampling_batch(n, gamma, psi, types, thresholds, batch_size, rng = None):
+    """
+    Simulates initial sampling of information sources for many independent rounds at once.
+    Each column of the returned state matrix is a separate round (i.e., a separate cascade).
+
+    INPUTS:
+    - n:            number of individuals in the social system (int).
+    - gamma:        correlation between information sources (float).
+    - psi:          fraction of group that directly sample stimuli each round (float).
+    - types:        array of type assignments for each individual (numpy array).
+    - thresholds:   matrix of thresholds for each individual (numpy array).
+    - batch_size:   number of independent rounds to simulate (int).
+    - rng:          random number generator to draw from. Default is numpy's global RNG (numpy Generator or RandomState).
+
+    OUTPUTS:
+    - stims:             stimuli values for each round, one row per round (numpy array, batch_size x 2).
+    - states:            behavioral state of every individual in each round (numpy array, n x batch_size).
+    - sampler_mask:      whether each individual was a sampler in each round (boolean numpy array, n x batch_size).
+    - samplers_active:   whether each individual was a sampler that became active in each round (boolean numpy array, n x batch_size).
+    """
+
+    # Generate stimuli for each round
+    stims = st.generate_stimuli(correlation = gamma, mean = 0, size = batch_size, rng = rng)
+
+    # Randomly choose samplers for each round (without replacement within a round)
+    sampler_count = int(round(psi * n))
+    samplers = SamplerSelector(n = n, sampler_count = sampler_count, rng = rng).draw(batch_size)
+    sampler_mask = np.zeros((n, batch_size), dtype = bool)
+    sampler_mask[samplers.T, np.arange(batch_size)] = True
+
+    # Samplers react to the stimulus of their preferred source
+    effective_stim = np.dot(types, np.transpose(stims)) #n x batch_size
+    samplers_active = sampler_mask & (effective_stim > thresholds)
+
+    # Set state matrix
+    states = samplers_active.astype(float)
+    return stims, states, sampler_mask, samplers_active
@@ -0,0 +1 @@
+from .networkbreaking_kernel import NUMBA_AVAILABLE, run_networkbreaking_kernel
\ No newline at end of file
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 14:35:12 2026
+
+@author: ChrisTokita
+
+DESCRIPTION:
+Compiled (numba) version of the full network-breaking time step: stimulus draw, sampling, cascade, behavior evaluation, and tie adjustment.
+Fusing these into one kernel avoids crossing the python/numpy boundary dozens of times per time step.
+
+NOTE: numba keeps its own random number generator, separate from numpy's global RNG.
+The kernel is seeded explicitly, so results are reproducible but will not match the numpy version draw-for-draw (only statistically).
+"""
+
+import math
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    def njit(*args, **kwargs):
+        # Without numba the kernel still runs, just as (very slow) plain python
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda function: function
+
+
+@njit(cache = True)
+def run_networkbreaking_kernel(adjacency, thresholds, type_A, gamma, sampler_count, timesteps, seed):
+    """
+    Runs the network-breaking model for a number of time steps, updating the adjacency matrix in place.
+
+    INPUTS:
+    - adjacency:       the network connecting individuals (numpy array, int64). Modified in place.
+    - thresholds:      threshold of each individual (1-D numpy array, float).
+    - type_A:          whether each individual prefers information source A (1-D numpy array, bool).
+    - gamma:           correlation between information sources (float).
+    - sampler_count:   number of individuals sampling info sources each time step (int).
+    - timesteps:       number of time steps to run (int).
+    - seed:            seed for numba's random number generator (int).
+    """
+
+    np.random.seed(seed)
+    n = adjacency.shape[0]
+    degree = np.zeros(n, dtype = np.int64)
+    for i in range(n):
+        degree[i] = np.sum(adjacency[i, :])
+    sampler_pool = np.arange(n) #persistent buffer for partial Fisher-Yates sampling
+    states = np.zeros(n, dtype = np.int64)
+    is_sampler = np.zeros(n, dtype = np.bool_)
+    active_neighbors = np.zeros(n, dtype = np.int64)
+    frontier = np.zeros(n, dtype = np.int64)
+    actives = np.zeros(n, dtype = np.int64)
+    candidates = np.zeros(n, dtype = np.int64)
+    gamma_complement = math.sqrt(max(1.0 - gamma**2, 0.0))
+
+    for t in range(timesteps):
+
+        # Generate correlated stimuli and translate to percentiles (normal CDF)
+        z_A = np.random.standard_normal()
+        z_B = gamma * z_A + gamma_complement * np.random.standard_normal()
+        stim_A = 0.5 * math.erfc(-z_A / math.sqrt(2.0))
+        stim_B = 0.5 * math.erfc(-z_B / math.sqrt(2.0))
+
+        # Reset states for this round
+        states[:] = 0
+        is_sampler[:] = False
+        active_neighbors[:] = 0
+
+        # Randomly choose samplers (partial Fisher-Yates shuffle) and have them react
+        n_frontier = 0
+        for s in range(sampler_count):
+            swap = np.random.randint(s, n)
+            sampler = sampler_pool[swap]
+            sampler_pool[swap] = sampler_pool[s]
+            sampler_pool[s] = sampler
+            is_sampler[sampler] = True
+            stim = stim_A if type_A[sampler] else stim_B
+            if stim > thresholds[sampler]:
+                states[sampler] = 1
+                frontier[n_frontier] = sampler
+                n_frontier += 1
+
+        # Cascade: newly active individuals add to their neighbors' social stimulus
+        head = 0
+        while head < n_frontier:
+            focal = frontier[head]
+            head += 1
+            for j in range(n):
+                if adjacency[focal, j] == 1:
+                    active_neighbors[j] += 1
+                    if states[j] == 0 and not is_sampler[j]:
+                        if active_neighbors[j] / degree[j] > thresholds[j]:
+                            states[j] = 1
+                            frontier[n_frontier] = j
+                            n_frontier += 1
+
+        # Tie adjustment. Mirrors numpy version, including skipping rounds where only individual 0 is active
+        n_active = 0
+        active_index_sum = 0
+        for i in range(n):
+            if states[i] == 1:
+                actives[n_active] = i
+                n_active += 1
+                active_index_sum += i
+        if active_index_sum == 0:
+            continue
+        focal = actives[np.random.randint(0, n_active)]
+        stim = stim_A if type_A[focal] else stim_B
+        if stim > thresholds[focal]: #behaved correctly
+            continue
+
+        # Break tie with randomly selected active neighbor
+        n_candidates = 0
+        for j in range(n):
+            if adjacency[focal, j] == 1 and states[j] == 1:
+                candidates[n_candidates] = j
+                n_candidates += 1
+        break_tie = candidates[np.random.randint(0, n_candidates)]
+        adjacency[focal, break_tie] = 0
+        adjacency[break_tie, focal] = 0
+        degree[focal] -= 1
+        degree[break_tie] -= 1
+
+        # Randomly select individual (not already connected to everyone) to form new tie
+        n_candidates = 0
+        for i in range(n):
+            if degree[i] != n - 1:
+                candidates[n_candidates] = i
+                n_candidates += 1
+        former = candidates[np.random.randint(0, n_candidates)]
+        n_candidates = 0
+        for j in range(n):
+            if adjacency[former, j] == 0 and j != former:
+                candidates[n_candidates] = j
+                n_candidates += 1
+        new_tie = candidates[np.random.randint(0, n_candidates)]
+        adjacency[former, new_tie] = 1
+        adjacency[new_tie, former] = 1
+        degree[former] += 1
+        degree[new_tie] += 1
+
+    return adjacency
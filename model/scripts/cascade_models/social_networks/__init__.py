@@ -1 +1,6 @@
+from .dense_adjacency import dense_adjacency
+from .network_distance import network_distances, distance_distribution
+from .network_metrics import network_metrics, run_network_metrics
+from .network_state import NetworkState
+from .packed_adjacency import PackedAdjacency
 from .seed_social_network import seed_social_network
\ No newline at end of file
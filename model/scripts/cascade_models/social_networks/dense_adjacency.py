@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 22:41:12 2026
+
+@author: ChrisTokita
+"""
+
+import numpy as np
+import scipy.sparse as sparse
+from .packed_adjacency import PackedAdjacency
+
+
+def dense_adjacency(network, n = None, edgelist = False):
+    """
+    Returns a network as a dense adjacency matrix, whichever form it was seeded in (see seed_social_network(output = ...)).
+    Only use on populations small enough for an n x n matrix to fit in memory.
+    
+    INPUTS:
+    - network:    the network connecting individuals (numpy array, scipy sparse matrix, PackedAdjacency, or edge list with one row per tie).
+    - n:          number of individuals in the social system. Only used for edge lists, where the last individuals may have no ties (int).
+    - edgelist:   whether network is an edge list rather than an adjacency matrix. Edge lists can't be told apart from small matrices by shape,
+                  so this must be set for them (bool).
+    """
+    
+    if sparse.issparse(network):
+        return network.toarray()
+    if isinstance(network, PackedAdjacency):
+        return network.to_dense()
+    network = np.asarray(network)
+    if edgelist:
+        network = network.reshape((-1, 2))
+        if n is None:
+            n = int(network.max()) + 1 if len(network) > 0 else 0
+        adjacency = np.zeros((n, n), dtype = np.int64)
+        np.add.at(adjacency, (network[:,0], network[:,1]), 1)
+        return adjacency
+    return network
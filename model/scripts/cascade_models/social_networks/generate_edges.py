@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 23:02:48 2026
+
+@author: ChrisTokita
+
+DESCRIPTION:
+Native network generators, drawing only from a numpy random number generator (so networks are reproducible from the replicate's seed)
+and returning edge lists (one row per tie, listed once for undirected networks) that never pass through an n x n matrix.
+Used by seed_social_network(generator = "native").
+"""
+
+import numpy as np
+
+
+def generate_edges(n, network_type, n_edges, out_links, directed, rng):
+    """
+    Generates the edge list of a network of the requested type.
+
+    INPUTS:
+    - n:              number of individuals in the social system (int).
+    - network_type:   type of network to generate: random, scalefree, smallworld, complete (str).
+    - n_edges:        number of edges for random networks (int).
+    - out_links:      number of links added per individual for scale-free/small-world networks (int).
+    - directed:       whether the network is directed (bool).
+    - rng:            random number generator to draw from (numpy Generator).
+    """
+
+    if network_type == "random":
+        return erdos_renyi_edges(n, n_edges, directed, rng)
+    elif network_type == "scalefree":
+        return barabasi_edges(n, out_links, directed, rng)
+    elif network_type == "smallworld":
+        return watts_strogatz_edges(n, out_links, 0.05, rng)
+    elif network_type == "complete":
+        return complete_edges(n, directed)
+    raise Exception("ERROR: no native generator for '" + str(network_type) + "' networks. Use generator = 'igraph'.")
+
+
+def erdos_renyi_edges(n, n_edges, directed, rng):
+    """
+    Erdos-Renyi G(n, m) network: exactly n_edges ties, chosen uniformly among all possible ties (no self-ties or repeated ties).
+    Random pairs are drawn in bulk and duplicates discarded, so this is O(n_edges) unless the network is nearly complete.
+    """
+
+    possible = n * (n - 1) if directed else n * (n - 1) // 2
+    if n_edges > possible:
+        raise Exception("ERROR: cannot place " + str(n_edges) + " ties among " + str(n) + " individuals.")
+    keys = np.empty(0, dtype = np.int64)
+    while len(keys) < n_edges:
+        # Draw more pairs than needed, to cover self-ties and repeats
+        needed = n_edges - len(keys)
+        draws = int(needed * (1 + 2 * n_edges / possible)) + 16
+        i = rng.integers(0, n, size = draws)
+        j = rng.integers(0, n, size = draws)
+        keep = i != j
+        i, j = i[keep], j[keep]
+        if not directed:
+            i, j = np.minimum(i, j), np.maximum(i, j)
+        # Keep the first draw of each new tie, in the order drawn
+        keys = np.concatenate((keys, i * n + j))
+        _, first = np.unique(keys, return_index = True)
+        keys = keys[np.sort(first)][:n_edges]
+    return np.column_stack((keys // n, keys % n))
+
+
+def watts_strogatz_edges(n, nei, p, rng):
+    """
+    Watts-Strogatz small-world network (undirected): a ring where everyone is tied to their nei nearest neighbors on each side,
+    after which each tie is rewired with probability p to a new, randomly chosen individual (avoiding self-ties and repeated ties).
+    """
+
+    # Ring lattice
+    i = np.repeat(np.arange(n), nei)
+    j = (i + np.tile(np.arange(1, nei + 1), n)) % n
+    edges = np.column_stack((i, j))
+
+    # Rewire the far end of randomly selected ties, one at a time so that no tie is created twice
+    rewire = np.where(rng.random(len(edges)) < p)[0]
+    neighbors = [set() for _ in range(n)]
+    for a, b in edges.tolist():
+        neighbors[a].add(b)
+        neighbors[b].add(a)
+    targets = rng.integers(0, n, size = 2 * len(rewire) + 16).tolist()
+    for e in rewire.tolist():
+        a, b = int(edges[e, 0]), int(edges[e, 1])
+        if len(neighbors[a]) >= n - 1: #a is already tied to everyone else, so keep the original tie
+            continue
+        while True:
+            if len(targets) == 0:
+                targets = rng.integers(0, n, size = 2 * len(rewire) + 16).tolist()
+            c = targets.pop()
+            if c != a and c not in neighbors[a]:
+                break
+        neighbors[a].discard(b)
+        neighbors[b].discard(a)
+        neighbors[a].add(c)
+        neighbors[c].add(a)
+        edges[e, 1] = c
+    return edges
+
+
+def barabasi_edges(n, out_links, directed, rng):
+    """
+    Barabasi-Albert scale-free network (linear preferential attachment): individuals join one at a time and tie themselves to out_links
+    different individuals already present, each chosen with probability proportional to their degree + 1 (in-degree + 1 if directed).
+    Instead of recalculating probabilities, every tie end is kept in a list, so choosing proportional to degree is choosing a random list entry.
+    """
+
+    sources = []
+    targets = []
+    tie_ends = [] #each individual appears once per (in-)tie they have
+    uniform = []
+    for new in range(1, n):
+        links = min(out_links, new) #early individuals can only tie to everyone already present
+        chosen = set()
+        while len(chosen) < links:
+            if len(uniform) < 2:
+                uniform = rng.random(max(16, 4 * (n - new) * out_links)).tolist()
+            # Degree part (weight = number of tie ends) vs. the +1 every individual gets (weight = number of individuals)
+            ends_count = len(tie_ends)
+            if uniform.pop() * (ends_count + new) < ends_count:
+                chosen.add(tie_ends[int(uniform.pop() * ends_count)])
+            else:
+                chosen.add(int(uniform.pop() * new))
+        chosen = sorted(chosen)
+        sources.extend([new] * links)
+        targets.extend(chosen)
+        tie_ends.extend(chosen)
+        if not directed:
+            tie_ends.extend([new] * links)
+    return np.column_stack((np.array(sources, dtype = np.int64), np.array(targets, dtype = np.int64))).reshape((-1, 2))
+
+
+def complete_edges(n, directed):
+    """
+    Complete network: everyone is tied to everyone else.
+    """
+
+    i, j = np.where(~np.eye(n, dtype = bool)) if directed else np.triu_indices(n, k = 1)
+    return np.column_stack((i, j)).astype(np.int64)
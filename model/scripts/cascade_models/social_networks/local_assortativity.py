@@ -11,50 +11,47 @@ NOTE: The code below uses newer 3.5+ python math operators for linear algebra:
 """
 
 import numpy as np
-import networkx as nx
-import copy
+import scipy.sparse as sparse
+import scipy.sparse.linalg as splinalg
+from .network_distance import network_distances
 
 
-def local_assortativity(network, types, alpha):
+def local_assortativity(network, types, alpha, tolerance = None):
     """
     This function measures local assortativity according to recent methods (based on Peel, Delvenne, Lambiotte 2018).
     This is for categorical traits (e.g., political type).
     It will return a local assortativity value for each individual in the network.
     
+    Every individual's value is computed at once: summed over types, e_gg(l) is the page rank weights of l times the fraction of
+    each individual's ties that go to their own type, so the whole calculation is a couple of matrix products.
+    Replicates with the same number of individuals can be batched by stacking their networks (replicates x n x n) and types (replicates x n),
+    in which case one row of values is returned per replicate.
+    For large networks, give a tolerance to approximate the page rank weighting with a truncated random walk (see random_walk_average()),
+    which needs memory proportional to the number of ties instead of n x n. Values are then within tolerance / Q_max of the exact ones.
+    
     INPUTS:
-    - network:   the network connecting individuals (numpy array).
-    - types:     the categorical type of each individual (numpy array).
-    - alpha:     the size of the neighborhood when calculating assortativity. 0 is entirely local, 1 is entirely global (float).
+    - network:     the network connecting individuals (numpy array or scipy sparse matrix, or numpy array of stacked networks).
+    - types:       the categorical type of each individual (numpy array).
+    - alpha:       the size of the neighborhood when calculating assortativity. 0 is entirely local, 1 is entirely global (float).
+    - tolerance:   maximum error of the page rank weighted sums. Default (None) calculates page rank exactly (float).
     """
     
-    # Get degree and probability transition matrix (adjacency matrix normalized by degree)
-    # The latter will get used in random walk algorithm to determine graph kernel for each node.
-    degree = network.sum(axis = 1, keepdims = True)
-    nonzero_entries = (degree > 0).flatten() #boolean index on where zero-degree individuals are
-    normalized_network = copy.deepcopy(network.astype(float)) #create normalized network, and convert to float for division
-    normalized_network[nonzero_entries] = normalized_network[nonzero_entries] / degree[nonzero_entries] #divide row by degree to get proportion of edges for each individual
+    # Get degree and the fraction of each individual's ties that go to each type
+    network = as_network(network)
+    degree = network_degree(network)
+    type_membership = types_one_hot(types)
+    categorized_connections = connections_by_type(network, types, degree)
+    same_type_connections = np.sum(categorized_connections * type_membership, axis = -1) #fraction of ties to own type
     
     # Calculate global assortativity measures
     a_g, Q_max = global_assort_values(network, types)
     
-    # Calculate local assortativity
-    categorized_connections = connections_by_type(normalized_network, types)
-    weights = personalized_page_rank(network, alpha)
-    local_assort = np.array([])
-    for i in range(network.shape[0]): #loop over individuals
-        # If individual has degree of zero, they have no local assortativity
-        if degree[i] == 0: 
-            local_assort = np.append(local_assort, np.nan)
-        else:
-            # Otherwise calculate local assortativity
-            deviation_from_global = 0 #portion in the sum of equation [6] in paper
-            for t in np.unique(types):
-                this_type = types == t
-                e_gg = weights[i, this_type] @ categorized_connections[this_type, t] #e_gg(l) value
-                deviation_from_global += e_gg - a_g[t]**2
-            # Normalize by Q_max per equation [6] in paper
-            r_l = deviation_from_global / Q_max
-            local_assort = np.append(local_assort, r_l)
+    # Calculate local assortativity: SUM_g e_gg(l) - a_g^2, normalized by Q_max per equation [6] in paper
+    e_gg = page_rank_average(network, same_type_connections, alpha, tolerance)
+    local_assort = (e_gg - np.sum(a_g**2, axis = -1, keepdims = True)) / Q_max[..., np.newaxis]
+    
+    # If individual has degree of zero, they have no local assortativity
+    local_assort[degree == 0] = np.nan
         
     #Return values
     return local_assort
@@ -65,80 +62,173 @@ def global_assort_values(network, types):
     Function that will calculate Qmax and a_g for use in calculating assortativity
     
     INPUTS:
-    - network:   the network connecting individuals (numpy array).
+    - network:   the network connecting individuals (numpy array or scipy sparse matrix, or numpy array of stacked networks).
     - types:     the categorical type of each individual (numpy array).
     """
     
-    m = np.sum(network) / 2 #total number of unique edges
-    a_g = np.array([])
-    for t in np.unique(types):
-        this_type = np.where(types == t)[0]
-        type_subnetwork = network[this_type,:]
-        normalized_degree = np.sum(type_subnetwork, axis = 1) / (2*m)
-        a_g = np.append(a_g, np.sum(normalized_degree))
-    Q_max = 1 - np.sum(a_g**2)
+    degree = network_degree(as_network(network))
+    m = np.sum(degree, axis = -1) / 2 #total number of unique edges
+    a_g = np.sum(degree[..., np.newaxis] * types_one_hot(types), axis = -2) / (2*m[..., np.newaxis])
+    Q_max = 1 - np.sum(a_g**2, axis = -1)
     return a_g, Q_max
 
 
-def connections_by_type(normalized_network, types):
+def connections_by_type(network, types, degree = None):
     # Function that determines how many connections each individual has to individuals of a particular type.
     # Returns an array where each row is an individual and each column is a type (e.g., type 0 and type 1).
+    # If degree is given, connections are returned as a fraction of each individual's ties (as if the network were normalized by degree).
     #
     # INPUTS:
-    # - normalized_network:   the network connecting individuals, with each row normalized by degree. (numpy array).
-    # - types:                the categorical type of each individual (numpy array).
-    
-    categorized_connections = np.zeros((normalized_network.shape[0], len(np.unique(types))))
-    for t in np.unique(types):
-        this_type = np.where(types == t)[0]
-        type_connections = normalized_network[:,this_type] #only look at connections to individuals to type t
-        categorized_connections[:,t] = np.sum(type_connections, axis = 1)
+    # - network:   the network connecting individuals (numpy array or scipy sparse matrix, or numpy array of stacked networks).
+    # - types:     the categorical type of each individual (numpy array).
+    # - degree:    degree of each individual (numpy array).
+    
+    categorized_connections = np.asarray(network @ types_one_hot(types), dtype = float)
+    if degree is not None:
+        degree = degree[..., np.newaxis]
+        categorized_connections = np.divide(categorized_connections, degree, out = np.zeros_like(categorized_connections), where = degree != 0)
     return categorized_connections
 
 
+def types_one_hot(types):
+    # Returns a matrix with one row per individual and a column per type, marking each individual's type with a 1.
+    # Types are numbered 0, 1, ... (columns follow np.unique(types)).
+    
+    types = np.asarray(types)
+    if types.ndim > 1 and types.shape[-1] == 1: #column vector of types
+        types = types[..., 0]
+    return (types[..., np.newaxis] == np.unique(types)).astype(float)
+
+
+def as_network(network):
+    # Returns the network as a float scipy sparse matrix or numpy array (for a stack of networks), ready for matrix products.
+    
+    if sparse.issparse(network):
+        return sparse.csr_matrix(network, dtype = float)
+    return np.asarray(network, dtype = float)
+
+
+def network_degree(network):
+    # Returns the degree of each individual (numpy array, shape n, or replicates x n for a stack of networks).
+    
+    return np.asarray(network.sum(axis = -1)).reshape(network.shape[:-1])
+
+
 def calculate_distance(network):
-    # Function to create distance matrix for the network.
+    # Function to create distance matrix for the network (NaN where individuals are not connected).
+    # Uses one breadth-first search per individual (see network_distance.network_distances()).
     #
     # INPUTS:
     # - network: the network connecting individuals (numpy array).
     
-    g = nx.from_numpy_matrix(network)
-    distance_matrix = np.zeros(network.shape)
-    # Loop over all individuals and connections
-    for i in range(network.shape[0]): 
-        for j in range(network.shape[1]):
-            try:
-                p = nx.shortest_path(g, i, j)
-                distance_matrix[i,j] = len(p) - 1 #includes starting node in shortest path
-            except:
-                distance_matrix[i,j] = np.nan
-    return distance_matrix
+    return network_distances(network)
 
 
-def personalized_page_rank(network, alpha):
+def personalized_page_rank(network, alpha, individuals = None):
     # Function to calcualte the personalized page rank for each individual.
-    # Returns a matrix the same dimensions as the network, where each row will have the page rank for that individual.
+    # Returns a matrix with one row per individual, where each row will have the page rank for that individual.
+    # Rather than running page rank to convergence once per individual, all personalized page rank vectors are found at once:
+    # with W the network normalized by degree, the rows of X solve X = alpha X W + (1 - alpha) I, i.e., (I - alpha W^T) X^T = (1 - alpha) I.
+    # For every individual, this is one dense linear solve (the n x n result is dense anyway).
+    # For a few individuals, the sparse system is LU-factorized and solved only for their columns.
     #
     # INPUTS:
-    # - normalized_network:   the network connecting individuals, with each row normalized by degree (numpy array).
-    # - alpha:                the return probability for the walker (float).
-
-    zero_degrees = np.where(np.sum(network, axis = 1) == 0)[0] #individuals that aren't connected to anyone
-    page_rank_values = np.zeros_like(network, dtype = float)
-    g = nx.from_numpy_matrix(network)
-    for i in range(network.shape[0]): 
-        if i in zero_degrees:
-            pagerank_vals = np.zeros(network.shape[0])
-            pagerank_vals[i] = 1
-        else:
-            personal_dict = {i: 1}
-            personalized_pagerank = nx.pagerank(g, alpha = alpha, personalization = personal_dict)
-            pagerank_vals = list(personalized_pagerank.values())
-        page_rank_values[i,:] = np.array(pagerank_vals)
+    # - network:       the network connecting individuals (numpy array or scipy sparse matrix, or numpy array of stacked networks).
+    # - alpha:         the probability the walker continues (rather than returning to start) each step (float).
+    # - individuals:   individuals to return page rank values for. Default (None) returns rows for all individuals (numpy array).
+
+    if not sparse.issparse(network) and np.ndim(network) == 3:
+        return stacked_personalized_page_rank(np.asarray(network, dtype = float), alpha, individuals)
+    network = sparse.csr_matrix(network, dtype = float)
+    n = network.shape[0]
+    degree = np.asarray(network.sum(axis = 1)).flatten()
+    inverse_degree = np.divide(1, degree, out = np.zeros_like(degree), where = degree != 0)
+    transition = sparse.diags(inverse_degree) @ network #normalized by degree (rows of zero-degree individuals stay zero)
+    system = sparse.identity(n) - alpha * transition.T
+    if individuals is None:
+        individuals = np.arange(n)
+        page_rank_values = np.linalg.solve(system.toarray(), (1 - alpha) * np.identity(n)).T
+    else:
+        individuals = np.atleast_1d(individuals)
+        right_hand_side = np.zeros((n, len(individuals)))
+        right_hand_side[individuals, np.arange(len(individuals))] = 1 - alpha
+        page_rank_values = splinalg.splu(sparse.csc_matrix(system)).solve(right_hand_side).T
+    # Individuals that aren't connected to anyone keep all weight on themselves
+    zero_degrees = np.where(degree[individuals] == 0)[0]
+    page_rank_values[zero_degrees, :] = 0
+    page_rank_values[zero_degrees, individuals[zero_degrees]] = 1
     return page_rank_values
        
 
-def local_assortativity_continuous(network, thresholds, alpha):
+def page_rank_average(network, values, alpha, tolerance = None):
+    # Returns, for every individual, the average of values weighted by that individual's personalized page rank,
+    # i.e., personalized_page_rank(network, alpha) @ values, either exactly (tolerance = None) or with random_walk_average().
+    #
+    # INPUTS:
+    # - network:     the network connecting individuals (numpy array or scipy sparse matrix, or numpy array of stacked networks).
+    # - values:      value to average for each individual (numpy array, shape n, or replicates x n for a stack of networks).
+    # - alpha:       the probability the walker continues (rather than returning to start) each step (float).
+    # - tolerance:   maximum error of the averages (float).
+    
+    if tolerance is None:
+        weights = personalized_page_rank(network, alpha)
+        return (weights @ values[..., np.newaxis])[..., 0]
+    return random_walk_average(network, values, alpha, tolerance)
+
+
+def random_walk_average(network, values, alpha, tolerance):
+    # Approximates personalized page rank weighted averages without the n x n page rank matrix.
+    # The personalized page rank rows are X = (1 - alpha) SUM_k alpha^k W^k, with W the network normalized by degree,
+    # so X @ values is built up one walk step at a time (W^k @ values from W^(k-1) @ values, a sparse matrix-vector product).
+    # The steps left out after step k add up to at most alpha^(k+1) max|values|, so walking stops once that falls below tolerance.
+    # Memory is proportional to the number of ties and time to the number of ties x log(tolerance) / log(alpha).
+    #
+    # INPUTS:
+    # - network:     the network connecting individuals (numpy array or scipy sparse matrix, or numpy array of stacked networks).
+    # - values:      value to average for each individual (numpy array, shape n, or replicates x n for a stack of networks).
+    # - alpha:       the probability the walker continues (rather than returning to start) each step (float).
+    # - tolerance:   maximum error of the averages (float).
+    
+    if not 0 <= alpha < 1:
+        raise Exception("ERROR: approximate page rank needs 0 <= alpha < 1.")
+    if tolerance <= 0:
+        raise Exception("ERROR: tolerance must be positive.")
+    network = as_network(network)
+    degree = network_degree(network)
+    inverse_degree = np.divide(1, degree, out = np.zeros_like(degree), where = degree != 0)
+    values = np.asarray(values, dtype = float)
+    step = (1 - alpha) * values #contribution of walks of length k (k = 0 to start)
+    average = step.copy()
+    remaining = alpha * np.max(np.abs(values), initial = 0) #bound on the contribution of all longer walks
+    while remaining > tolerance:
+        step = alpha * inverse_degree * np.asarray(network @ step[..., np.newaxis])[..., 0]
+        average += step
+        remaining *= alpha
+    # Individuals that aren't connected to anyone keep all weight on themselves
+    average[degree == 0] = values[degree == 0]
+    return average
+
+
+def stacked_personalized_page_rank(networks, alpha, individuals = None):
+    # Personalized page rank for a stack of networks with the same number of individuals (replicates x n x n),
+    # solving every replicate's linear system in one batched call. Returns one page rank matrix per replicate.
+    
+    n = networks.shape[-1]
+    degree = networks.sum(axis = -1)
+    inverse_degree = np.divide(1, degree, out = np.zeros_like(degree), where = degree != 0)
+    transition = networks * inverse_degree[..., np.newaxis] #normalized by degree (rows of zero-degree individuals stay zero)
+    system = np.identity(n) - alpha * np.swapaxes(transition, -1, -2)
+    page_rank_values = np.swapaxes(np.linalg.solve(system, (1 - alpha) * np.broadcast_to(np.identity(n), system.shape)), -1, -2)
+    # Individuals that aren't connected to anyone keep all weight on themselves
+    replicates, zero_degrees = np.where(degree == 0)
+    page_rank_values[replicates, zero_degrees, :] = 0
+    page_rank_values[replicates, zero_degrees, zero_degrees] = 1
+    if individuals is not None:
+        page_rank_values = page_rank_values[:, np.atleast_1d(individuals), :]
+    return page_rank_values
+
+
+def local_assortativity_continuous(network, thresholds, alpha, tolerance = None):
     """
     This function measures local assortativity according to recent methods (based on Peel, Delvenne, Lambiotte 2018; specficially see the supplement for using this metric on scalar attributes).
     This is for continuous traits (e.g., thresholds).
@@ -149,42 +239,40 @@ def local_assortativity_continuous(network, thresholds, alpha):
         
         where xhat_i is the standardized value of x_i, i.e., xhat_i = (x_i - mean(x)) / std(x)
     
+    Replicates with the same number of individuals can be batched by stacking their networks (replicates x n x n) and thresholds (replicates x n).
+    For large networks, give a tolerance to approximate the page rank weighting with a truncated random walk (see random_walk_average()).
+    
     INPUTS:
-    - network:      the network connecting individuals (numpy array).
+    - network:      the network connecting individuals (numpy array or scipy sparse matrix, or numpy array of stacked networks).
     - threhsolds:   the threshold of each individual (numpy array).
     - alpha:        the size of the neighborhood when calculating assortativity. 0 is entirely local, 1 is entirely global (float).
+    - tolerance:    maximum error of the local assortativity values. Default (None) calculates page rank exactly (float).
     """
     
-    # Get degree and probability transition matrix (adjacency matrix normalized by degree)
-    # The latter will get used in random walk algorithm to determine graph kernel for each node.
-    degree = network.sum(axis = 1, keepdims = True)
-    nonzero_entries = (degree > 0).flatten() #boolean index on where zero-degree individuals are
-    normalized_network = copy.deepcopy(network.astype(float)) #create normalized network, and convert to float for division
-    normalized_network[nonzero_entries] = normalized_network[nonzero_entries] / degree[nonzero_entries] #divide row by degree to get proportion of edges for each individual
+    # Get degree
+    network = as_network(network)
+    degree = network_degree(network)
     
-    # Standardize thresholds      
+    # Standardize thresholds (weighted by degree, as each individual appears at the end of degree-many ties)
     # threshold_mean = np.mean(thresholds)
-    threshold_std = np.std(thresholds) 
-    threshold_mean = np.average(thresholds, weights = degree.flatten(), axis = 0)
-    threshold_std = np.sqrt( np.average((thresholds - threshold_mean)**2, weights = degree.flatten(), axis = 0) )
+    thresholds = np.asarray(thresholds, dtype = float).reshape(degree.shape)
+    total_degree = np.sum(degree, axis = -1, keepdims = True)
+    threshold_mean = np.sum(degree * thresholds, axis = -1, keepdims = True) / total_degree
+    threshold_std = np.sqrt( np.sum(degree * (thresholds - threshold_mean)**2, axis = -1, keepdims = True) / total_degree )
     
-    threshold_deviation = (thresholds - threshold_mean).flatten() / threshold_std
+    threshold_deviation = (thresholds - threshold_mean) / threshold_std
     
-    # Calculate each individual's correlation with immediate neighbors
-    local_thresh_corr = np.array([])
-    for i in range(network.shape[0]): #select focal individual to calculate local assort for 
-        pearson_corr = (threshold_deviation[i] * threshold_deviation)
-        corr_weighed_by_network = normalized_network[i,:] @ pearson_corr
-        local_thresh_corr = np.append(local_thresh_corr, corr_weighed_by_network)
+    # Calculate each individual's correlation with immediate neighbors: their deviation times the mean deviation of their neighbors
+    neighbor_deviation = np.asarray(network @ threshold_deviation[..., np.newaxis])[..., 0]
+    neighbor_deviation = np.divide(neighbor_deviation, degree, out = np.zeros_like(neighbor_deviation), where = degree != 0)
+    local_thresh_corr = threshold_deviation * neighbor_deviation
     
     # Calculate local assortativity by weighing the neighbors (and neighbors of neighbors) correlation with their respective neighbors
     # according to local walk (probability of this represented by personalized page rank)
-    weights = personalized_page_rank(network, alpha)
-    local_assort = weights @ local_thresh_corr
+    local_assort = page_rank_average(network, local_thresh_corr, alpha, tolerance)
 
     # Individuals without any neighbors cannot have local assortativity by definition
-    zero_degree = np.where(degree == 0)[0]
-    local_assort[zero_degree] = np.nan
+    local_assort[degree == 0] = np.nan
         
     #Return values
     return local_assort
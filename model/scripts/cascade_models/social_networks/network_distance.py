@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 02:31:07 2026
+
+@author: ChrisTokita
+"""
+
+import numpy as np
+import scipy.sparse as sparse
+import scipy.sparse.csgraph as csgraph
+import multiprocessing as mp
+import hashlib
+from .packed_adjacency import PackedAdjacency
+
+
+def network_distances(network, cutoff = None, sparse_output = False, directed = False, cpus = 1, block_size = 1000, cache = None):
+    """
+    Calculates the shortest path distance (number of ties) between every pair of individuals, with one breadth-first search per individual.
+    With a cutoff, searches stop at that distance, and with sparse output only the pairs found are kept,
+    so distances within a few steps can be found on networks far too large for an n x n matrix.
+
+    INPUTS:
+    - network:         the network connecting individuals (numpy array, scipy sparse matrix, or PackedAdjacency).
+    - cutoff:          only find distances up to this many ties. Default (None) finds all distances (int).
+    - sparse_output:   whether to return a scipy sparse matrix holding only the distances found (diagonal and unreachable pairs left out).
+                       Otherwise returns a numpy array (n x n) with 0 on the diagonal and NaN for pairs beyond the cutoff or not connected (bool).
+    - directed:        whether to follow ties only in their direction. Default treats ties as undirected (bool).
+    - cpus:            number of processes to split the searches across (int).
+    - block_size:      number of individuals searched from at once, which bounds the memory used for sparse output (int).
+    - cache:           dictionary to store and look up results in, keyed by the network's ties and the settings above (dict).
+    """
+
+    # Look up network in cache
+    network = as_sparse_network(network)
+    if cache is not None:
+        key = (network_key(network), cutoff, sparse_output, directed)
+        if key in cache:
+            return cache[key]
+
+    # Run searches in blocks of individuals
+    n = network.shape[0]
+    blocks = [(network, np.arange(start, min(start + block_size, n)), cutoff, sparse_output, directed) for start in range(0, n, block_size)]
+    if cpus > 1 and len(blocks) > 1:
+        with mp.Pool(min(cpus, len(blocks))) as pool:
+            results = pool.map(_search_block, blocks)
+    else:
+        results = [_search_block(block) for block in blocks]
+    if sparse_output:
+        distances = sparse.vstack(results, format = 'csr') if len(results) > 0 else sparse.csr_matrix((n, n))
+    else:
+        distances = np.vstack(results) if len(results) > 0 else np.zeros((n, n))
+
+    # Store and return
+    if cache is not None:
+        cache[key] = distances
+    return distances
+
+
+def distance_distribution(network, cutoff = None, directed = False, cpus = 1, cache = None):
+    """
+    Counts the pairs of individuals at each distance from one another (e.g., to compare networks before and after ties are broken).
+    Returns an array whose entry d is the number of (ordered) pairs of distinct individuals d ties apart. Entry 0 is always zero.
+
+    INPUTS:
+    - network:    the network connecting individuals (numpy array, scipy sparse matrix, or PackedAdjacency).
+    - cutoff:     only count distances up to this many ties. Default (None) counts all connected pairs (int).
+    - directed:   whether to follow ties only in their direction. Default treats ties as undirected (bool).
+    - cpus:       number of processes to split the searches across (int).
+    - cache:      dictionary to store and look up distances in (see network_distances()) (dict).
+    """
+
+    distances = network_distances(network, cutoff = cutoff, sparse_output = True, directed = directed, cpus = cpus, cache = cache)
+    return np.bincount(distances.data.astype(np.int64), minlength = 1 if cutoff is None else cutoff + 1)
+
+
+def as_sparse_network(network):
+    # Returns the network as a scipy sparse matrix (CSR) of its ties.
+
+    if isinstance(network, PackedAdjacency):
+        network = network.to_dense()
+    network = sparse.csr_matrix(network)
+    network.eliminate_zeros()
+    return network
+
+
+def network_key(network):
+    # Returns a hash identifying the ties in a network (str).
+
+    network = sparse.csr_matrix(network)
+    network.sort_indices()
+    key = hashlib.sha256()
+    key.update(np.asarray(network.shape, dtype = np.int64).tobytes())
+    key.update(network.indptr.astype(np.int64).tobytes())
+    key.update(network.indices.astype(np.int64).tobytes())
+    return key.hexdigest()
+
+
+def _search_block(block):
+    # Breadth-first searches from one block of individuals. Returns the block's rows of the distance matrix.
+    network, sources, cutoff, sparse_output, directed = block
+    limit = np.inf if cutoff is None else cutoff
+    distances = csgraph.dijkstra(network, directed = directed, indices = sources, unweighted = True, limit = limit)
+    if sparse_output:
+        distances[np.arange(len(sources)), sources] = np.inf #leave out distance to self
+        rows, columns = np.where(np.isfinite(distances))
+        return sparse.csr_matrix((distances[rows, columns], (rows, columns)), shape = distances.shape)
+    distances[np.isinf(distances)] = np.nan
+    return distances
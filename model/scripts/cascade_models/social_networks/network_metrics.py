@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 03:05:22 2026
+
+@author: ChrisTokita
+
+DESCRIPTION:
+Network metrics of replicate simulations (assortativity, centrality, local assortativity, and ties added/broken by type),
+computed in one pass per replicate, spread across a pool of processes, and cached so re-runs only process new or changed replicates.
+Used by process_socialnetworks.py.
+"""
+
+import numpy as np
+import pandas as pd
+import multiprocessing as mp
+import hashlib
+import igraph
+import os
+import cascade_models.utility as ut
+from .local_assortativity import local_assortativity
+
+METRICS_VERSION = 1 #bump when metrics change, so cached results are recalculated
+ASSORT_COLUMNS = ['assort_type_final', 'assort_type_initial', 'assort_thresh_final', 'assort_thresh_initial']
+CHANGE_COLUMNS = ['individual', 'type', 'threshold',
+                  'degree', 'degree_initial',
+                  'centrality', 'centrality_initial',
+                  'local_assortativity',
+                  'same_type_adds', 'same_type_breaks',
+                  'diff_type_adds', 'diff_type_breaks']
+
+
+def network_metrics(adjacency, adjacency_initial, types, thresholds, alpha = 0.5):
+    """
+    Measures how a replicate's social network changed from start to finish.
+
+    INPUTS:
+    - adjacency:           final social network (numpy array).
+    - adjacency_initial:   initial social network (numpy array).
+    - types:               type assignments of each individual, one column per type (numpy array).
+    - thresholds:          thresholds of each individual (numpy array).
+    - alpha:               scope of an individual's neighborhood for local assortativity (0 for extreme local to 1 for fully global) (float).
+
+    OUTPUTS:
+    - assortativity:       assortativity by type and threshold of the final and initial networks, ordered as ASSORT_COLUMNS (numpy array).
+    - network_change:      one row per individual, with columns CHANGE_COLUMNS (numpy array).
+    """
+
+    # Format threshold and type matrices
+    adjacency = np.asarray(adjacency)
+    adjacency_initial = np.asarray(adjacency_initial)
+    thresholds = np.asarray(thresholds, dtype = float).flatten() #make 1d
+    types = np.argmax(np.asarray(types) == 1, axis = 1) #get categorical types of individuals, type 0 or type 1
+    n = len(types)
+
+    # Calculate assortativity by type and by threshold
+    g_final = undirected_graph(adjacency)
+    g_initial = undirected_graph(adjacency_initial)
+    assortativity = np.array([g_final.assortativity_nominal(types = types.tolist(), directed = False), #type categories are nominal, despite being numbers
+                              g_initial.assortativity_nominal(types = types.tolist(), directed = False),
+                              g_final.assortativity(types1 = thresholds.tolist(), directed = False),
+                              g_initial.assortativity(types1 = thresholds.tolist(), directed = False)])
+
+    # Determine centrality and local assortativity
+    centrality = g_final.eigenvector_centrality() #graphs are undirected
+    centrality_initial = g_initial.eigenvector_centrality() #graphs are undirected
+    local_assort = local_assortativity(network = adjacency, types = types, alpha = alpha)
+
+    # Count new social ties and social tie breaks by whether they are to individuals of the same type
+    adjacency_diff = adjacency.astype(np.int64) - adjacency_initial.astype(np.int64)
+    same_type = types[:, np.newaxis] == types[np.newaxis, :]
+    adds = adjacency_diff == 1
+    breaks = adjacency_diff == -1
+    network_change = np.column_stack((np.arange(n), types, thresholds,
+                                      np.sum(adjacency, axis = 1), np.sum(adjacency_initial, axis = 1),
+                                      centrality, centrality_initial,
+                                      local_assort,
+                                      np.sum(adds & same_type, axis = 1), np.sum(breaks & same_type, axis = 1),
+                                      np.sum(adds & ~same_type, axis = 1), np.sum(breaks & ~same_type, axis = 1))).astype(float)
+    return assortativity, network_change
+
+
+def run_network_metrics(tasks, cache_dir = None, alpha = 0.5, cpus = 1):
+    """
+    Calculates network_metrics() for many replicates on a pool of processes.
+    With a cache directory, each replicate's results are saved under a hash of its input data (and alpha), so re-running
+    only processes replicates that are new or whose data changed.
+
+    INPUTS:
+    - tasks:       replicates to process, as dicts with 'gamma', 'replicate', and either 'files' (paths to the replicate's
+                   sn_final, sn_initial, type and thresh .npy files) or 'store_file' (artifact store holding the replicate) (list of dicts).
+    - cache_dir:   path to directory where per-replicate results are cached. Default (None) does not cache (str).
+    - alpha:       scope of an individual's neighborhood for local assortativity (float).
+    - cpus:        number of processes to use (int).
+
+    OUTPUTS:
+    - assort_data:           assortativity of each replicate (pandas DataFrame).
+    - network_change_data:   network change of each individual in each replicate (pandas DataFrame).
+    """
+
+    if cache_dir is not None:
+        os.makedirs(cache_dir, exist_ok = True)
+    jobs = [(task, cache_dir, alpha) for task in tasks]
+    results = []
+    cached = 0
+    if cpus > 1 and len(jobs) > 1:
+        with mp.Pool(min(cpus, len(jobs))) as pool:
+            for result in pool.imap(_replicate_task, jobs, chunksize = 1):
+                results.append(result)
+                cached += result[4]
+                print_progress(len(results), len(jobs), cached)
+    else:
+        for job in jobs:
+            results.append(_replicate_task(job))
+            cached += results[-1][4]
+            print_progress(len(results), len(jobs), cached)
+
+    # Compile into dataframes
+    assort_data = pd.DataFrame([[gamma, replicate] + list(assortativity) for gamma, replicate, assortativity, _, _ in results],
+                               columns = ['gamma', 'replicate'] + ASSORT_COLUMNS)
+    change_frames = [pd.DataFrame(np.column_stack((np.repeat(gamma, len(network_change)), np.repeat(replicate, len(network_change)), network_change)),
+                                  columns = ['gamma', 'replicate'] + CHANGE_COLUMNS) for gamma, replicate, _, network_change, _ in results]
+    network_change_data = pd.concat(change_frames, ignore_index = True) if len(change_frames) > 0 else pd.DataFrame(columns = ['gamma', 'replicate'] + CHANGE_COLUMNS)
+    return assort_data, network_change_data
+
+
+def load_replicate(task):
+    # Loads the final and initial networks, types and thresholds of one replicate (from memory-mapped .npy files or an artifact store).
+    names = ['sn_final', 'sn_initial', 'type', 'thresh']
+    if 'store_file' in task:
+        for metadata, data in ut.read_artifacts(task['store_file'], model = task.get('model', 'networkbreaking'), gamma = task['gamma'],
+                                                replicate = task['replicate'], artifacts = names):
+            return [data[name] for name in names]
+        raise Exception("ERROR: replicate " + str(task['replicate']) + " of gamma = " + str(task['gamma']) + " not found in " + task['store_file'] + ".")
+    return [np.load(task['files'][name], mmap_mode = 'r') for name in names]
+
+
+def input_hash(arrays, alpha):
+    # Returns a hash of a replicate's input data and settings, used as its cache key (str).
+    key = hashlib.sha256()
+    key.update(repr((METRICS_VERSION, float(alpha))).encode())
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        key.update(repr((array.dtype.str, array.shape)).encode())
+        key.update(memoryview(array).cast('B'))
+    return key.hexdigest()
+
+
+def print_progress(done, total, cached):
+    # Prints how many replicates are done every 10 replicates.
+    if done % 10 == 0 or done == total:
+        print("    %d/%d replicates done (%d from cache)" % (done, total, cached), flush = True)
+
+
+def undirected_graph(adjacency):
+    # Builds an undirected igraph graph from the upper triangle of a (symmetric) adjacency matrix.
+    edges = np.column_stack(np.nonzero(np.triu(adjacency)))
+    return igraph.Graph(n = adjacency.shape[0], edges = edges.tolist(), directed = False)
+
+
+def _replicate_task(job):
+    # Calculates (or loads from cache) the network metrics of one replicate in a worker process.
+    task, cache_dir, alpha = job
+    arrays = load_replicate(task)
+    cache_file = None
+    if cache_dir is not None:
+        cache_file = os.path.join(cache_dir, "networkmetrics_" + input_hash(arrays, alpha) + ".npz")
+        if os.path.exists(cache_file):
+            with np.load(cache_file) as cached:
+                return task['gamma'], task['replicate'], cached['assortativity'], cached['network_change'], True
+    assortativity, network_change = network_metrics(*arrays, alpha = alpha)
+    if cache_file is not None:
+        temp_file = cache_file[:-len(".npz")] + "_tmp" + str(os.getpid()) + ".npz"
+        np.savez(temp_file, assortativity = assortativity, network_change = network_change)
+        os.replace(temp_file, cache_file)
+    return task['gamma'], task['replicate'], assortativity, network_change, False
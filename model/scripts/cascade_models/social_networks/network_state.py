@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 13:21:40 2026
+
+@author: ChrisTokita
+"""
+
+import numpy as np
+from .packed_adjacency import PackedAdjacency
+
+
+class NetworkState:
+    """
+    Holds a social network along with bookkeeping that would otherwise be recomputed from the full adjacency matrix every time step:
+    degree of each individual, each individual's neighbors, and which individuals are already connected to everyone else ("saturated").
+    All of these are updated in O(1) whenever a tie is broken or formed, so tie adjustment never requires summing over the whole network.
+    Running counts of ties broken and formed are kept as well.
+    The neighbor sets give O(1) tie lookups and O(k) neighbor queries, and new partners are found by rejection sampling (see random_non_neighbor()),
+    so tie adjustment never scans a full row of the adjacency matrix either.
+
+    INPUTS:
+    - network:   the network connecting individuals (numpy array or PackedAdjacency). This is updated in place as ties change.
+    """
+
+    def __init__(self, network):
+        self.adjacency = network
+        self.n = network.shape[0]
+        if isinstance(network, PackedAdjacency):
+            self.degree = network.degree()
+            self.neighbors = [set(network.neighbors(i)) for i in range(self.n)]
+        else:
+            self.degree = np.sum(network, axis = 1, keepdims = True) #same shape as thresholds, for use in cascades
+            self.neighbors = [set(np.where(network[i,:] == 1)[0]) for i in range(self.n)]
+        self.saturated = set(np.where(self.degree.flatten() == self.n - 1)[0]) #individuals connected to everyone
+        self._everyone = np.arange(self.n)
+        self.ties_broken = 0
+        self.ties_formed = 0
+
+    def break_tie(self, i, j):
+        """
+        Removes the undirected tie between individuals i and j.
+        """
+        self.adjacency[i, j] = 0
+        self.adjacency[j, i] = 0
+        self.neighbors[i].discard(j)
+        self.neighbors[j].discard(i)
+        self.degree[[i, j]] -= 1
+        self.saturated.discard(i)
+        self.saturated.discard(j)
+        self.ties_broken += 1
+
+    def form_tie(self, i, j):
+        """
+        Adds an undirected tie between individuals i and j.
+        """
+        self.adjacency[i, j] = 1
+        self.adjacency[j, i] = 1
+        self.neighbors[i].add(j)
+        self.neighbors[j].add(i)
+        self.degree[[i, j]] += 1
+        for ind in (i, j):
+            if self.degree[ind] == self.n - 1:
+                self.saturated.add(ind)
+        self.ties_formed += 1
+
+    def has_tie(self, i, j):
+        """
+        Whether individuals i and j are tied.
+        """
+        return j in self.neighbors[i]
+
+    def active_neighbors(self, i, states):
+        """
+        Returns the (sorted) neighbors of individual i that are currently active.
+        """
+        return np.array(sorted([j for j in self.neighbors[i] if states[j] == 1]), dtype = int)
+
+    def not_saturated(self):
+        """
+        Returns the (sorted) individuals who are not already connected to everyone else.
+        """
+        if len(self.saturated) == 0:
+            return self._everyone
+        return np.setdiff1d(self._everyone, list(self.saturated))
+
+    def random_non_neighbor(self, i, rng, candidates = None):
+        """
+        Randomly selects an individual (other than i) who i is not tied to, or None if there is no one.
+        Random individuals are drawn until one is not a neighbor, which takes only a few draws unless i is tied to most of them,
+        in which case the non-neighbors are listed explicitly. Either way, every non-neighbor is equally likely to be chosen.
+
+        INPUTS:
+        - i:            individual forming a new tie (int).
+        - rng:          random number generator to draw from (numpy Generator or RandomState).
+        - candidates:   individuals to choose from. Default (None) is everyone (numpy array).
+        """
+        if candidates is None:
+            candidates = self._everyone
+        neighbors = self.neighbors[i]
+        if len(candidates) > 2 * (len(neighbors) + 1):
+            for attempt in range(16):
+                j = int(candidates[int(rng.random() * len(candidates))])
+                if j != i and j not in neighbors:
+                    return j
+        not_tied = np.setdiff1d(candidates, list(neighbors) + [i])
+        if len(not_tied) == 0:
+            return None
+        return int(not_tied[int(rng.random() * len(not_tied))])
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 00:04:52 2026
+
+@author: ChrisTokita
+"""
+
+import numpy as np
+
+_POPCOUNT_TABLE = np.array([bin(b).count("1") for b in range(256)], dtype = np.uint8) #for numpy versions without bitwise_count
+
+
+class PackedAdjacency:
+    """
+    Adjacency matrix stored with one bit per possible tie, packed into 64-bit words (n x ceil(n/64) array), instead of one int64 per tie.
+    That is 64x less memory than the seeded int64 matrix, so mid-size networks (n ~ 1,000-20,000) stay in cache and many more replicates fit on a node.
+    Active neighbors are counted by AND-ing each row with the packed behavioral states and counting set bits (see count_active()),
+    and ties are broken/formed by flipping single bits, so it can stand in for the numpy array in simulate_cascade() and NetworkState.
+    Bit j of row i (word j // 64, bit j % 64) is the tie from individual i to individual j.
+
+    INPUTS:
+    - network:   the network connecting individuals (numpy array, n x n). Use from_edges() to skip the dense matrix altogether.
+    """
+
+    def __init__(self, network):
+        network = np.asarray(network)
+        self.n = network.shape[0]
+        self.shape = network.shape
+        self.words = pack_bits(network != 0)
+
+    @classmethod
+    def from_edges(cls, edges, n):
+        """
+        Builds a packed adjacency matrix straight from an edge list (e.g., seed_social_network(output = "edgelist")).
+
+        INPUTS:
+        - edges:   one row per tie, from individual in the first column to individual in the second (numpy array).
+        - n:       number of individuals in the social system (int).
+        """
+        packed = cls.__new__(cls)
+        packed.n = n
+        packed.shape = (n, n)
+        packed.words = np.zeros((n, word_count(n)), dtype = '<u8')
+        edges = np.asarray(edges, dtype = np.int64).reshape((-1, 2))
+        bits = np.left_shift(np.uint64(1), (edges[:,1] & 63).astype(np.uint64))
+        np.bitwise_or.at(packed.words, (edges[:,0], edges[:,1] >> 6), bits)
+        return packed
+
+    def __getitem__(self, index):
+        i, j = index
+        return int((self.words[i, j >> 6] >> np.uint64(j & 63)) & np.uint64(1))
+
+    def __setitem__(self, index, value):
+        i, j = index
+        bit = np.uint64(1) << np.uint64(j & 63)
+        if value:
+            self.words[i, j >> 6] |= bit
+        else:
+            self.words[i, j >> 6] &= ~bit
+
+    def row(self, i):
+        """
+        Returns the ties of individual i as a 0/1 array (numpy array, length n).
+        """
+        return unpack_bits(self.words[i], self.n)
+
+    def neighbors(self, i):
+        """
+        Returns the individuals i is tied to (numpy array).
+        """
+        return np.where(self.row(i) == 1)[0]
+
+    def degree(self):
+        """
+        Returns the degree of each individual (numpy array, n x 1).
+        """
+        return np.sum(popcount(self.words), axis = 1, dtype = np.int64).reshape((-1, 1))
+
+    def count_active(self, active):
+        """
+        Returns the number of active individuals each individual is tied to (numpy array, length n).
+
+        INPUTS:
+        - active:   whether each individual is active (boolean numpy array, length n).
+        """
+        return np.sum(popcount(self.words & pack_bits(active)), axis = 1, dtype = np.int64)
+
+    def to_dense(self):
+        """
+        Returns the network as a dense adjacency matrix (int64 numpy array, n x n).
+        """
+        return unpack_bits(self.words, self.n)
+
+    def copy(self):
+        """
+        Returns an independent copy (PackedAdjacency).
+        """
+        packed = PackedAdjacency.__new__(PackedAdjacency)
+        packed.n = self.n
+        packed.shape = self.shape
+        packed.words = self.words.copy()
+        return packed
+
+
+def word_count(n):
+    # Number of 64-bit words needed for n bits
+    return (n + 63) // 64
+
+
+def pack_bits(matrix):
+    # Packs the last axis of a boolean array into little-endian 64-bit words (bit j -> word j // 64, bit j % 64)
+    matrix = np.asarray(matrix, dtype = bool)
+    n = matrix.shape[-1]
+    packed = np.packbits(matrix, axis = -1, bitorder = 'little')
+    padding = 8 * word_count(n) - packed.shape[-1]
+    if padding > 0:
+        packed = np.concatenate((packed, np.zeros(packed.shape[:-1] + (padding,), dtype = np.uint8)), axis = -1)
+    return np.ascontiguousarray(packed).view('<u8')
+
+
+def unpack_bits(words, n):
+    # Inverse of pack_bits(), returning 0/1 int64 values
+    bits = np.unpackbits(np.ascontiguousarray(words).view(np.uint8), axis = -1, count = n, bitorder = 'little')
+    return bits.astype(np.int64)
+
+
+def popcount(words):
+    # Number of set bits in each word
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words)
+    return np.sum(_POPCOUNT_TABLE[words.view(np.uint8)].reshape(words.shape + (8,)), axis = -1)
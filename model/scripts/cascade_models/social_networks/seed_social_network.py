@@ -7,21 +7,38 @@ Created on Mon Nov 25 11:56:02 2019
 """
 
 import numpy as np
+import scipy.sparse as sparse
 import igraph
+import random
+import threading
+from .generate_edges import generate_edges
+
+_igraph_rng_lock = threading.Lock() #igraph's random number generator is shared by the whole process
 
  
-def seed_social_network(n, k, network_type, directed = False):
+def seed_social_network(n, k, network_type, directed = False, rng = None, output = "dense", generator = "igraph"):
     """
     This function generates a social network. 
     If the network is undirected, only even <k> allows for use of all network types.
     Otherwise, scale-free cannot handle creating an undirected graph with an odd mean degree <k>.
+    The network is built straight from igraph's edge list, so large populations can skip the dense matrix entirely (see output).
     
     INPUTS:
     - n:   number of individuals in the social system (int).
     - k:   average degree desired in social network (int).
     - type:   type of network to generate: random, scale-free (str).    
+    - rng:    random number generator to draw from. Default (None) leaves igraph's own random number generator as is (numpy Generator or RandomState).
+    - output: form of the returned network. Default is "dense" (numpy array), or "sparse" (scipy CSC matrix, the format cascades read ties from) or "edgelist" 
+              (numpy array with one row per tie; both directions are listed for undirected networks). See dense_adjacency(edgelist = True) to convert back (str).
+    - generator: how to generate the network. Default is "igraph", or "native" for our own generators (random, scalefree, smallworld and complete only),
+                 which draw from rng and are much faster for large networks. Networks differ between the two, so don't mix them within a study (str).
     """
     
+    if output not in ["dense", "sparse", "edgelist"]:
+        raise Exception("ERROR: unknown network output '" + str(output) + "'. Choose 'dense', 'sparse' or 'edgelist'.")
+    if generator not in ["igraph", "native"]:
+        raise Exception("ERROR: unknown network generator '" + str(generator) + "'. Choose 'igraph' or 'native'.")
+    
     # Set up appropriate number of edges or degree
     if not directed:
         if k%2 != 0:
@@ -34,20 +51,33 @@ def seed_social_network(n, k, network_type, directed = False):
         out_links = k
         avg_degree = k
     
-    # Generate graph using Erdo-Renyi algorithm
-    if network_type == "random":
-        g = igraph.Graph.Erdos_Renyi(n = n, m = n_edges, directed = directed, loops = False)
-    elif network_type == "scalefree":
-        g = igraph.Graph.Barabasi(n = n, m = out_links, directed = directed, power = 1)
-    elif network_type == "regular":
-        g = igraph.Graph.K_Regular(n = n, k = avg_degree, directed = directed, multiple = False)
-    elif network_type == "smallworld":
-        g = igraph.Graph.Watts_Strogatz(dim = 1, size = n, nei = out_links, p = 0.05, loops = False, multiple = False)
-    elif network_type == "complete":
-        g = igraph.Graph.Full(n = n, directed = directed, loops = False)
-    # Make into adjacency matrix
-    network = g.get_adjacency()
-    network = np.array(network.data)
+    # Generate graph natively, drawing from our random number generator (a fresh, unseeded one if none is given)
+    if generator == "native":
+        rng = np.random.default_rng() if rng is None else rng
+        edges = generate_edges(n, network_type, n_edges, out_links, directed, rng)
+        is_directed = directed and network_type != "smallworld" #small-world networks are always undirected, as in igraph
+    # Or generate graph with igraph, seeding igraph from our random number generator if one is given
+    else:
+        if rng is None:
+            g = generate_graph(n, network_type, n_edges, out_links, avg_degree, directed)
+        else:
+            with _igraph_rng_lock:
+                igraph.set_random_number_generator(random.Random(int(rng.random() * 2**53)))
+                try:
+                    g = generate_graph(n, network_type, n_edges, out_links, avg_degree, directed)
+                finally:
+                    igraph.set_random_number_generator(random)
+        edges = np.array(g.get_edgelist(), dtype = np.int64).reshape((-1, 2))
+        is_directed = g.is_directed()
+    # Make into adjacency matrix (or edge list), with a tie from i to j as network[i, j] = 1
+    if not is_directed:
+        edges = np.concatenate((edges, edges[edges[:,0] != edges[:,1]][:, ::-1]))
+    if output == "edgelist":
+        return edges
+    elif output == "sparse":
+        return sparse.csc_matrix((np.ones(len(edges), dtype = np.int64), (edges[:,0], edges[:,1])), shape = (n, n))
+    network = np.zeros((n, n), dtype = np.int64)
+    np.add.at(network, (edges[:,0], edges[:,1]), 1) #add, rather than set, in case of any repeated ties
     
 #    # Prevent loners
 #    if sum( np.sum(network, axis = 1) == 0 ) > 0:
@@ -74,4 +104,31 @@ def seed_social_network(n, k, network_type, directed = False):
 #            network[loner, new_connection] = 1
             
     # Return
-    return network
\ No newline at end of file
+    return network
+
+
+def generate_graph(n, network_type, n_edges, out_links, avg_degree, directed):
+    """
+    Generates an igraph graph of the requested type.
+    
+    INPUTS:
+    - n:              number of individuals in the social system (int).
+    - network_type:   type of network to generate: random, scalefree, regular, smallworld, complete (str).
+    - n_edges:        number of edges for random networks (int).
+    - out_links:      number of links added per individual for scale-free/small-world networks (int).
+    - avg_degree:     degree of each individual for regular networks (int).
+    - directed:       whether the network is directed (bool).
+    """
+    
+    # Generate graph using Erdo-Renyi algorithm
+    if network_type == "random":
+        g = igraph.Graph.Erdos_Renyi(n = n, m = n_edges, directed = directed, loops = False)
+    elif network_type == "scalefree":
+        g = igraph.Graph.Barabasi(n = n, m = out_links, directed = directed, power = 1)
+    elif network_type == "regular":
+        g = igraph.Graph.K_Regular(n = n, k = avg_degree, directed = directed, multiple = False)
+    elif network_type == "smallworld":
+        g = igraph.Graph.Watts_Strogatz(dim = 1, size = n, nei = out_links, p = 0.05, loops = False, multiple = False)
+    elif network_type == "complete":
+        g = igraph.Graph.Full(n = n, directed = directed, loops = False)
+    return g
\ No newline at end of file
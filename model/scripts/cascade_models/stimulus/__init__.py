@@ -1,4 +1,5 @@
 from .generate_stimuli_cdf import generate_stimuli_cdf
 from .generate_stimuli_raw import generate_stimuli_raw
 from .generate_stimuli_sigmoid import generate_stimuli_sigmoid
-from .generate_stimuli import generate_stimuli
\ No newline at end of file
+from .generate_stimuli import generate_stimuli
+from .stimulus_stream import StimulusStream
\ No newline at end of file
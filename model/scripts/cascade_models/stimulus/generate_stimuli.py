@@ -9,15 +9,18 @@ Created on Mon Nov 25 11:00:22 2019
 import numpy as np
 import cascade_models.stimulus as st
 
-def generate_stimuli(correlation, mean):
+def generate_stimuli(correlation, mean, size = 1, rng = None):
     """
     Generates a single pair of stimuli/infromation values for the two news sources.
+    If size > 1, returns several independent pairs (one pair per row).
     Values are rescaled to the range [0, 1].
     
     INPUTS:
     - correlation:   the correlation between the two information sources during random samples (float).
     - mean:          average out-degree desired in social network (float or int).
+    - size:          number of stimuli pairs to generate. Default is a single pair (int).
+    - rng:           random number generator to draw from. Default is numpy's global RNG (numpy Generator or RandomState).
     """
     
-    stims_sig = st.generate_stimuli_cdf(correlation, mean)
+    stims_sig = st.generate_stimuli_cdf(correlation, mean, size, rng)
     return stims_sig
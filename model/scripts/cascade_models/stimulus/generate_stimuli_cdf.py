@@ -9,17 +9,21 @@ Created on Mon Nov 25 11:01:16 2019
 import numpy as np
 import scipy.stats as stats
 
-def generate_stimuli_cdf(correlation, mean):
+def generate_stimuli_cdf(correlation, mean, size = 1, rng = None):
     """
     Generates a single pair of stimuli/infromation values for the two news sources.
+    If size > 1, returns several independent pairs (one pair per row).
     Values are rescaled to the range [0, 1] according to the percentile value of each stim.
     
     INPUTS:
     - correlation:   the correlation between the two information sources during random samples (float).
     - mean:          average out-degree desired in social network (foat or int).
+    - size:          number of stimuli pairs to generate. Default is a single pair (int).
+    - rng:           random number generator to draw from. Default is numpy's global RNG (numpy Generator or RandomState).
     """
     
     covar = [[1, correlation ], [correlation, 1]]
-    stims = np.random.multivariate_normal(mean = [mean, mean], cov = covar, size = 1)
+    rng = np.random if rng is None else rng
+    stims = rng.multivariate_normal(mean = [mean, mean], cov = covar, size = size)
     stims_perc = stats.norm.cdf(stims, loc = 0, scale = 1) # Translate stims to percentiles
     return stims_perc
\ No newline at end of file
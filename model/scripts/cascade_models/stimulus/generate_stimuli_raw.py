@@ -8,16 +8,20 @@ Created on Mon Nov 25 11:00:54 2019
 
 import numpy as np
 
-def generate_stimuli_raw(correlation, mean):
+def generate_stimuli_raw(correlation, mean, size = 1, rng = None):
     """
     Generates a single pair of stimuli/infromation values for the two news sources.
+    If size > 1, returns several independent pairs (one pair per row).
     Values generated are raw and have NOT been scaled to the range [0, 1].
     
     INPUTS:
     - correlation:   the correlation between the two information sources during random samples (float).
     - mean:          average out-degree desired in social network (float or int).
+    - size:          number of stimuli pairs to generate. Default is a single pair (int).
+    - rng:           random number generator to draw from. Default is numpy's global RNG (numpy Generator or RandomState).
     """
 
     covar = [[1, correlation ], [correlation, 1]]
-    stims = np.random.multivariate_normal(mean = [mean, mean], cov = covar, size = 1)
+    rng = np.random if rng is None else rng
+    stims = rng.multivariate_normal(mean = [mean, mean], cov = covar, size = size)
     return stims
\ No newline at end of file
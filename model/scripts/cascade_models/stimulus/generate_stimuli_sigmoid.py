@@ -8,17 +8,21 @@ Created on Mon Nov 25 11:01:30 2019
 
 import numpy as np
 
-def generate_stimuli_sigmoid(correlation, mean):
+def generate_stimuli_sigmoid(correlation, mean, size = 1, rng = None):
     """
     Generates a single pair of stimuli/infromation values for the two news sources.
+    If size > 1, returns several independent pairs (one pair per row).
     Values are rescaled to the range [0, 1] using a logistic function.
     
     INPUTS:
     - correlation:   the correlation between the two information sources during random samples (float).
     - mean:          average out-degree desired in social network (float or int).
+    - size:          number of stimuli pairs to generate. Default is a single pair (int).
+    - rng:           random number generator to draw from. Default is numpy's global RNG (numpy Generator or RandomState).
     """
 
     covar = [[1, correlation ], [correlation, 1]]
-    stims = np.random.multivariate_normal(mean = [mean, mean], cov = covar, size = 1)
+    rng = np.random if rng is None else rng
+    stims = rng.multivariate_normal(mean = [mean, mean], cov = covar, size = size)
     stims_sig = 1 / (1 + np.exp(-stims))      # Translate stims to 0 to 1 scale
     return stims_sig
\ No newline at end of file
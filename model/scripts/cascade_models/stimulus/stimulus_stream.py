@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 15:40:08 2026
+
+@author: ChrisTokita
+"""
+
+import numpy as np
+import scipy.special as special
+from functools import lru_cache
+
+
+class StimulusStream:
+    """
+    Hands out stimuli/information values for the two news sources one time step at a time,
+    but draws them from the random number generator in large blocks.
+    Drawing a single pair with np.random.multivariate_normal and scipy.stats.norm.cdf every time step is slow,
+    so instead we transform blocks of standard normal draws with a cached Cholesky factor of the covariance matrix.
+
+    INPUTS:
+    - correlation:   the correlation between the two information sources during random samples (float).
+    - mean:          mean of the raw (untransformed) stimuli values (float or int).
+    - method:        how raw stimuli are rescaled: "cdf" (percentile, default), "sigmoid" (logistic function) or "raw" (no rescaling) (str).
+    - block_size:    number of stimuli pairs to draw at once (int).
+    - rng:           random number generator to draw from. Default is numpy's global RNG (numpy Generator or RandomState).
+    """
+
+    def __init__(self, correlation, mean = 0, method = "cdf", block_size = 10000, rng = None):
+        if method not in ["cdf", "sigmoid", "raw"]:
+            raise Exception("ERROR: unknown stimulus method '" + str(method) + "'. Choose 'cdf', 'sigmoid' or 'raw'.")
+        self.correlation = correlation
+        self.mean = mean
+        self.method = method
+        self.block_size = block_size
+        self.rng = np.random if rng is None else rng
+        self.cholesky = cholesky_factor(correlation)
+        self.block = np.empty((0, 2))
+        self.position = 0
+
+    def next(self):
+        """
+        Returns the stimuli for the next time step, in the same shape as generate_stimuli() (numpy array, 1 x 2).
+        """
+        if self.position >= self.block.shape[0]:
+            self.block = self.draw(self.block_size)
+            self.position = 0
+        stims = self.block[self.position:self.position+1, :]
+        self.position += 1
+        return stims
+
+    def get_state(self):
+        """
+        Returns the stimuli pairs that have been generated but not yet handed out, e.g. for checkpointing (numpy array).
+        """
+        return self.block[self.position:]
+
+    def set_state(self, block):
+        """
+        Restores stimuli pairs saved with get_state(), so they are handed out next.
+        """
+        self.block = np.array(block)
+        self.position = 0
+
+    def draw(self, size):
+        """
+        Draws a block of stimuli pairs, one pair per row (numpy array, size x 2).
+        """
+        stims = self.rng.standard_normal((size, 2)) @ self.cholesky.T + self.mean
+        if self.method == "cdf":
+            stims = special.ndtr(stims) # Translate stims to percentiles
+        elif self.method == "sigmoid":
+            stims = special.expit(stims) # Translate stims to 0 to 1 scale
+        return stims
+
+
+@lru_cache(maxsize = None)
+def cholesky_factor(correlation):
+    """
+    Lower-triangular Cholesky factor of the covariance matrix between the two information sources.
+    Written out in closed form so that perfectly (anti-)correlated sources (gamma = -1 or 1) are handled as well.
+
+    INPUTS:
+    - correlation:   the correlation between the two information sources (float).
+    """
+    return np.array([[1, 0],
+                     [correlation, np.sqrt(max(1 - correlation**2, 0))]])
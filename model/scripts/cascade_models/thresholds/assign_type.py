@@ -8,20 +8,22 @@ Created on Mon Nov 25 11:53:42 2019
 
 import numpy as np
 
-def assign_type(n):
+def assign_type(n, rng = None):
     """
     Assigns a type randomly to each individual.
     Each individual has an equal change of getting a given type, but we split types equally.
     
     INPUTS:
     - n:       the number of individuals in the social system (int).
+    - rng:     random number generator to draw from. Default is numpy's global RNG (numpy Generator or RandomState).
     """
 
+    rng = np.random if rng is None else rng
     if n % 2 != 0:
         raise Exception("ERROR: cannot split selected number of individuals into two even groups")
     else:
         half = int(n/2)
-        type_choices = np.random.choice(np.arange(n), size = n, replace = False)
+        type_choices = rng.choice(np.arange(n), size = n, replace = False)
         typeL = type_choices[:half]
         typeR = type_choices[half:]
         types = np.zeros((n, 2))
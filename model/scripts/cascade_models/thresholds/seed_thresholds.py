@@ -8,7 +8,7 @@ Created on Mon Nov 25 11:53:09 2019
 
 import numpy as np
 
-def seed_thresholds(n, lower, upper):
+def seed_thresholds(n, lower, upper, rng = None):
     """
     Generates thresholds for each individual.
     
@@ -16,12 +16,14 @@ def seed_thresholds(n, lower, upper):
     - n:       the number of individuals in the social system (int).
     - lower:   lower bound for threshold values (float).
     - upper:   upper bound for threshold values (float).
+    - rng:     random number generator to draw from. Default is numpy's global RNG (numpy Generator or RandomState).
     """
     
-    thresholds = np.random.uniform(size = n, low = lower, high = upper)
+    rng = np.random if rng is None else rng
+    thresholds = rng.uniform(size = n, low = lower, high = upper)
     while sum(thresholds == 0) > 0:  # Python uses a open-close range so make sure no values equal 0
         zero_vals = np.where(thresholds == 0)[0]
         for zero_val in zero_vals:
-            thresholds[zero_val] = np.random.uniform(size = 1, low = lower, high = upper)
+            thresholds[zero_val] = rng.uniform(size = 1, low = lower, high = upper)
     thresholds = np.reshape(thresholds, (n, 1)) # Make into desired shape for use in simulations
     return thresholds
\ No newline at end of file
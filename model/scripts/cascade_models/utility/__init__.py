@@ -0,0 +1,7 @@
+from .artifact_store import write_artifacts, read_artifacts, list_artifacts
+from .checkpoint import save_checkpoint, load_checkpoint
+from .create_output_directories import create_output_directories
+from .parameter_sweep import expand_parameter_grid, run_parameter_sweep
+from .replicate_files import ReplicateFiles
+from .replicate_rng import replicate_rng
+from .save_model_data import save_model_data
\ No newline at end of file
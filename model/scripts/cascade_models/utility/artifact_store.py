@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 19:22:05 2026
+
+@author: ChrisTokita
+
+DESCRIPTION:
+Single-file (HDF5) store for simulation output, in place of thousands of per-replicate .npy/.pkl files.
+Artifacts are stored chunked and compressed under /<model>/gamma<gamma>/rep<XX>/<artifact name>, with the
+model, gamma, replicate and any other parameters kept as attributes of each replicate's group.
+Readers filter on these attributes before any data is read, so only the replicates (and artifacts) asked for are loaded.
+"""
+
+import numpy as np
+import pandas as pd
+import os
+from contextlib import contextmanager
+
+try:
+    import h5py
+    H5PY_AVAILABLE = True
+except ImportError:
+    H5PY_AVAILABLE = False
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None #no file locking available (e.g., Windows), so only write to a store from one process at a time
+
+
+def write_artifacts(store_file, model, gamma, replicate, parameters = None, **artifacts):
+    """
+    Writes the output of one replicate simulation to the artifact store. Existing artifacts with the same name are replaced.
+    Safe to call from many processes at once (e.g., replicates running in parallel); writes are serialized with a lock file.
+
+    INPUTS:
+    - store_file:   path to artifact store (str).
+    - model:        name of the model that produced the artifacts (str).
+    - gamma:        correlation between information sources in the simulation (float).
+    - replicate:    id number of replicate (int).
+    - parameters:   other parameter values of the simulation to save alongside the artifacts, e.g. {'n': 200, 'psi': 0.1} (dict).
+    - artifacts:    data to save, e.g. sn_final = adjacency (keyword arguments of numpy arrays or pandas DataFrames).
+    """
+
+    check_h5py()
+    group_name = "/" + model + "/gamma" + str(gamma) + "/rep" + str(replicate).zfill(2)
+    store_dir = os.path.dirname(store_file)
+    if len(store_dir) > 0:
+        os.makedirs(store_dir, exist_ok = True)
+    with store_lock(store_file, exclusive = True), h5py.File(store_file, 'a') as store:
+        group = store.require_group(group_name)
+        group.attrs['model'] = model
+        group.attrs['gamma'] = float(gamma)
+        group.attrs['replicate'] = int(replicate)
+        if parameters is not None:
+            for parameter, value in parameters.items():
+                group.attrs[parameter] = value
+        for name, data in artifacts.items():
+            if name in group:
+                del group[name]
+            if isinstance(data, pd.DataFrame):
+                # Data frames are stored column by column
+                frame = group.create_group(name)
+                frame.attrs['columns'] = [str(column) for column in data.columns]
+                for i, column in enumerate(data.columns):
+                    values = data[column].to_numpy()
+                    if values.dtype == object:
+                        values = np.array(values.astype(str), dtype = h5py.string_dtype())
+                    write_dataset(frame, "column" + str(i), values)
+            else:
+                write_dataset(group, name, np.asarray(data))
+
+
+def read_artifacts(store_file, model = None, gamma = None, replicate = None, artifacts = None, lazy = False):
+    """
+    Reads replicates from the artifact store one at a time, in order of model, gamma and replicate.
+    Each of model, gamma and replicate can be a single value, a list of values, or a function that returns True for values to keep.
+    The store is only locked while a replicate is being read, so simulations can keep writing to it while the caller works on each replicate.
+    With lazy = True, arrays are handed back as h5py datasets that are only read (in part or in full) when sliced, e.g. data['sn_final'][()].
+    These are only valid until the next replicate is requested, and the store stays locked against writers until then.
+
+    INPUTS:
+    - store_file:   path to artifact store (str).
+    - model:        which model(s) to read. Default (None) reads all (str, list, or function).
+    - gamma:        which gamma value(s) to read. Default (None) reads all (float, list, or function).
+    - replicate:    which replicate(s) to read. Default (None) reads all (int, list, or function).
+    - artifacts:    names of artifacts to read, e.g. ['sn_final', 'type']. Default (None) reads all (list of str).
+    - lazy:         whether to defer reading arrays until they are sliced. Data frames are always read (bool).
+
+    OUTPUTS (yielded for each replicate):
+    - metadata:     model, gamma, replicate, and any other saved parameter values of the replicate (dict).
+    - data:         the requested artifacts of the replicate (dict of numpy arrays, h5py datasets if lazy, or pandas DataFrames).
+    """
+
+    check_h5py()
+    # Find the matching replicates up front, then reopen the store (and take the lock) for one replicate at a time
+    with store_lock(store_file, exclusive = False), h5py.File(store_file, 'r') as store:
+        group_names = [group.name for group in select_groups(store, model, gamma, replicate)]
+    for group_name in group_names:
+        with store_lock(store_file, exclusive = False), h5py.File(store_file, 'r') as store:
+            if group_name not in store: #removed since listing
+                continue
+            group = store[group_name]
+            names = list(group.keys()) if artifacts is None else [name for name in artifacts if name in group]
+            metadata = {key: read_attribute(value) for key, value in group.attrs.items()}
+            data = {name: group[name] if lazy and isinstance(group[name], h5py.Dataset) else read_item(group[name]) for name in names}
+            if lazy:
+                yield metadata, data
+        if not lazy:
+            yield metadata, data
+
+
+def list_artifacts(store_file, model = None, gamma = None, replicate = None):
+    """
+    Lists the replicates (and their artifacts) in the artifact store, without reading any data.
+
+    INPUTS:
+    - store_file:   path to artifact store (str).
+    - model:        which model(s) to list. Default (None) lists all (str, list, or function).
+    - gamma:        which gamma value(s) to list. Default (None) lists all (float, list, or function).
+    - replicate:    which replicate(s) to list. Default (None) lists all (int, list, or function).
+
+    OUTPUTS:
+    - listing:      one row per replicate with its model, gamma, replicate, other parameters and artifact names (pandas DataFrame).
+    """
+
+    check_h5py()
+    rows = []
+    if os.path.exists(store_file):
+        with store_lock(store_file, exclusive = False), h5py.File(store_file, 'r') as store:
+            for group in select_groups(store, model, gamma, replicate):
+                row = {key: read_attribute(value) for key, value in group.attrs.items()}
+                row['artifacts'] = sorted(group.keys())
+                rows.append(row)
+    return pd.DataFrame(rows, columns = None if len(rows) > 0 else ['model', 'gamma', 'replicate', 'artifacts'])
+
+
+def select_groups(store, model, gamma, replicate):
+    # Walks the store's /model/gamma/replicate hierarchy, only descending into groups that match the requested values
+    for model_name in sorted(store.keys()):
+        if not matches(model_name, model):
+            continue
+        gamma_groups = sorted(store[model_name].values(), key = lambda g: float(g.name.split("/gamma")[-1]))
+        for gamma_group in gamma_groups:
+            if not matches(float(gamma_group.name.split("/gamma")[-1]), gamma):
+                continue
+            for rep_name in sorted(gamma_group.keys()):
+                if matches(int(rep_name[len("rep"):]), replicate):
+                    yield gamma_group[rep_name]
+
+
+def matches(value, predicate):
+    # Whether a value passes a filter (None, single value, list of values, or function)
+    if predicate is None:
+        return True
+    if callable(predicate):
+        return bool(predicate(value))
+    if isinstance(predicate, (list, tuple, set, np.ndarray)):
+        return any(np.isclose(value, p) if isinstance(value, float) else value == p for p in predicate)
+    return np.isclose(value, predicate) if isinstance(value, float) else value == predicate
+
+
+def write_dataset(group, name, values):
+    # Chunked and compressed, except for scalars (which cannot be chunked)
+    if values.ndim == 0:
+        group.create_dataset(name, data = values)
+    else:
+        group.create_dataset(name, data = values, chunks = True, compression = "gzip", compression_opts = 4, shuffle = True)
+
+
+def read_item(item):
+    # Data frames are groups (one dataset per column), everything else is a single dataset
+    if isinstance(item, h5py.Group):
+        columns = [read_attribute(column) for column in item.attrs['columns']]
+        values = [read_item(item["column" + str(i)]) for i in range(len(columns))]
+        return pd.DataFrame(dict(zip(columns, values)), columns = columns)
+    if h5py.check_string_dtype(item.dtype) is not None:
+        return item.asstr()[()]
+    return item[()]
+
+
+def read_attribute(value):
+    # h5py returns some attributes as numpy scalars or bytes
+    if isinstance(value, bytes):
+        return value.decode()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+@contextmanager
+def store_lock(store_file, exclusive):
+    # Lock a sidecar file, so that one process writes to the store at a time (and no one reads mid-write)
+    if fcntl is None:
+        yield
+        return
+    with open(store_file + ".lock", 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def check_h5py():
+    if not H5PY_AVAILABLE:
+        raise Exception("ERROR: the artifact store requires the h5py package to be installed.")
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 18:47:26 2026
+
+@author: ChrisTokita
+"""
+
+import numpy as np
+import json
+import os
+
+
+def save_checkpoint(checkpoint_file, rng, **arrays):
+    """
+    Saves the state of a running simulation (compressed .npz file) so it can later be resumed exactly where it left off.
+    The file is written under a temporary name and then renamed, so an eviction mid-write never leaves a corrupt checkpoint behind.
+
+    INPUTS:
+    - checkpoint_file:   full path of checkpoint file, ending in .npz (str).
+    - rng:               random number generator used by the simulation, whose state is saved (numpy Generator).
+    - arrays:            simulation data to save, e.g. t = t, adjacency = adjacency (keyword arguments of numpy arrays or numbers).
+    """
+
+    os.makedirs(os.path.dirname(checkpoint_file), exist_ok = True)
+    temp_file = checkpoint_file[:-len(".npz")] + "_tmp.npz"
+    np.savez_compressed(temp_file, rng_state = np.array(json.dumps(rng.bit_generator.state)), **arrays)
+    os.replace(temp_file, checkpoint_file)
+
+
+def load_checkpoint(checkpoint_file, rng):
+    """
+    Loads a checkpoint written by save_checkpoint() and restores the random number generator to its saved state.
+
+    INPUTS:
+    - checkpoint_file:   full path of checkpoint file (str).
+    - rng:               random number generator to restore, in place (numpy Generator).
+
+    OUTPUTS:
+    - arrays:            saved simulation data (dict of numpy arrays).
+    """
+
+    with np.load(checkpoint_file) as data:
+        arrays = {key: data[key] for key in data.files}
+    rng.bit_generator.state = json.loads(str(arrays.pop('rng_state')))
+    return arrays
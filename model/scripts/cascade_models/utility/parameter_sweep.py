@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 17:10:44 2026
+
+@author: ChrisTokita
+"""
+
+import numpy as np
+import multiprocessing as mp
+import itertools
+import os
+import time
+
+
+def expand_parameter_grid(parameter_grid, reps, outpath):
+    """
+    Turns a parameter grid into a list of individual simulation tasks (one per parameter combination and replicate).
+    Output for each gamma value is already sorted into its own folder by the models, so any other parameter that takes
+    more than one value in the grid gets its own sub-directory, e.g., <outpath>/psi0.1_k8/.
+
+    INPUTS:
+    - parameter_grid:   model parameters (other than replicate and outpath) and the values to sweep across (dict of lists).
+    - reps:             number of replicates per parameter combination (int).
+    - outpath:          path to directory where output folders and files will be created (str).
+
+    OUTPUTS:
+    - tasks:            keyword arguments for each individual simulation (list of dicts).
+    """
+
+    parameter_names = list(parameter_grid.keys())
+    parameter_values = [np.array(parameter_grid[p]).tolist() for p in parameter_names] #native python types so file names match str(gamma)
+    varied = [p for p, v in zip(parameter_names, parameter_values) if len(v) > 1 and p != 'gamma']
+    tasks = []
+    for combo in itertools.product(*parameter_values):
+        task = dict(zip(parameter_names, combo))
+        task_outpath = outpath
+        if len(varied) > 0:
+            task_outpath = outpath + "_".join([p + str(task[p]) for p in varied]) + "/"
+        for rep in range(reps):
+            tasks.append(dict(task, replicate = rep, outpath = task_outpath))
+    return tasks
+
+
+def run_parameter_sweep(model_function, parameter_grid, reps, outpath, completed_file = None, cpus = None):
+    """
+    Runs a model across a grid of parameter values on a local pool of processes.
+    Tasks are handed out one at a time as workers free up, so fast and slow parameter combinations balance out across cores.
+    Tasks whose output already exists are skipped, so an interrupted sweep can simply be restarted.
+
+    INPUTS:
+    - model_function:   function that runs one replicate simulation, e.g. model_networkbreaking.sim_adjusting_network (function).
+    - parameter_grid:   model parameters (other than replicate and outpath) and the values to sweep across (dict of lists).
+    - reps:             number of replicates per parameter combination (int).
+    - outpath:          path to directory where output folders and files will be created (str).
+    - completed_file:   file (relative to task outpath) that exists once a task has finished, formatted with the task's parameters,
+                        e.g. "social_network_data/gamma{gamma}/sn_final_rep{replicate:02d}.npy". Alternatively, a function that takes
+                        a task's parameters (dict) and returns whether it has finished. Default (None) never skips tasks (str or function).
+    - cpus:             number of processes to use. Default is all available cores (int).
+
+    OUTPUTS:
+    - task_times:       parameters and run time (in seconds) of each task that was run (list of dicts).
+    """
+
+    # Determine which tasks still need to be run
+    tasks = expand_parameter_grid(parameter_grid, reps, outpath)
+    if completed_file is not None:
+        if callable(completed_file):
+            remaining = [task for task in tasks if not completed_file(task)]
+        else:
+            remaining = [task for task in tasks if not os.path.exists(task['outpath'] + completed_file.format(**task))]
+        print("Skipping " + str(len(tasks) - len(remaining)) + " of " + str(len(tasks)) + " tasks that are already complete.")
+        tasks = remaining
+    if len(tasks) == 0:
+        return []
+
+    # Run tasks, collecting results as they finish
+    if cpus is None:
+        cpus = mp.cpu_count()
+    task_times = []
+    start = time.time()
+    with mp.Pool(min(cpus, len(tasks))) as pool:
+        jobs = pool.imap_unordered(_run_task, [(model_function, task) for task in tasks], chunksize = 1)
+        for task, task_time in jobs:
+            task_times.append(dict(task, seconds = task_time))
+            elapsed = time.time() - start
+            remaining_estimate = elapsed / len(task_times) * (len(tasks) - len(task_times))
+            task_label = ", ".join([p + "=" + str(v) for p, v in task.items() if p != 'outpath'])
+            print("[%d/%d] %s finished in %1.1f s (elapsed: %1.0f s, est. remaining: %1.0f s)"
+                  % (len(task_times), len(tasks), task_label, task_time, elapsed, remaining_estimate), flush = True)
+    return task_times
+
+
+def _run_task(model_task):
+    # Runs a single simulation in a worker process and times it.
+    model_function, task = model_task
+    task_start = time.time()
+    model_function(**task)
+    return task, time.time() - task_start
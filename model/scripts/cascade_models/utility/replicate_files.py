@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 01:12:40 2026
+
+@author: ChrisTokita
+"""
+
+import numpy as np
+import os
+
+
+class ReplicateFiles:
+    """
+    Lazy, read-only view of the .npy files saved for one replicate simulation, e.g. replicate['sn_final'] or replicate['thresh'].
+    Nothing is read until an artifact is asked for, and artifacts are then memory-mapped rather than loaded,
+    so scripts that loop over thousands of replicates only hold the pages they actually touch, and concurrent workers reading
+    the same files share the operating system's page cache.
+    Artifact names are the same as in the artifact store: <prefix>_<rest>, found at <directory>/<prefix data dir>/gamma<gamma>/<name>_rep<XX>.npy.
+
+    INPUTS:
+    - directory:   path to directory with the simulation's data folders, e.g. '../data_sim/network_break/' (str).
+    - gamma:       correlation between information sources in the simulation (float).
+    - replicate:   id number of replicate (int).
+    - mmap_mode:   how to memory-map files (see numpy.load). Default is read-only ('r'), or None to load fully into memory (str).
+    """
+
+    data_dirs = {'sn': 'social_network_data', 'thresh': 'thresh_data', 'type': 'type_data'} #prefix of artifact name: data folder
+
+    def __init__(self, directory, gamma, replicate, mmap_mode = 'r'):
+        self.directory = directory
+        self.gamma = gamma
+        self.replicate = replicate
+        self.mmap_mode = mmap_mode
+
+    def path(self, name):
+        """
+        Returns the path of an artifact's file (str).
+        """
+        prefix = name.split("_")[0]
+        if prefix not in self.data_dirs:
+            raise Exception("ERROR: unknown artifact '" + name + "'. Names start with one of " + str(list(self.data_dirs.keys())) + ".")
+        return self.directory + self.data_dirs[prefix] + "/gamma" + str(self.gamma) + "/" + name + "_rep" + str(self.replicate).zfill(2) + ".npy"
+
+    def __contains__(self, name):
+        return os.path.exists(self.path(name))
+
+    def __getitem__(self, name):
+        return np.load(self.path(name), mmap_mode = self.mmap_mode)
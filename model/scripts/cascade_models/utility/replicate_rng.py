@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 18:05:33 2026
+
+@author: ChrisTokita
+"""
+
+import numpy as np
+import hashlib
+import numbers
+
+
+def replicate_rng(model, replicate, **parameters):
+    """
+    Creates an independent random number generator for one replicate simulation.
+    The seed is keyed by the model name and full set of parameter values (via a hash), and each replicate is a separate
+    child stream (spawn key) of that seed. Unlike seeding with int((replicate + 1 + gamma) * 323), no two parameter
+    combinations/replicates share a random stream, and nothing touches numpy's global RNG, so replicates can safely run as threads.
+
+    INPUTS:
+    - model:        name of the model being simulated (str).
+    - replicate:    id number of replicate (int or float).
+    - parameters:   parameter values that define the simulation, e.g. n = 200, gamma = 0.5 (keyword arguments).
+                    Leave out run length and output location so that these don't change the random stream.
+
+    OUTPUTS:
+    - rng:          random number generator for the replicate (numpy Generator).
+    """
+
+    key = [model] + [(p, normalize_parameter(parameters[p])) for p in sorted(parameters)]
+    entropy = int.from_bytes(hashlib.sha256(repr(key).encode()).digest(), 'big')
+    seed_sequence = np.random.SeedSequence(entropy = entropy, spawn_key = (int(replicate),))
+    return np.random.default_rng(seed_sequence)
+
+
+def normalize_parameter(value):
+    # Returns a parameter value as native python types, with every real number as a float (and -0.0 as 0.0),
+    # so that e.g. gamma = 0, 0.0, -0.0 and np.float64(0) give the same random stream.
+    value = np.array(value).tolist()
+    if isinstance(value, list):
+        return [normalize_parameter(v) for v in value]
+    if isinstance(value, numbers.Real) and not isinstance(value, bool):
+        return float(value) + 0.0
+    return value
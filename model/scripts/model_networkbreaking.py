@@ -16,8 +16,11 @@ Function to run network-breaking cascade model
 ####################
 import numpy as np
 import cascade_models.social_networks as sn
+import cascade_models.stimulus as st
 import cascade_models.thresholds as th
 import cascade_models.cascades as cs
+import cascade_models.compiled as compiled
+import cascade_models.utility as ut
 import copy
 import os
 
@@ -25,8 +28,9 @@ import os
 ####################
 # Define simulation function
 ####################
+NUMBA_CHUNK = 10000 #time steps the numba backend runs per random seed (checkpoints fall on these boundaries)
 
-def sim_adjusting_network(replicate, n, k, gamma, psi, timesteps, outpath, network_type = "random") :
+def sim_adjusting_network(replicate, n, k, gamma, psi, timesteps, outpath, network_type = "random", backend = "numpy", checkpoint_interval = None, output_format = "npy", telemetry = None) :
     """
     Simulates a single replicate simulation of the network-breaking information cascade model. 
     
@@ -39,100 +43,189 @@ def sim_adjusting_network(replicate, n, k, gamma, psi, timesteps, outpath, netwo
     - timesteps:      length of simulation (int).
     - outpath:        path to directory where output folders and files will be created (str). 
     - network_type:   type of network to intially generate. Default is random but accepts ["random", "scalefree"] (str).
+    - backend:        how to run the simulation loop. Default is "numpy", "packed" for the numpy loop on a bit-packed network (1/64th the memory),
+                      or "numba" for compiled version of the full time step (str).
+    - checkpoint_interval:   number of time steps between saving checkpoints. If a checkpoint exists, the simulation resumes from it. Default (None) never checkpoints (int).
+                             With the "numba" backend, checkpoints are rounded up to the next multiple of NUMBA_CHUNK time steps.
+    - output_format:  how to save output. Default is "npy" (separate files per replicate), or "store" to add to the artifact store <outpath>/artifacts.h5 (str).
+    - telemetry:      record cascade size, bias and tie changes over time to <outpath>/cascade_data/, with options passed on to CascadeTelemetry,
+                      e.g. {'every': 10} or {'first': 5000, 'last': 5000}. Default (None) records nothing. numpy/packed backends only (dict).
     """    
     
+    if output_format not in ["npy", "store"]:
+        raise Exception("ERROR: unknown output format '" + str(output_format) + "'. Choose 'npy' or 'store'.")
+    if telemetry is not None and backend == "numba":
+        raise Exception("ERROR: cascade telemetry is not available with the 'numba' backend.")
+    
     ########## Seed initial conditions ##########
-    # Set overall seed
-    seed = int( (replicate + 1 + gamma) * 323 )
-    np.random.seed(seed)
+    # Set up random number generator (independent stream for each parameter combination and replicate)
+    rng = ut.replicate_rng(model = "networkbreaking", replicate = replicate, n = n, k = k, gamma = gamma, psi = psi, network_type = network_type)
     # Seed individual's thresholds
-    thresh_mat = th.seed_thresholds(n = n, lower = 0, upper = 1)
+    thresh_mat = th.seed_thresholds(n = n, lower = 0, upper = 1, rng = rng)
     # Assign type
-    type_mat = th.assign_type(n = n)
+    type_mat = th.assign_type(n = n, rng = rng)
     # Set up social network
-    adjacency = sn.seed_social_network(n, k, network_type = network_type)
+    if backend == "packed":
+        edges = sn.seed_social_network(n, k, network_type = network_type, rng = rng, output = "edgelist") #never builds the dense matrix
+        adjacency = sn.PackedAdjacency.from_edges(edges, n)
+    else:
+        adjacency = sn.seed_social_network(n, k, network_type = network_type, rng = rng)
     adjacency_initial = copy.deepcopy(adjacency)
     
+    ########## Resume from checkpoint ##########
+    # If an earlier run of this replicate was interrupted, pick up exactly where it left off
+    rep_label = str(replicate).zfill(2)
+    checkpoint_file = outpath + "checkpoints/gamma" + str(gamma) + "/checkpoint_rep" + rep_label + ".npz"
+    checkpoint = None
+    t_start = 0
+    if checkpoint_interval is not None and os.path.exists(checkpoint_file):
+        checkpoint = ut.load_checkpoint(checkpoint_file, rng = rng)
+        if str(checkpoint['backend']) != backend:
+            raise Exception("ERROR: checkpoint was written by the '" + str(checkpoint['backend']) + "' backend and cannot be resumed with '" + backend + "'.")
+        t_start = int(checkpoint['t'])
+        adjacency = checkpoint['adjacency'].astype(int)
+        adjacency_initial = checkpoint['adjacency_initial'].astype(int)
+        if backend == "packed":
+            adjacency = sn.PackedAdjacency(adjacency)
+            adjacency_initial = sn.PackedAdjacency(adjacency_initial)
+        thresh_mat = checkpoint['thresholds']
+        type_mat = checkpoint['types']
+    
     ########## Run simulation ##########
-    for t in range(timesteps):
-        # Initial information sampling
-        info_values, state_mat, samplers, samplers_active = cs.simulate_stim_sampling(n = n,
-                                                                                      gamma = gamma,
-                                                                                      psi = psi,
-                                                                                      types = type_mat,
-                                                                                      thresholds = thresh_mat)
-        # Simulate information cascade 
-        state_mat = cs.simulate_cascade(network = adjacency, 
-                                        states = state_mat, 
-                                        thresholds = thresh_mat,
-                                        samplers = samplers)
-        # Evaluate behavior of individuals relative to threshold and stimuli
-        correct_state = cs.evaluate_behavior(states = state_mat, 
-                                             thresholds = thresh_mat, 
-                                             information = info_values, 
-                                             types = type_mat)
-        # Adjust social network ties
-        adjacency = adjust_tie(network = adjacency,
-                               states = state_mat,
-                               correct_behavior = correct_state)
+    if backend == "numba":
+        # Compiled version of the full time step. It uses its own random number stream, seeded anew every NUMBA_CHUNK time steps,
+        # so results don't depend on checkpoint_interval. Checkpoints are saved at the end of the first chunk past each interval.
+        if not compiled.NUMBA_AVAILABLE:
+            raise Exception("ERROR: the numba backend requires the numba package to be installed.")
+        adjacency = adjacency.astype(np.int64)
+        for t in range(t_start, timesteps, NUMBA_CHUNK):
+            t_end = min(t + NUMBA_CHUNK, timesteps)
+            adjacency = compiled.run_networkbreaking_kernel(adjacency = adjacency,
+                                                            thresholds = thresh_mat.flatten(),
+                                                            type_A = type_mat[:,0] == 1,
+                                                            gamma = float(gamma),
+                                                            sampler_count = int(round(psi * n)),
+                                                            timesteps = t_end - t,
+                                                            seed = int(rng.integers(2**31)))
+            if checkpoint_interval is not None and t_end // checkpoint_interval > t // checkpoint_interval and t_end < timesteps:
+                ut.save_checkpoint(checkpoint_file, rng = rng, t = t_end, backend = backend, adjacency = adjacency.astype(np.int8),
+                                   adjacency_initial = adjacency_initial.astype(np.int8), thresholds = thresh_mat, types = type_mat)
+    elif backend in ["numpy", "packed"]:
+        network = sn.NetworkState(adjacency) #tracks degree/neighbors as ties change
+        stimuli = st.StimulusStream(correlation = gamma, mean = 0, rng = rng) #stimuli are pre-drawn in blocks
+        sampler_sets = cs.SamplerSelector(n = n, sampler_count = int(round(psi * n)), rng = rng) #as are sampler sets
+        if checkpoint is not None:
+            stimuli.set_state(checkpoint['stimuli'])
+            sampler_sets.set_state(checkpoint['sampler_sets'])
+            network.ties_broken = int(checkpoint.get('ties_broken', 0)) #checkpoints from before tie counts were kept start from 0
+            network.ties_formed = int(checkpoint.get('ties_formed', 0))
+        if telemetry is not None:
+            recorder = cs.CascadeTelemetry(file_prefix = outpath + "cascade_data/gamma" + str(gamma) + "/cascade_rep" + rep_label,
+                                           timesteps = timesteps,
+                                           **telemetry)
+            if checkpoint is not None:
+                recorder.resume(t_start)
+        for t in range(t_start, timesteps):
+            # Initial information sampling
+            info_values, state_mat, samplers, samplers_active = cs.simulate_stim_sampling(n = n,
+                                                                                          gamma = gamma,
+                                                                                          psi = psi,
+                                                                                          types = type_mat,
+                                                                                          thresholds = thresh_mat,
+                                                                                          stimulus_stream = stimuli,
+                                                                                          sampler_selector = sampler_sets)
+            # Simulate information cascade 
+            state_mat = cs.simulate_cascade(network = network.adjacency, 
+                                            states = state_mat, 
+                                            thresholds = thresh_mat,
+                                            samplers = samplers,
+                                            degree = network.degree)
+            # Evaluate behavior of individuals relative to threshold and stimuli
+            correct_state = cs.evaluate_behavior(states = state_mat, 
+                                                 thresholds = thresh_mat, 
+                                                 information = info_values, 
+                                                 types = type_mat)
+            # Adjust social network ties
+            ties_broken, ties_formed = network.ties_broken, network.ties_formed #counts before this time step
+            network = adjust_tie(network = network,
+                                 states = state_mat,
+                                 correct_behavior = correct_state,
+                                 rng = rng)
+            # Record cascade
+            if telemetry is not None:
+                recorder.record(t, samplers_active = samplers_active, states = state_mat, types = type_mat,
+                                ties_broken = network.ties_broken - ties_broken, ties_formed = network.ties_formed - ties_formed)
+            # Save checkpoint
+            if checkpoint_interval is not None and (t + 1) % checkpoint_interval == 0 and t + 1 < timesteps:
+                if telemetry is not None:
+                    recorder.flush() #so that telemetry on disk matches the checkpoint
+                ut.save_checkpoint(checkpoint_file, rng = rng, t = t + 1, backend = backend, adjacency = sn.dense_adjacency(network.adjacency).astype(np.int8),
+                                   adjacency_initial = sn.dense_adjacency(adjacency_initial).astype(np.int8), thresholds = thresh_mat, types = type_mat,
+                                   stimuli = stimuli.get_state(), sampler_sets = sampler_sets.get_state(),
+                                   ties_broken = network.ties_broken, ties_formed = network.ties_formed)
+        if telemetry is not None:
+            recorder.close()
+        adjacency = network.adjacency
+    else:
+        raise Exception("ERROR: unknown backend '" + str(backend) + "'. Choose 'numpy', 'packed' or 'numba'.")
+    adjacency = sn.dense_adjacency(adjacency) #output is always saved as a dense matrix
+    adjacency_initial = sn.dense_adjacency(adjacency_initial)
     
     ########## Save files ##########
-    # Create output folder
-    output_name = "gamma" + str(gamma)
-    data_dirs = ['social_network_data', 'thresh_data', 'type_data']
-    data_dirs = [outpath + d + "/" for d in data_dirs]
-    output_dirs = [d + output_name +  "/" for d in data_dirs]
-    for x in np.arange(len(data_dirs)):
-        # Check if directory already exisits. If not, create it.
-        if not os.path.exists(data_dirs[x]):
-            os.makedirs(data_dirs[x])
-        # Check if specific run folder exists
-        if not os.path.exists(output_dirs[x]):
-            os.makedirs(output_dirs[x])
-    # Save files
-    rep_label = str(replicate).zfill(2)
-    np.save(output_dirs[0] + "sn_final_rep" + rep_label + ".npy", adjacency)
-    np.save(output_dirs[0] + "sn_initial_rep" + rep_label + ".npy", adjacency_initial)
-    np.save(output_dirs[1] + "thresh_rep" + rep_label + ".npy", thresh_mat)
-    np.save(output_dirs[2] + "type_rep" + rep_label + ".npy", type_mat)
+    if output_format == "store":
+        ut.write_artifacts(outpath + "artifacts.h5", model = "networkbreaking", gamma = gamma, replicate = replicate,
+                           parameters = {'n': n, 'k': k, 'psi': psi, 'timesteps': timesteps, 'network_type': network_type},
+                           sn_final = adjacency, sn_initial = adjacency_initial, thresh = thresh_mat, type = type_mat)
+    else:
+        # Create output folder
+        output_name = "gamma" + str(gamma)
+        data_dirs = ['social_network_data', 'thresh_data', 'type_data']
+        data_dirs = [outpath + d + "/" for d in data_dirs]
+        output_dirs = [d + output_name +  "/" for d in data_dirs]
+        for x in np.arange(len(data_dirs)):
+            # Create run folder (and data folder) if it doesn't exist yet. Other replicates running in parallel may be creating it at the same time.
+            os.makedirs(output_dirs[x], exist_ok = True)
+        # Save files
+        np.save(output_dirs[0] + "sn_final_rep" + rep_label + ".npy", adjacency)
+        np.save(output_dirs[0] + "sn_initial_rep" + rep_label + ".npy", adjacency_initial)
+        np.save(output_dirs[1] + "thresh_rep" + rep_label + ".npy", thresh_mat)
+        np.save(output_dirs[2] + "type_rep" + rep_label + ".npy", type_mat)
+    # Simulation is complete, so checkpoint is no longer needed
+    if os.path.exists(checkpoint_file):
+        os.remove(checkpoint_file)
     
 ####################
 # Define model-specific functions
 ####################
-def adjust_tie(network, states, correct_behavior):
+def adjust_tie(network, states, correct_behavior, rng = None):
     """
     Randomly selects active individual and breaks tie if incorrect.
     Another individual randomly forms tie iff a tie is broken in that round.
 
     INPUTS:
-    - network:            the network connecting individuals (numpy array).
+    - network:            the network connecting individuals, along with its degree/neighbor bookkeeping (NetworkState).
     - states:             matrix listing the behavioral state of every individual (numpy array).
     - correct_behavior:   array indicating whether each individual behaved correctly (numpy array).
+    - rng:                random number generator to draw from. Default is numpy's global RNG (numpy Generator or RandomState).
     """
     
+    rng = np.random if rng is None else rng
     actives = np.where(states == 1)[0]
     if sum(actives) > 0: #error catch when no individual are active
-        individual_active = np.random.choice(actives, size = 1)
+        individual_active = rng.choice(actives, size = 1)[0]
         individual_correct = correct_behavior[individual_active]
-        individual_neighbors = np.where(network[individual_active,:] == 1)[1]
         
         if not individual_correct:
             
             # Break ties with one randomly-selected "incorrect" neighbor
-            perceived_incorrect = [ind for ind in actives if ind in individual_neighbors] #which neighbors are active
-            break_tie = np.random.choice(perceived_incorrect, size = 1, replace = False)
-            network[individual_active, break_tie] = 0
-            network[break_tie, individual_active] = 0 #undirected network, symmetric edges
+            perceived_incorrect = network.active_neighbors(individual_active, states) #which neighbors are active
+            break_tie = rng.choice(perceived_incorrect, size = 1, replace = False)[0]
+            network.break_tie(individual_active, break_tie)
             
             # Randomly select another individual to form a new tie
-            max_connections = network.shape[0] - 1 #can't connect to self
-            candidate_individuals = np.where(np.sum(network, axis = 1) != max_connections)[0] #list individuals who are not already connected to everyone
-            former_individual = np.random.choice(candidate_individuals, size = 1)
-            former_connections = np.squeeze(network[former_individual,:]) #get individual's neighbors
-            potential_ties = np.where(former_connections == 0)[0]
-            potential_ties = np.delete(potential_ties, np.where(potential_ties == former_individual)) # Prevent self-loop
-            new_tie = np.random.choice(potential_ties, size = 1, replace = False)
-            network[former_individual, new_tie] = 1
-            network[new_tie, former_individual] = 1 #undirected network, symmetric edges
+            candidate_individuals = network.not_saturated() #list individuals who are not already connected to everyone
+            former_individual = rng.choice(candidate_individuals, size = 1)[0]
+            new_tie = network.random_non_neighbor(former_individual, rng) #anyone not already tied to them (or themselves)
+            network.form_tie(former_individual, new_tie)
                 
-    return network
\ No newline at end of file
+    return network
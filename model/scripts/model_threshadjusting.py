@@ -19,6 +19,7 @@ import pandas as pd
 import cascade_models.social_networks as sn
 import cascade_models.thresholds as th
 import cascade_models.cascades as cs
+import cascade_models.utility as ut
 import copy
 import os
 
@@ -27,7 +28,7 @@ import os
 # Define simulation function
 ####################
 
-def sim_adjusting_thresholds(replicate, n, k, gamma, psi, phi, omega, timesteps, outpath, sim_tag, network_type = "random") :
+def sim_adjusting_thresholds(replicate, n, k, gamma, psi, phi, omega, timesteps, outpath, sim_tag, network_type = "random", output_format = "npy") :
     """
     Simulates a single replicate simulation of the network-breaking information cascade model. 
     
@@ -43,25 +44,22 @@ def sim_adjusting_thresholds(replicate, n, k, gamma, psi, phi, omega, timesteps,
     - outpath:        path to directory where output folders and files will be created (str). 
     - sim_tag:        added infomation to add to file names when saving model output (str).
     - network_type:   type of network to intially generate. Default is random but accepts ["random", "scalefree"] (str).
+    - output_format:  how to save output. Default is "npy" (separate files per replicate), or "store" to add to the artifact store <outpath>/artifacts.h5 (str).
     """
      
+    if output_format not in ["npy", "store"]:
+        raise Exception("ERROR: unknown output format '" + str(output_format) + "'. Choose 'npy' or 'store'.")
+    
     ########## Seed initial conditions ##########
-    # Set overall seed
-    seed = int( (replicate + 1 + gamma) * 323 )
-    np.random.seed(seed)
+    # Set up random number generator (independent stream for each parameter combination and replicate)
+    rng = ut.replicate_rng(model = "threshadjusting", replicate = replicate, n = n, k = k, gamma = gamma, psi = psi, phi = phi, omega = omega, network_type = network_type)
     # Seed individual's thresholds
-    thresh_mat = th.seed_thresholds(n = n, lower = 0, upper = 1)
+    thresh_mat = th.seed_thresholds(n = n, lower = 0, upper = 1, rng = rng)
     # Assign type
-    type_mat = th.assign_type(n = n)
+    type_mat = th.assign_type(n = n, rng = rng)
     # Set up social network
-    adjacency = sn.seed_social_network(n, k, network_type = network_type)
+    adjacency = sn.seed_social_network(n, k, network_type = network_type, rng = rng)
     adjacency_initial = copy.deepcopy(adjacency)
-    # Cascade size data
-    cascade_size = pd.DataFrame(columns = ['t', 'samplers', 'samplers_active', 'sampler_A', 'sampler_B', 'total_active', 'active_A', 'active_B'])
-    # Cascade behavior data (correct/incorrect behavior)
-    behavior_data = pd.DataFrame(np.zeros(shape = (n, 5)),
-                                          columns = ['individual', 'true_positive', 'false_negative', 'true_negative', 'false_positive'])
-    behavior_data['individual'] = np.arange(n)
     
     ########## Run simulation ##########
     for t in range(timesteps):
@@ -70,48 +68,51 @@ def sim_adjusting_thresholds(replicate, n, k, gamma, psi, phi, omega, timesteps,
                                                                                        gamma = gamma,
                                                                                        psi = psi,
                                                                                        types = type_mat,
-                                                                                       thresholds = thresh_mat)
+                                                                                       thresholds = thresh_mat,
+                                                                                       rng = rng)
         # Simulate information cascade 
         state_mat = cs.simulate_cascade(network = adjacency, 
                                         states = state_mat, 
-                                        thresholds = thresh_mat)
+                                        thresholds = thresh_mat,
+                                        samplers = samplers)
         # Evaluate behavior of individuals relative to threshold and stimuli
-        correct_state, behavior_data = cs.evaluate_behavior(states = state_mat, 
-                                                            thresholds = thresh_mat, 
-                                                            information = info_values, 
-                                                            types = type_mat,
-                                                            behavior_df = behavior_data)
+        correct_state = cs.evaluate_behavior(states = state_mat, 
+                                             thresholds = thresh_mat, 
+                                             information = info_values, 
+                                             types = type_mat)
         # Randomly select one individual and adjust thresholds according to behavior (correct/incorrect)
         thresh_mat = adjust_thresh(thresholds =  thresh_mat,
                                    states = state_mat,
                                    correct_behavior = correct_state,
                                    phi = phi,
-                                   omega = omega)
+                                   omega = omega,
+                                   rng = rng)
     
     ########## Save files ##########
-    # Create output folder
-    output_name = "gamma" + str(gamma)
-    data_dirs = ['social_network_data', 'thresh_data', 'type_data']
-    data_dirs = [outpath + d + "/" for d in data_dirs]
-    output_dirs = [d + output_name +  "/" for d in data_dirs]
-    for x in np.arange(len(data_dirs)):
-        # Check if directory already exisits. If not, create it.
-        if not os.path.exists(data_dirs[x]):
-            os.makedirs(data_dirs[x])
-        # Check if specific run folder exists
-        if not os.path.exists(output_dirs[x]):
-            os.makedirs(output_dirs[x])
-    # Save files
-    rep_label = str(replicate).zfill(2)
-    np.save(output_dirs[1] + "sn_rep" + rep_label + ".npy", adjacency)
-    np.save(output_dirs[1] + "sn_initial_rep" + rep_label + ".npy", adjacency_initial)
-    np.save(output_dirs[2] + "thresh_rep" + rep_label + ".npy", thresh_mat)
-    np.save(output_dirs[3] + "type_rep" + rep_label + ".npy", type_mat)
+    if output_format == "store":
+        ut.write_artifacts(outpath + "artifacts.h5", model = "threshadjusting", gamma = gamma, replicate = replicate,
+                           parameters = {'n': n, 'k': k, 'psi': psi, 'phi': phi, 'omega': omega, 'timesteps': timesteps, 'network_type': network_type},
+                           sn = adjacency, sn_initial = adjacency_initial, thresh = thresh_mat, type = type_mat)
+    else:
+        # Create output folder
+        output_name = "gamma" + str(gamma)
+        data_dirs = ['social_network_data', 'thresh_data', 'type_data']
+        data_dirs = [outpath + d + "/" for d in data_dirs]
+        output_dirs = [d + output_name +  "/" for d in data_dirs]
+        for x in np.arange(len(data_dirs)):
+            # Create run folder (and data folder) if it doesn't exist yet. Other replicates running in parallel may be creating it at the same time.
+            os.makedirs(output_dirs[x], exist_ok = True)
+        # Save files
+        rep_label = str(replicate).zfill(2)
+        np.save(output_dirs[0] + "sn_rep" + rep_label + ".npy", adjacency)
+        np.save(output_dirs[0] + "sn_initial_rep" + rep_label + ".npy", adjacency_initial)
+        np.save(output_dirs[1] + "thresh_rep" + rep_label + ".npy", thresh_mat)
+        np.save(output_dirs[2] + "type_rep" + rep_label + ".npy", type_mat)
     
 ####################
 # Define model-specific functions
 ####################
-def adjust_thresh(thresholds, states, correct_behavior, phi, omega):
+def adjust_thresh(thresholds, states, correct_behavior, phi, omega, rng = None):
     """
     Randomly selects active individual and adjusts threshold depending on whether their behavior was correct/incorrect.
     
@@ -119,13 +120,15 @@ def adjust_thresh(thresholds, states, correct_behavior, phi, omega):
     - thresholds:         matrix of thresholds for each individual (numpy array).
     - states:             matrix listing the behavioral state of every individual (numpy array).
     - correct_behavior:   array indicating whether each individual behaved correctly (numpy array).
+    - rng:                random number generator to draw from. Default is numpy's global RNG (numpy Generator or RandomState).
     """
     
+    rng = np.random if rng is None else rng
     actives = np.where(states == 1)[0]
     if sum(actives) > 0: #error catch when no individual are active
         
         # Select avtive individual and adjust threshold accordingly
-        adjuster_active = np.random.choice(actives, size = 1)
+        adjuster_active = rng.choice(actives, size = 1)
         adjuster_correct = correct_behavior[adjuster_active]
         if adjuster_correct:
             thresholds[adjuster_active] -= phi #decrease threshold if correct (positive reinforcement)
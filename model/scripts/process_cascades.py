@@ -7,7 +7,8 @@ Created on Thu Jan 16 13:58:11 2020
 
 DESCRIPTION:
 Script to process cascade data from during simulation. 
-Cascades are recorded at the very beginning and end of the simulation.
+Cascades are recorded at the very beginning and end of the simulation,
+either as one pickled data frame per replicate or as compressed telemetry chunks written by sim_adjusting_network(telemetry = ...).
 """
 
 ####################
@@ -19,6 +20,7 @@ import math
 import os
 import re
 import copy
+import cascade_models.cascades as cs
 
 
 ####################
@@ -72,9 +74,10 @@ for run in runs:
      # Get gamma value
     gamma = float(re.search('gamma([-\.0-9]+)', run).group(1))
     
-    # List social network files in that run's data folder
+    # List cascade files in that run's data folder (telemetry chunks are grouped into one entry per replicate)
     run_files = os.listdir(casc_dir + run +'/')
-    run_files.sort()
+    run_files = [re.sub('_chunk[0-9]+\.npz$', '', file) for file in run_files if not file.endswith('_tmp.npz')]
+    run_files = sorted(set(run_files))
     
     # Create dataframe for parameter setting summary of begin/end of cascade
     headers = ['gamma', 'replicate', 
@@ -89,7 +92,10 @@ for run in runs:
     for file in run_files:
         
         # Read
-        cascade = pd.read_pickle(casc_dir + run +'/' + file)
+        if file.endswith('.pkl'):
+            cascade = pd.read_pickle(casc_dir + run +'/' + file)
+        else:
+            cascade = cs.load_telemetry(casc_dir + run +'/' + file)
         cascade = cascade.astype(float)
         rep = int(re.search('([0-9]+)', file).group(1))
         
@@ -117,7 +123,7 @@ for run in runs:
         if stats_beginend.empty:
             stats_beginend = copy.deepcopy(beginend_sum)
         else:
-            stats_beginend = stats_beginend.append(beginend_sum)
+            stats_beginend = pd.concat([stats_beginend, beginend_sum])
     
     # Bind to larger dataframe for saving
     gamma_cascades = gamma_cascades / len(run_files)
@@ -125,7 +131,7 @@ for run in runs:
     if summarised_cascades.empty:
         summarised_cascades = copy.deepcopy(gamma_cascades)
     else:
-        summarised_cascades = summarised_cascades.append(gamma_cascades)
+        summarised_cascades = pd.concat([summarised_cascades, gamma_cascades])
 
     
 # Save to csv
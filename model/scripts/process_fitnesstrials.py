@@ -17,6 +17,7 @@ import numpy as np
 import os
 import re
 import copy
+import cascade_models.utility as ut
 
 ####################
 # List files to be read
@@ -38,9 +39,62 @@ filetags = '' #added info, particularly for suppl simulations e.g., 'fitness_<fi
 if len(filetags) > 0:
     filetags = '_' + filetags
 
+store_file = None #if simulations were saved to an artifact store (e.g., '../data_sim/network_break/artifacts.h5'), read data from there instead
+
 # List runs
-runs = os.listdir(fit_dir)
-runs = sorted( [run for run in runs if re.findall('^' + tags + '.*[-.0-9]+', run)] )
+if store_file is not None:
+    runs = [tags + "gamma" + str(gamma) for gamma in ut.list_artifacts(store_file, model = 'networkbreaking')['gamma'].unique()]
+else:
+    runs = os.listdir(fit_dir)
+    runs = sorted( [run for run in runs if re.findall('^' + tags + '.*[-.0-9]+', run)] )
+
+
+####################
+# Define data loading function
+####################
+def load_fitness_replicates(run):
+    """
+    Loads fitness trial data of each replicate simulation of a run, one at a time, from either the artifact store or separate .pkl/.npy files.
+    
+    INPUTS:
+    - run:   name of run, e.g. 'gamma0.5' (str).
+    
+    OUTPUTS (yielded for each replicate):
+    - rep:             replicate number (int).
+    - pre_cascade:     cascade data from fitness trials before the model simulation (pandas DataFrame).
+    - post_cascade:    cascade data from fitness trials after the model simulation (pandas DataFrame).
+    - pre_behavior:    individual behavior from fitness trials before the model simulation (pandas DataFrame).
+    - post_behavior:   individual behavior from fitness trials after the model simulation (pandas DataFrame).
+    - thresholds:      thresholds of each individual (numpy array).
+    """
+    
+    # Read from artifact store
+    if store_file is not None:
+        trial_tag = run[:run.index('gamma')] #fitness data from additional trials is saved with the same tag as its run
+        gamma = float(re.search('gamma([-\.0-9]+)', run).group(1))
+        names = [trial_tag + name for name in ['pre_cascades', 'post_cascades', 'pre_behavior', 'post_behavior']]
+        for metadata, data in ut.read_artifacts(store_file, model = 'networkbreaking', gamma = gamma, artifacts = names + ['thresh']):
+            if all(name in data for name in names):
+                yield tuple([metadata['replicate']] + [data[name] for name in names] + [data['thresh']])
+        return
+    
+    # List cascade and and behavior files
+    all_files = os.listdir(fit_dir + run +'/')
+    replicates = sorted( [re.search('(rep[0-9]+)', file).group(1) for file in all_files] )
+    replicates = list(set(replicates)) #get unique values
+    
+    # Get proper run info for thresholds (additional fitness trials use the thresholds/networks from main simulation)
+    thresh_run = re.search('(gamma[-.0-9]+)', run).group(1)
+    
+    # Read in data, both pre- and post- main model simulation
+    for replicate in replicates:
+        rep = int(re.search('([0-9]+)', replicate).group(1))
+        pre_cascade = pd.read_pickle(fit_dir + run +'/pre_cascades_' + replicate + '.pkl')
+        post_cascade = pd.read_pickle(fit_dir + run +'/post_cascades_' + replicate + '.pkl')
+        pre_behavior = pd.read_pickle(fit_dir + run +'/pre_behavior_' + replicate + '.pkl')
+        post_behavior = pd.read_pickle(fit_dir + run +'/post_behavior_' + replicate + '.pkl')
+        thresholds = np.load(thresh_dir + thresh_run + '/thresh_' + replicate + '.npy', mmap_mode = 'r')
+        yield rep, pre_cascade, post_cascade, pre_behavior, post_behavior, thresholds
 
 
 ####################
@@ -64,24 +118,11 @@ for run in runs:
      # Get gamma value
     gamma = float(re.search('[a-z]+([-\.0-9]+)', run).group(1))
     
-    # List cascade and and behavior files
-    all_files = os.listdir(fit_dir + run +'/')
-    replicates = sorted( [re.search('(rep[0-9]+)', file).group(1) for file in all_files] )
-    replicates = list(set(replicates)) #get unique values
-    
     # Loop through replciate simulations within that parameter run
-    for replicate in replicates:
-        
-        # Get replicate number 
-        rep = int(re.search('([0-9]+)', replicate).group(1))
-        
-        # Get proper run info for thresholds (additional fitness trials use the thresholds/networks from main simulation)
-        thresh_run = re.search('(gamma[-.0-9]+)', run).group(1)
+    for rep, pre_cascade, post_cascade, pre_behavior, post_behavior, thresholds in load_fitness_replicates(run):
         
         ##### Cascade data #####
-        # Read in data, both pre- and post- main model simulation
-        pre_cascade = pd.read_pickle(fit_dir + run +'/pre_cascades_' + replicate + '.pkl')
-        post_cascade = pd.read_pickle(fit_dir + run +'/post_cascades_' + replicate + '.pkl')
+        # Bind data, both pre- and post- main model simulation
         cascade = pre_cascade.append(post_cascade, ignore_index = True)
         
         # Calculate additional statistics: Cascades
@@ -92,10 +133,7 @@ for run in runs:
         cascade['replicate'] = rep
         
         ##### Behavior data #####
-        # Read in data, both pre- and post- main model simulation
-        pre_behavior = pd.read_pickle(fit_dir + run +'/pre_behavior_' + replicate + '.pkl')
-        post_behavior = pd.read_pickle(fit_dir + run +'/post_behavior_' + replicate + '.pkl')
-        thresholds = np.load(thresh_dir + thresh_run + '/thresh_' + replicate + '.npy')
+        # Bind data, both pre- and post- main model simulation
         behavior = pre_behavior.append(post_behavior, ignore_index = True)
 
         # Calculate additional statistics: Behavior
@@ -56,19 +56,19 @@ def grab_graph(data, index):
     # Load graph
     sn_path = sn_dir + 'gamma' + str(gamma) + '/'
     sn_name = 'sn_final_rep' + str(replicate).zfill(2) + '.npy'
-    graph = np.load(sn_path + sn_name) #load
+    graph = np.load(sn_path + sn_name, mmap_mode = 'r') #load (memory-mapped, read-only)
     return graph, gamma, assortativity, replicate
 
 def grab_node_properties(gamma, replicate):
     # Grab corresponding type data
     type_path = type_dir + 'gamma' + str(gamma) + '/'
     type_name = 'type_rep' + str(replicate).zfill(2) + '.npy'
-    types = np.load(type_path + type_name) #load
+    types = np.load(type_path + type_name, mmap_mode = 'r') #load (memory-mapped, read-only)
     
     # Grab corresponding threshold data  
     thresh_path = thresh_dir + 'gamma' + str(gamma) + '/'
     thresh_name = 'thresh_rep' + str(replicate).zfill(2) + '.npy'
-    thresholds = np.load(thresh_path + thresh_name) #load
+    thresholds = np.load(thresh_path + thresh_name, mmap_mode = 'r') #load (memory-mapped, read-only)
     
     return types, thresholds
 
@@ -31,6 +31,7 @@ gamma = float(sys.argv[1]) #correlation between two information sources
 psi = 0.1 #proportion of samplers
 timesteps = 3 * 1000000 #number of rounds simulation will run
 rep = int(sys.argv[2]) #replicate ID number
+checkpoint_interval = 100000 #rounds between checkpoints (preempted jobs resume from last checkpoint when resubmitted)
 
 outpath = '/scratch/gpfs/ctokita/information-cascades/network_break/'
 
@@ -44,5 +45,6 @@ model.sim_adjusting_network(replicate = rep,
                             gamma = gamma, 
                             psi = psi, 
                             timesteps = timesteps,
-                            outpath = outpath)
+                            outpath = outpath,
+                            checkpoint_interval = checkpoint_interval)
 
@@ -15,10 +15,7 @@ Script to run network-breaking (NB) cascade model on local machine in parallel.
 ####################
 import model_networkbreaking as model
 import multiprocessing as mp
-import numpy as np
-import sys
-
-#NOTE: sys.argv[0] is name of script
+from cascade_models.utility import run_parameter_sweep
 
 ##########
 # Set parameters
@@ -36,33 +33,11 @@ outpath = '../data_sim/network_break/'
 ##########
 # Run model
 ##########
-# Get CPU count and set pool
-cpus = mp.cpu_count()
-pool = mp.Pool(cpus)
-
-# loop through reps
-for rep in np.arange(reps):
-    # Set up iterable parameters for passing to starmap_asyn
-    reps_array = np.arange(reps)
-    n_array = [n] * len(reps_array)
-    k_array = [k] * len(reps_array)
-    gamma_array = [gamma] * len(reps_array)
-    psi_array = [psi] * len(reps_array)
-    timesteps_array = [timesteps] * len(reps_array)
-    outpath_array = [outpath] * len(reps_array)
-    
-    # Run
-    out = pool.starmap_async(model.sim_adjusting_network, 
-                            zip(reps_array, 
-                                n_array, 
-                                k_array, 
-                                gamma_array, 
-                                psi_array, 
-                                timesteps_array,
-                                outpath_array))
-
-# Close and join
-pool.close()
-pool.join()
-
-
+# Replicates are handed out to a pool of processes (all available cores) as cores free up
+if __name__ == '__main__':
+    run_parameter_sweep(model_function = model.sim_adjusting_network,
+                        parameter_grid = {'n': [n], 'k': [k], 'gamma': [gamma], 'psi': [psi], 'timesteps': [timesteps]},
+                        reps = reps,
+                        outpath = outpath,
+                        completed_file = "type_data/gamma{gamma}/type_rep{replicate:02d}.npy",
+                        cpus = mp.cpu_count())
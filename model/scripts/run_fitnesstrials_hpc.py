@@ -17,8 +17,8 @@ This script depends on a slurm script to call this script.
 ####################
 # Load libraries and packages
 ####################
-import numpy as np
 import cascade_models.cascades as cs
+import cascade_models.utility as ut
 import sys
 import os
 
@@ -29,9 +29,11 @@ import os
 ##########
 # Set path to directory containing simulation data of interest (and where fitness data will be saved)
 directory = '/scratch/gpfs/ctokita/information-cascades/network_break/'
+output_format = "npy" #how simulation data was saved: "npy" (separate files per replicate) or "store" (artifact store <directory>/artifacts.h5). Fitness data is saved the same way.
 
 # Set parameters for fitness trials
 fit_trial_length = 10000
+batch_size = 1000 #number of fitness trial cascades simulated simultaneously
 psi = 0.1
 gamma_trial_value = None #if we want to test all networks under same gamma value (instead of gamma of model simulation)
 trial_tags = "" #leave empty unless you are manually setting gamma_trial_value to a 'highcorr' or 'lowcorr' info ecosystem (lowcorr = -0.9; highcorr = 0.9)
@@ -51,22 +53,35 @@ if gamma_trial_value is None:
 ##########
 # Run fitness trial
 ##########
-# Check if this gamma exists in the data (some runs will not use as many gamma values)
-sn_dir_exists = os.path.exists(directory + 'social_network_data/gamma' + str(gamma))
-thresh_dir_exists = os.path.exists(directory + 'thresh_data/gamma' + str(gamma))
-type_dir_exists = os.path.exists(directory + 'type_data/gamma' + str(gamma))
-if sn_dir_exists + thresh_dir_exists + type_dir_exists != 3:
-    sys.exit(0)
+# Get social network, thresholds, and type data.
+if output_format == "store":
+    # Check if the store exists and has this replicate (some runs will not use as many gamma values)
+    if not os.path.exists(directory + "artifacts.h5"):
+        sys.exit(0)
+    replicate_data = list(ut.read_artifacts(directory + "artifacts.h5", model = "networkbreaking", gamma = gamma, replicate = rep,
+                                            artifacts = ['sn_initial', 'sn_final', 'thresh', 'type']))
+    if len(replicate_data) == 0:
+        sys.exit(0)
+    metadata, data = replicate_data[0]
+    initial_sn, final_sn, thresholds, types = data['sn_initial'], data['sn_final'], data['thresh'], data['type']
+else:
+    # Check if this gamma exists in the data (some runs will not use as many gamma values)
+    sn_dir_exists = os.path.exists(directory + 'social_network_data/gamma' + str(gamma))
+    thresh_dir_exists = os.path.exists(directory + 'thresh_data/gamma' + str(gamma))
+    type_dir_exists = os.path.exists(directory + 'type_data/gamma' + str(gamma))
+    if sn_dir_exists + thresh_dir_exists + type_dir_exists != 3:
+        sys.exit(0)
     
-# Create fitness data directory
-if not os.path.exists(directory + "fitness_data/"):
-            os.makedirs(directory + "fitness_data/")
+    # Create fitness data directory
+    if not os.path.exists(directory + "fitness_data/"):
+                os.makedirs(directory + "fitness_data/")
 
-# Get social network, thresholds, and type data.
-initial_sn = np.load(directory + 'social_network_data/gamma' + str(gamma) + '/sn_initial_rep' + str(rep).zfill(2) + '.npy')
-final_sn = np.load(directory + 'social_network_data/gamma' + str(gamma) + '/sn_final_rep' + str(rep).zfill(2) + '.npy')
-thresholds = np.load(directory + 'thresh_data/gamma' + str(gamma) + '/thresh_rep' + str(rep).zfill(2) + '.npy')
-types = np.load(directory + 'type_data/gamma' + str(gamma) + '/type_rep' + str(rep).zfill(2) + '.npy') 
+    # Get social network, thresholds, and type data (memory-mapped, read-only, so concurrent jobs share the cached files)
+    replicate_files = ut.ReplicateFiles(directory, gamma = gamma, replicate = rep)
+    initial_sn = replicate_files['sn_initial']
+    final_sn = replicate_files['sn_final']
+    thresholds = replicate_files['thresh']
+    types = replicate_files['type']
 
 # Pre-casacde transformation fitness assessment
 pre_behavior, pre_cascades = cs.assess_fitness(gamma = gamma_trial_value, 
@@ -75,7 +90,8 @@ pre_behavior, pre_cascades = cs.assess_fitness(gamma = gamma_trial_value,
                                                network = initial_sn, 
                                                thresholds = thresholds, 
                                                types = types,
-                                               trial = "pre")
+                                               trial = "pre",
+                                               batch_size = batch_size)
 
 # Post-casacde transformation fitness assessment
 post_behavior, post_cascades = cs.assess_fitness(gamma = gamma_trial_value, 
@@ -84,14 +100,20 @@ post_behavior, post_cascades = cs.assess_fitness(gamma = gamma_trial_value,
                                                  network = final_sn, 
                                                  thresholds = thresholds, 
                                                  types = types,
-                                                 trial = "post")
+                                                 trial = "post",
+                                                 batch_size = batch_size)
 
-# Create directory for this gamma
-if not os.path.exists(directory + "fitness_data/" + trial_tags + "gamma" + str(gamma) + "/"): 
-        os.makedirs(directory + "fitness_data/" + trial_tags + "gamma" + str(gamma) + "/")
-        
 # Save
-pre_behavior.to_pickle(directory + "fitness_data/" + trial_tags + "gamma" + str(gamma) + "/pre_behavior_rep" + str(rep).zfill(2) + ".pkl")
-pre_cascades.to_pickle(directory + "fitness_data/" + trial_tags + "gamma" + str(gamma) + "/pre_cascades_rep" + str(rep).zfill(2) + ".pkl")
-post_behavior.to_pickle(directory + "fitness_data/" + trial_tags + "gamma" + str(gamma) + "/post_behavior_rep" + str(rep).zfill(2) + ".pkl")
-post_cascades.to_pickle(directory + "fitness_data/" + trial_tags + "gamma" + str(gamma) + "/post_cascades_rep" + str(rep).zfill(2) + ".pkl")
\ No newline at end of file
+if output_format == "store":
+    ut.write_artifacts(directory + "artifacts.h5", model = "networkbreaking", gamma = gamma, replicate = rep,
+                       **{trial_tags + "pre_behavior": pre_behavior, trial_tags + "pre_cascades": pre_cascades,
+                          trial_tags + "post_behavior": post_behavior, trial_tags + "post_cascades": post_cascades})
+else:
+    # Create directory for this gamma
+    if not os.path.exists(directory + "fitness_data/" + trial_tags + "gamma" + str(gamma) + "/"): 
+            os.makedirs(directory + "fitness_data/" + trial_tags + "gamma" + str(gamma) + "/")
+        
+    pre_behavior.to_pickle(directory + "fitness_data/" + trial_tags + "gamma" + str(gamma) + "/pre_behavior_rep" + str(rep).zfill(2) + ".pkl")
+    pre_cascades.to_pickle(directory + "fitness_data/" + trial_tags + "gamma" + str(gamma) + "/pre_cascades_rep" + str(rep).zfill(2) + ".pkl")
+    post_behavior.to_pickle(directory + "fitness_data/" + trial_tags + "gamma" + str(gamma) + "/post_behavior_rep" + str(rep).zfill(2) + ".pkl")
+    post_cascades.to_pickle(directory + "fitness_data/" + trial_tags + "gamma" + str(gamma) + "/post_cascades_rep" + str(rep).zfill(2) + ".pkl")
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 17:42:19 2026
+
+@author: ChrisTokita
+
+DESCRIPTION:
+Script to sweep a cascade model across a grid of parameter values on a single (many-core) machine.
+Replaces fanning out one slurm job per gamma value/replicate: all tasks are scheduled on a local pool of processes,
+tasks that already have output are skipped (so an interrupted sweep can be restarted), and progress is reported as tasks finish.
+
+Any parameter (other than gamma) given more than one value gets its own output sub-directory, e.g., <outpath>/psi0.1/.
+"""
+
+####################
+# Load libraries and packages
+####################
+import sys
+sys.path.append('suppl_analysis/homophily_tie_formation/')
+sys.path.append('suppl_analysis/threshold_adjustment/')
+import importlib
+import multiprocessing as mp
+import os
+import numpy as np
+import cascade_models.utility as ut
+
+##########
+# Choose model
+##########
+# model name: (module, simulation function)
+models = {'networkbreaking': ('model_networkbreaking', 'sim_adjusting_network'),
+          'threshadjusting': ('model_threshadjusting', 'sim_adjusting_thresholds'),
+          'networkbreaking_homophily': ('model_networkbreaking_homophily', 'sim_adjusting_network'),
+          'networkbreaking_thresholdadjust': ('model_networkbreaking_thresholdadjust', 'sim_adjusting_network')}
+model_name = 'networkbreaking'
+
+##########
+# Set parameters
+##########
+parameter_grid = {'n': [200], #number of individuals
+                  'k': [8], #mean degree on networks
+                  'gamma': np.round(np.arange(-1, 1.05, 0.1), 1) + 0.0, #correlation between two information sources (+ 0.0 turns -0.0 into 0.0)
+                  'psi': [0.1], #proportion of samplers
+                  'timesteps': [3 * 1000000], #number of rounds simulation will run
+                  'network_type': ['random']} #type of initial network
+if model_name == 'threshadjusting':
+    parameter_grid.update({'phi': [0.01], 'omega': [0.01], 'sim_tag': [""]})
+reps = 100 #number of replicates per parameter combination
+output_format = "npy" #"npy" (separate files per replicate) or "store" (one artifact store per output directory; networkbreaking and threshadjusting models only)
+if output_format == "store":
+    parameter_grid['output_format'] = [output_format]
+cpus = mp.cpu_count() #number of processes
+
+outpath = '../data_sim/network_break/'
+
+
+##########
+# Run model
+##########
+def replicate_complete(task):
+    # Whether a replicate has already been saved
+    if output_format == "store":
+        saved = ut.list_artifacts(task['outpath'] + "artifacts.h5", model = model_name, gamma = task['gamma'], replicate = task['replicate'])
+        return len(saved) > 0
+    return os.path.exists(task['outpath'] + "type_data/gamma" + str(task['gamma']) + "/type_rep" + str(task['replicate']).zfill(2) + ".npy")
+
+if __name__ == '__main__':
+    module_name, function_name = models[model_name]
+    model_function = getattr(importlib.import_module(module_name), function_name)
+    task_times = ut.run_parameter_sweep(model_function = model_function,
+                                        parameter_grid = parameter_grid,
+                                        reps = reps,
+                                        outpath = outpath,
+                                        completed_file = replicate_complete,
+                                        cpus = cpus)
@@ -17,7 +17,7 @@ See: directory slurm_scripts/ for the specific scripts used to call this python
 ####################
 # Load libraries and packages
 ####################
-import model_networkbreaking_homphily as model_homophily
+import model_networkbreaking_homophily as model_homophily
 import sys
 
 #NOTE: sys.argv[0] is name of script
@@ -23,6 +23,7 @@ import numpy as np
 import cascade_models.social_networks as sn
 import cascade_models.thresholds as th
 import cascade_models.cascades as cs
+import cascade_models.utility as ut
 import copy
 import os
 
@@ -47,42 +48,47 @@ def sim_adjusting_network(replicate, n, k, gamma, psi, timesteps, outpath, netwo
     """    
     
     ########## Seed initial conditions ##########
-    # Set overall seed
-    seed = int( (replicate + 1 + gamma) * 323 )
-    np.random.seed(seed)
+    # Set up random number generator (independent stream for each parameter combination and replicate)
+    rng = ut.replicate_rng(model = "networkbreaking_thresholdadjust", replicate = replicate, n = n, k = k, gamma = gamma, psi = psi, network_type = network_type)
     # Seed individual's thresholds
-    thresh_mat = th.seed_thresholds(n = n, lower = 0, upper = 1)
+    thresh_mat = th.seed_thresholds(n = n, lower = 0, upper = 1, rng = rng)
     thresh_mat_initial = thresh_mat.copy()
     # Assign type
-    type_mat = th.assign_type(n = n)
+    type_mat = th.assign_type(n = n, rng = rng)
     # Set up social network
-    adjacency = sn.seed_social_network(n, k, network_type = network_type)
+    adjacency = sn.seed_social_network(n, k, network_type = network_type, rng = rng)
     adjacency_initial = copy.deepcopy(adjacency)
     
     ########## Run simulation ##########
+    network = sn.NetworkState(adjacency) #tracks degree/neighbors as ties change
     for t in range(timesteps):
         # Initial information sampling
         info_values, state_mat, samplers, samplers_active = cs.simulate_stim_sampling(n = n,
                                                                                       gamma = gamma,
                                                                                       psi = psi,
                                                                                       types = type_mat,
-                                                                                      thresholds = thresh_mat)
+                                                                                      thresholds = thresh_mat,
+                                                                                      rng = rng)
         # Simulate information cascade 
-        state_mat = cs.simulate_cascade(network = adjacency, 
+        state_mat = cs.simulate_cascade(network = network.adjacency, 
                                         states = state_mat, 
                                         thresholds = thresh_mat,
-                                        samplers = samplers)
+                                        samplers = samplers,
+                                        degree = network.degree)
         # Evaluate behavior of individuals relative to threshold and stimuli
         correct_state = cs.evaluate_behavior(states = state_mat, 
                                              thresholds = thresh_mat, 
                                              information = info_values, 
                                              types = type_mat)
         # Adjust social network ties
-        adjacency, thresh_mat = adjust_tie_and_threshold(network = adjacency,
-                                                         states = state_mat,
-                                                         correct_behavior = correct_state,
-                                                         thresholds = thresh_mat,
-                                                         thresh_adjust_amount = 0.05)
+        network, thresh_mat = adjust_tie_and_threshold(network = network,
+                                                       states = state_mat,
+                                                       correct_behavior = correct_state,
+                                                       thresholds = thresh_mat,
+                                                       thresh_adjust_amount = 0.05,
+                                                       rng = rng)
+    
+    adjacency = network.adjacency
     
     ########## Save files ##########
     # Create output folder
@@ -91,12 +97,8 @@ def sim_adjusting_network(replicate, n, k, gamma, psi, timesteps, outpath, netwo
     data_dirs = [outpath + d + "/" for d in data_dirs]
     output_dirs = [d + output_name +  "/" for d in data_dirs]
     for x in np.arange(len(data_dirs)):
-        # Check if directory already exisits. If not, create it.
-        if not os.path.exists(data_dirs[x]):
-            os.makedirs(data_dirs[x])
-        # Check if specific run folder exists
-        if not os.path.exists(output_dirs[x]):
-            os.makedirs(output_dirs[x])
+        # Create run folder (and data folder) if it doesn't exist yet. Other replicates running in parallel may be creating it at the same time.
+        os.makedirs(output_dirs[x], exist_ok = True)
     # Save files
     rep_label = str(replicate).zfill(2)
     np.save(output_dirs[0] + "sn_final_rep" + rep_label + ".npy", adjacency)
@@ -108,46 +110,41 @@ def sim_adjusting_network(replicate, n, k, gamma, psi, timesteps, outpath, netwo
 ####################
 # Define model-specific functions
 ####################
-def adjust_tie_and_threshold(network, states, correct_behavior, thresholds, thresh_adjust_amount):
+def adjust_tie_and_threshold(network, states, correct_behavior, thresholds, thresh_adjust_amount, rng = None):
     """
     Randomly selects active individual and breaks tie + adjusts threshold if incorrect.
     Another individual randomly forms like iff a tie is broken in that round.
 
     INPUTS:
-    - network:                the network connecting individuals (numpy array).
+    - network:                the network connecting individuals, along with its degree/neighbor bookkeeping (NetworkState).
     - states:                 matrix listing the behavioral state of every individual (numpy array).
     - correct_behavior:       array indicating whether each individual behaved correctly (numpy array).
     - thresholds:             threshold values for all individuals (numpy array).
     - thresh_adjust_amount:   amount thresholds will increase by when individual breaks tie (float).
+    - rng:                    random number generator to draw from. Default is numpy's global RNG (numpy Generator or RandomState).
     """
     
+    rng = np.random if rng is None else rng
     actives = np.where(states == 1)[0]
     if sum(actives) > 0: #error catch when no individual are active
-        individual_active = np.random.choice(actives, size = 1)
+        individual_active = rng.choice(actives, size = 1)[0]
         individual_correct = correct_behavior[individual_active]
-        individual_neighbors = np.where(network[individual_active,:] == 1)[1]
                 
         if not individual_correct:
             
             # Break ties with one randomly-selected "incorrect" neighbor
-            perceived_incorrect = [ind for ind in actives if ind in individual_neighbors] #which neighbors are active
-            break_tie = np.random.choice(perceived_incorrect, size = 1, replace = False)
-            network[individual_active, break_tie] = 0
-            network[break_tie, individual_active] = 0 #undirected network, symmetric edges
+            perceived_incorrect = network.active_neighbors(individual_active, states) #which neighbors are active
+            break_tie = rng.choice(perceived_incorrect, size = 1, replace = False)[0]
+            network.break_tie(individual_active, break_tie)
             
             # Tie-breaker individual also adjusts threhsolds
             new_thresh_value = thresholds[individual_active] + thresh_adjust_amount
             thresholds[individual_active] = min(new_thresh_value, 1) #make sure thresholds never go above 1!
             
             # Randomly select another individual to form a new tie
-            max_connections = network.shape[0] - 1 #can't connect to self
-            candidate_individuals = np.where(np.sum(network, axis = 1) != max_connections)[0] #list individuals who are not already connected to everyone
-            former_individual = np.random.choice(candidate_individuals, size = 1)
-            former_connections = np.squeeze(network[former_individual,:]) #get individual's neighbors
-            potential_ties = np.where(former_connections == 0)[0]
-            potential_ties = np.delete(potential_ties, np.where(potential_ties == former_individual)) # Prevent self-loop
-            new_tie = np.random.choice(potential_ties, size = 1, replace = False)
-            network[former_individual, new_tie] = 1
-            network[new_tie, former_individual] = 1 #undirected network, symmetric edges
+            candidate_individuals = network.not_saturated() #list individuals who are not already connected to everyone
+            former_individual = rng.choice(candidate_individuals, size = 1)[0]
+            new_tie = network.random_non_neighbor(former_individual, rng) #anyone not already tied to them (or themselves)
+            network.form_tie(former_individual, new_tie)
                 
     return network, thresholds
@@ -21,8 +21,8 @@ import sys
 # sys.path.append('../../') #add scripts folder so we can import our cacades_model module
 # sys.path.insert(1, '/home/ctokita/information-cascades/scripts/')
 
-import numpy as np
 import cascade_models.cascades as cs
+import cascade_models.utility as ut
 import sys
 import os
 
@@ -36,6 +36,7 @@ directory = '/scratch/gpfs/ctokita/information-cascades/network_break/__suppl_si
 
 # Set parameters for fitness trials
 fit_trial_length = 10000
+batch_size = 1000 #number of fitness trial cascades simulated simultaneously
 psi = 0.1
 gamma_trial_value = None #if we want to test all networks under same gamma value (instead of gamma of model simulation)
 trial_tags = "" #leave empty unless you are manually setting gamma_trial_value to a 'highcorr' or 'lowcorr' info ecosystem (lowcorr = -0.9; highcorr = 0.9)
@@ -67,11 +68,12 @@ if not os.path.exists(directory + "fitness_data/"):
             os.makedirs(directory + "fitness_data/")
 
 # Get social network, thresholds, and type data.
-initial_sn = np.load(directory + 'social_network_data/gamma' + str(gamma) + '/sn_initial_rep' + str(rep).zfill(2) + '.npy')
-final_sn = np.load(directory + 'social_network_data/gamma' + str(gamma) + '/sn_final_rep' + str(rep).zfill(2) + '.npy')
-initial_thresholds = np.load(directory + 'thresh_data/gamma' + str(gamma) + '/thresh_initial_rep' + str(rep).zfill(2) + '.npy')
-final_thresholds = np.load(directory + 'thresh_data/gamma' + str(gamma) + '/thresh_rep' + str(rep).zfill(2) + '.npy')
-types = np.load(directory + 'type_data/gamma' + str(gamma) + '/type_rep' + str(rep).zfill(2) + '.npy') 
+replicate_files = ut.ReplicateFiles(directory, gamma = gamma, replicate = rep) #memory-mapped, read-only
+initial_sn = replicate_files['sn_initial']
+final_sn = replicate_files['sn_final']
+initial_thresholds = replicate_files['thresh_initial']
+final_thresholds = replicate_files['thresh']
+types = replicate_files['type'] 
 
 # Pre-casacde transformation fitness assessment
 pre_behavior, pre_cascades = cs.assess_fitness(gamma = gamma_trial_value, 
@@ -80,7 +82,8 @@ pre_behavior, pre_cascades = cs.assess_fitness(gamma = gamma_trial_value,
                                                network = initial_sn, 
                                                thresholds = initial_thresholds, 
                                                types = types,
-                                               trial = "pre")
+                                               trial = "pre",
+                                               batch_size = batch_size)
 
 # Post-casacde transformation fitness assessment
 post_behavior, post_cascades = cs.assess_fitness(gamma = gamma_trial_value, 
@@ -89,7 +92,8 @@ post_behavior, post_cascades = cs.assess_fitness(gamma = gamma_trial_value,
                                                  network = final_sn, 
                                                  thresholds = final_thresholds, 
                                                  types = types,
-                                                 trial = "post")
+                                                 trial = "post",
+                                                 batch_size = batch_size)
 
 # Create directory for this gamma
 if not os.path.exists(directory + "fitness_data/" + trial_tags + "gamma" + str(gamma) + "/"): 
@@ -18,6 +18,7 @@ import re
 import sys 
 sys.path.append('../../') #add scripts folder so we can import our cacades_model module
 
+import cascade_models.utility as ut
 from cascade_models.social_networks.local_assortativity import local_assortativity_continuous
 
 
@@ -36,10 +37,59 @@ filetags = '' #added info after 'assortativity'
 if len(filetags) > 0:
     filetags = '_' + filetags
 
+store_file = None #if simulations were saved to an artifact store (e.g., '../../../data_sim/network_break/artifacts.h5'), read data from there instead
+
 # List runs
-runs = os.listdir(sn_dir)
-runs = [run for run in runs if re.findall(tags + '[-.0-9]+', run)]
-runs.sort()
+if store_file is not None:
+    runs = ["gamma" + str(gamma) for gamma in ut.list_artifacts(store_file, model = 'networkbreaking')['gamma'].unique()]
+else:
+    runs = os.listdir(sn_dir)
+    runs = [run for run in runs if re.findall(tags + '[-.0-9]+', run)]
+    runs.sort()
+
+
+####################
+# Define data loading function
+####################
+def load_replicates(run):
+    """
+    Loads each replicate simulation of a run, one at a time, from either the artifact store or separate .npy files.
+    
+    INPUTS:
+    - run:   name of run, e.g. 'gamma0.5' (str).
+    
+    OUTPUTS (yielded for each replicate):
+    - rep:                 replicate number (int).
+    - adjacency:           final social network (numpy array).
+    - adjacency_initial:   initial social network (numpy array).
+    - types:               type assignments of each individual (numpy array).
+    - thresholds:          thresholds of each individual (numpy array).
+    """
+    
+    # Read from artifact store
+    if store_file is not None:
+        gamma = float(re.search('gamma([-\.0-9]+)', run).group(1))
+        for metadata, data in ut.read_artifacts(store_file, model = 'networkbreaking', gamma = gamma, artifacts = ['sn_final', 'sn_initial', 'type', 'thresh']):
+            yield metadata['replicate'], data['sn_final'], data['sn_initial'], data['type'], data['thresh']
+        return
+    
+    # List social network files in that run's data folder
+    sn_files = os.listdir(sn_dir + run +'/')
+    sn_final = sorted( [file for file in sn_files if re.findall('sn_final_rep[0-9]+.npy', file)] )
+    sn_initial = sorted( [file for file in sn_files if re.findall('sn_initial_rep[0-9]+.npy', file)] )
+    
+    # List type and threshold data files in that run's data folder
+    type_files = sorted( os.listdir(type_dir + run +'/') )
+    thresh_files = sorted( os.listdir(thresh_dir + run +'/') )
+    
+    # Load network, type and threshold matrices (memory-mapped, read-only, so only one replicate's pages are in memory at a time)
+    for i in np.arange(len(sn_final)):
+        adjacency = np.load(sn_dir + run + '/' + sn_final[i], mmap_mode = 'r')
+        adjacency_initial = np.load(sn_dir + run + '/' + sn_initial[i], mmap_mode = 'r')
+        types = np.load(type_dir +  run + '/' + type_files[i], mmap_mode = 'r')
+        thresholds = np.load(thresh_dir + run + '/' + thresh_files[i], mmap_mode = 'r')
+        rep = int(re.search('([0-9]+)', sn_final[i]).group(1))
+        yield rep, adjacency, adjacency_initial, types, thresholds
 
 
 ####################
@@ -168,24 +218,12 @@ for run in runs:
     # Get gamma value
     gamma = float(re.search('gamma([-\.0-9]+)', run).group(1))
     
-     # List social network files in that run's data folder
-    sn_files = os.listdir(sn_dir + run +'/')
-    sn_final = sorted( [file for file in sn_files if re.findall('sn_final_rep[0-9]+.npy', file)] )
-    sn_initial =  sorted( [file for file in sn_files if re.findall('sn_initial_rep[0-9]+.npy', file)] )
-    
-    # List type and threshold data files in that run's data folder
-    type_files = sorted( os.listdir(type_dir + run +'/') )
-    thresh_files = sorted( os.listdir(thresh_dir + run +'/') )
-    
     # Loop through individual replicates and calculate changes in network
-    for replicate in np.arange(len(sn_final)):
+    for replicate, adjacency, adjacency_initial, types, thresholds in load_replicates(run):
         
-        # Load network and threshold matrices
-        adjacency = np.load(sn_dir + run + '/' + sn_final[replicate])
-        adjacency_initial = np.load(sn_dir + run + '/' + sn_initial[replicate])
-        thresholds = np.load(thresh_dir + run + '/' + thresh_files[replicate]).flatten() #make 1d
-        types = np.load(type_dir +  run + '/' + type_files[replicate])
-        types = np.argmax(types == 1 , axis = 1) #get categorical types of individuals
+        # Format threshold and type matrices
+        thresholds = np.asarray(thresholds).flatten() #make 1d
+        types = np.argmax(np.asarray(types) == 1 , axis = 1) #get categorical types of individuals
         
         # Calculate difference with network neighbors' thresholds
         replicate_data_initial = calculate_neighor_threshold_stats(thresholds, adjacency_initial, types)
@@ -211,24 +249,11 @@ neighbor_threshold_stats_final.to_csv(outpath + 'final_neighbor_thresh_data.csv'
 ####################
 # Focus in on gamma = 1 scenario to really get at threshold sorting dynamics, absent polarized information ecosystem.
 ####################
-# List social network files in that run's data folder
-sn_files = os.listdir(sn_dir + 'gamma1.0/')
-sn_final = sorted( [file for file in sn_files if re.findall('sn_final_rep[0-9]+.npy', file)] )
-sn_initial =  sorted( [file for file in sn_files if re.findall('sn_initial_rep[0-9]+.npy', file)] )
-   
-# List type and threshold data files in that run's data folder
-type_files = sorted( os.listdir(type_dir + 'gamma1.0/') )
-thresh_files = sorted( os.listdir(thresh_dir + 'gamma1.0/') )
-
 # Loop through individual replicates and calculate changes in network
-for replicate in np.arange(len(sn_final)):
+for replicate, adjacency, adjacency_initial, types, thresholds in load_replicates('gamma1.0'):
    
-   # Load network and threshold matrices
-   adjacency = np.load(sn_dir + 'gamma1.0/' + sn_final[replicate])
-   adjacency_initial = np.load(sn_dir + 'gamma1.0/' + sn_initial[replicate])
-   thresholds = np.load(thresh_dir + 'gamma1.0/' + thresh_files[replicate]).flatten() #make 1d
-   types = np.load(type_dir +  'gamma1.0/' + type_files[replicate])
-   types = np.argmax(types == 1 , axis = 1) #get categorical types of individuals
+   # Format threshold matrix
+   thresholds = np.asarray(thresholds).flatten() #make 1d
    
    # Calculate difference with network neighbors' thresholds
    initial_threshold_network = gather_neighbor_thresholds(thresholds, adjacency_initial)
@@ -266,26 +291,18 @@ focus_runs = ['gamma1.0', 'gamma-1.0']
    
 for run in focus_runs:
     
-    # List social network files in that run's data folder
+    # Get gamma value
     gamma = int( re.search('gamma(.*[0-9]{1})\.0', run).group(1) )
-    sn_files = os.listdir(sn_dir + run + '/')
-    sn_final = sorted( [file for file in sn_files if re.findall('sn_final_rep[0-9]+.npy', file)] )
-    sn_initial =  sorted( [file for file in sn_files if re.findall('sn_initial_rep[0-9]+.npy', file)] )
-       
-    # List type and threshold data files in that run's data folder
-    type_files = sorted( os.listdir(type_dir + run + '/') )
-    thresh_files = sorted( os.listdir(thresh_dir + run + '/') )
     
     # Loop through individual replicates and calculate local assortativity
-    for replicate in np.arange(len(sn_final)):
+    for replicate, adjacency, adjacency_initial, types, thresholds in load_replicates(run):
         
         # Print progress
         if (replicate % 10) == 0:
             print("gamma = {}:\n    {}% done...".format(str(gamma), str(replicate)))
         
-        # Load network and threshold matrices
-        adjacency = np.load(sn_dir + run + '/' + sn_final[replicate])
-        thresholds = np.load(thresh_dir + run + '/' + thresh_files[replicate]).flatten() #make 1d
+        # Format threshold matrix
+        thresholds = np.asarray(thresholds).flatten() #make 1d
      
         # Calculate local assortativity of nodes with regard to threshold
         alpha = 0
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 15:02:26 2026
+
+@author: ChrisTokita
+
+DESCRIPTION:
+Script to check that the compiled (numba) backend of the network-breaking model produces statistically equivalent output to the numpy version.
+The two backends use different random number streams, so we compare distributions across replicates rather than individual runs.
+"""
+
+####################
+# Load libraryies and packages
+####################
+import sys
+sys.path.insert(0, '../')
+
+import numpy as np
+import scipy.stats as stats
+import igraph
+import tempfile
+import time
+import model_networkbreaking as model
+
+####################
+# Set parameters
+####################
+n = 200 #number of individuals
+k = 8 #mean degree on networks
+gamma = -0.5 #correlation between two information sources
+psi = 0.1 #proportion of samplers
+timesteps = 50000 #number of rounds simulation will run
+reps = 20 #number of replicate simulations per backend
+
+####################
+# Run both backends
+####################
+def summarise_replicate(outpath, rep):
+    # Measure type assortativity and number of ties changed in a finished replicate
+    rep_label = str(rep).zfill(2)
+    adjacency = np.load(outpath + 'social_network_data/gamma' + str(gamma) + '/sn_final_rep' + rep_label + '.npy')
+    adjacency_initial = np.load(outpath + 'social_network_data/gamma' + str(gamma) + '/sn_initial_rep' + rep_label + '.npy')
+    types = np.load(outpath + 'type_data/gamma' + str(gamma) + '/type_rep' + rep_label + '.npy')
+    g = igraph.Graph.Adjacency(np.ndarray.tolist(adjacency), mode = 'undirected')
+    assort = g.assortativity_nominal(types = list(np.argmax(types == 1, axis = 1)), directed = False)
+    ties_changed = np.sum(np.abs(adjacency - adjacency_initial)) / 2
+    return assort, ties_changed
+
+results = {}
+for backend in ['numpy', 'numba']:
+    outpath = tempfile.mkdtemp() + '/'
+    start = time.time()
+    for rep in np.arange(reps):
+        model.sim_adjusting_network(replicate = rep,
+                                    n = n,
+                                    k = k,
+                                    gamma = gamma,
+                                    psi = psi,
+                                    timesteps = timesteps,
+                                    outpath = outpath,
+                                    backend = backend)
+    elapsed = time.time() - start
+    results[backend] = np.array([summarise_replicate(outpath, rep) for rep in np.arange(reps)])
+    print("%s backend: %1.1f seconds for %d replicates" % (backend, elapsed, reps))
+
+####################
+# Compare distributions
+####################
+for i, metric in enumerate(['assortativity', 'ties changed']):
+    numpy_values, numba_values = results['numpy'][:,i], results['numba'][:,i]
+    ks = stats.ks_2samp(numpy_values, numba_values)
+    print("%s: numpy mean = %1.3f, numba mean = %1.3f, KS p-value = %1.3f" % (metric, np.mean(numpy_values), np.mean(numba_values), ks.pvalue))
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 09:14:37 2026
+
+@author: ChrisTokita
+
+DESCRIPTION:
+Script to check that the sparse cascade engine gives exactly the same post-cascade states as the dense engine
+(given either CSR or CSC networks, with or without degree), on undirected, directed, and weighted random networks
+(including individuals with ties from others but none of their own).
+"""
+
+####################
+# Load libraryies and packages
+####################
+import sys
+sys.path.insert(0, '../')
+
+import numpy as np
+import scipy.sparse as sparse
+from cascade_models.cascades.simulate_cascade import simulate_cascade
+
+####################
+# Set parameters
+####################
+trials = 300 #number of random networks per network kind
+max_n = 60 #largest number of individuals
+rng = np.random.default_rng(42)
+
+####################
+# Compare engines
+####################
+def random_network(n, kind):
+    # Random network of the given kind: undirected, directed, or weighted (directed)
+    network = (rng.random((n, n)) < rng.uniform(0.02, 0.3)).astype(int)
+    np.fill_diagonal(network, 0)
+    if kind == 'undirected':
+        network = np.triu(network, 1)
+        network = network + network.T
+    elif kind == 'weighted':
+        network = network * rng.integers(1, 4, size = (n, n))
+    return network
+
+for kind in ['undirected', 'directed', 'weighted']:
+    mismatches = 0
+    for trial in np.arange(trials):
+        n = rng.integers(3, max_n)
+        network = random_network(n, kind)
+        thresholds = rng.random((n, 1))
+        samplers = rng.choice(n, size = max(1, n // 5), replace = False)
+        states = np.zeros((n, 1))
+        states[samplers[rng.random(len(samplers)) < 0.6]] = 1
+        dense_states = simulate_cascade(network, states.copy(), thresholds, samplers)
+        sparse_states = simulate_cascade(sparse.csr_matrix(network), states.copy(), thresholds, samplers)
+        mismatches += not np.array_equal(dense_states, sparse_states)
+        csc_states = simulate_cascade(sparse.csc_matrix(network), states.copy(), thresholds, samplers, degree = np.sum(network, axis = 1, keepdims = True))
+        mismatches += not np.array_equal(dense_states, csc_states)
+    print("%s networks: %d of %d cascades differ between engines" % (kind, mismatches, 2 * trials))
+
+# Individual 1 has a tie from individual 0, but no ties of their own, so never sees any social information
+network = np.zeros((3, 3), dtype = int)
+network[0, 1] = 1
+states = np.array([[1.], [0.], [0.]])
+sparse_states = simulate_cascade(sparse.csr_matrix(network), states.copy(), np.zeros((3, 1)), np.array([0]))
+dense_states = simulate_cascade(network, states.copy(), np.zeros((3, 1)), np.array([0]))
+print("Zero out-degree individual: sparse " + str(sparse_states.flatten()) + ", dense " + str(dense_states.flatten()))
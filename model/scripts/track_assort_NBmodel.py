@@ -34,6 +34,7 @@ import pandas as pd
 import cascade_models.social_networks as sn
 import cascade_models.thresholds as th
 import cascade_models.cascades as cs
+import cascade_models.utility as ut
 import igraph
 
 # Supress error warnings (not an issue for this script)
@@ -57,15 +58,14 @@ def sim_adjusting_network(replicate, n, k, gamma, psi, timesteps, outpath, netwo
     # - network_type:   type of network to intially generate. Default is random but accepts ["random", "scalefree"] (str).
         
     ########## Seed initial conditions ##########
-    # Set overall seed
-    seed = int( (replicate + 1 + gamma) * 323 )
-    np.random.seed(seed)
+    # Set up random number generator (independent stream for each parameter combination and replicate)
+    rng = ut.replicate_rng(model = "networkbreaking", replicate = replicate, n = n, k = k, gamma = gamma, psi = psi, network_type = network_type)
     # Seed individual's thresholds
-    thresh_mat = th.seed_thresholds(n = n, lower = 0, upper = 1)
+    thresh_mat = th.seed_thresholds(n = n, lower = 0, upper = 1, rng = rng)
     # Assign type
-    type_mat = th.assign_type(n = n)
+    type_mat = th.assign_type(n = n, rng = rng)
     # Set up social network
-    adjacency = sn.seed_social_network(n, k, network_type = network_type)
+    adjacency = sn.seed_social_network(n, k, network_type = network_type, rng = rng)
     
     #Capture assortativity and network breaks over time!
     assort_time = pd.DataFrame(columns = ['t', 'assort_type'])
@@ -80,7 +80,8 @@ def sim_adjusting_network(replicate, n, k, gamma, psi, timesteps, outpath, netwo
                                                                                       gamma = gamma,
                                                                                       psi = psi,
                                                                                       types = type_mat,
-                                                                                      thresholds = thresh_mat)
+                                                                                      thresholds = thresh_mat,
+                                                                                      rng = rng)
         # Simulate information cascade 
         state_mat = cs.simulate_cascade(network = adjacency, 
                                         states = state_mat, 
@@ -94,7 +95,8 @@ def sim_adjusting_network(replicate, n, k, gamma, psi, timesteps, outpath, netwo
         # ALT model format: Adjust ties
         adjacency, formed_tie, broken_tie = adjust_tie(network = adjacency,
                                                        states = state_mat,
-                                                       correct_behavior = correct_state)
+                                                       correct_behavior = correct_state,
+                                                       rng = rng)
         
         # Sum up tie forms/breaks
         break_count += broken_tie
@@ -117,7 +119,7 @@ def sim_adjusting_network(replicate, n, k, gamma, psi, timesteps, outpath, netwo
 ####################
 # Define model-specific functions
 ####################
-def adjust_tie(network, states, correct_behavior):
+def adjust_tie(network, states, correct_behavior, rng = None):
     # Randomly selects active individual and breaks tie if incorrect.
     # Another individual randomly forms like iff a tie is broken in that round.
     #
@@ -125,12 +127,14 @@ def adjust_tie(network, states, correct_behavior):
     # - network:      the network connecting individuals (numpy array).
     # - states:       matrix listing the behavioral state of every individual (numpy array).
     # - correct_behavior:   array indicating whether each individual behaved correctly (numpy array).
+    # - rng:                random number generator to draw from. Default is numpy's global RNG (numpy Generator or RandomState).
     
+    rng = np.random if rng is None else rng
     actives = np.where(states == 1)[0]
     tie_formed = 0
     tie_broken = 0
     if sum(actives) > 0: #error catch when no individual are active
-        individual_active = np.random.choice(actives, size = 1)
+        individual_active = rng.choice(actives, size = 1)
         individual_correct = correct_behavior[individual_active]
         individual_neighbors = np.where(network[individual_active,:] == 1)[1]
         
@@ -138,7 +142,7 @@ def adjust_tie(network, states, correct_behavior):
             
             # Break ties with one randomly-selected "incorrect" neighbor
             perceived_incorrect = [ind for ind in actives if ind in individual_neighbors] #which neighbors are active
-            break_tie = np.random.choice(perceived_incorrect, size = 1, replace = False)
+            break_tie = rng.choice(perceived_incorrect, size = 1, replace = False)
             network[individual_active, break_tie] = 0
             network[break_tie, individual_active] = 0 #undirected network, symmetric edges
             tie_broken += 1
@@ -146,11 +150,11 @@ def adjust_tie(network, states, correct_behavior):
             # Randomly select another individual to form a new tie
             max_connections = network.shape[0] - 1 #can't connect to self
             candidate_individuals = np.where(np.sum(network, axis = 1) != max_connections)[0] #list individuals who are not already connected to everyone
-            former_individual = np.random.choice(candidate_individuals, size = 1)
+            former_individual = rng.choice(candidate_individuals, size = 1)
             former_connections = np.squeeze(network[former_individual,:]) #get individual's neighbors
             potential_ties = np.where(former_connections == 0)[0]
             potential_ties = np.delete(potential_ties, np.where(potential_ties == former_individual)) # Prevent self-loop
-            new_tie = np.random.choice(potential_ties, size = 1, replace = False)
+            new_tie = rng.choice(potential_ties, size = 1, replace = False)
             network[former_individual, new_tie] = 1
             network[new_tie, former_individual] = 1 #undirected network, symmetric edges
             tie_formed += 1